@@ -0,0 +1,107 @@
+import numpy as np
+from typing import NamedTuple
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Scale factor that makes the MAD a consistent estimator of the standard deviation
+MAD_TO_STD = 1.4826
+
+# Rows of the sliding-window view materialised at once (keeps peak memory bounded)
+CHUNK_ROWS = 1 << 15
+
+
+class AnomalyResult(NamedTuple):
+    median: np.ndarray
+    robust_z: np.ndarray
+    seasonal_z: np.ndarray
+    drift: np.ndarray
+    spikes: np.ndarray
+    drifting: np.ndarray
+
+
+def rolling_median_mad(values, window):
+    """Centred rolling median and MAD over an odd-length window, edges padded."""
+    values = np.asarray(values, dtype=np.float32)
+    window = int(window) | 1
+    half = window // 2
+    padded = np.pad(values, half, mode="edge")
+    median = np.empty_like(values)
+    mad = np.empty_like(values)
+
+    for start in range(0, len(values), CHUNK_ROWS):
+        stop = min(start + CHUNK_ROWS, len(values))
+        win = sliding_window_view(padded[start:stop + window - 1], window).copy()
+        win.partition(half, axis=1)
+        median[start:stop] = win[:, half]
+        dev = np.abs(win - win[:, half, None])
+        dev.partition(half, axis=1)
+        mad[start:stop] = dev[:, half]
+
+    return median, mad
+
+
+def rolling_mean_std(values, window):
+    """Centred rolling mean and standard deviation from cumulative sums."""
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    half = int(window) // 2
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    csq = np.concatenate(([0.0], np.cumsum(values * values)))
+    lo = np.clip(np.arange(n) - half, 0, n)
+    hi = np.clip(np.arange(n) + half + 1, 0, n)
+    count = hi - lo
+    mean = (csum[hi] - csum[lo]) / count
+    var = (csq[hi] - csq[lo]) / count - mean * mean
+    return mean, np.sqrt(np.maximum(var, 0.0))
+
+
+def seasonal_residual(values, period):
+    """Readings minus their per-phase mean; None when the history is too short."""
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if period < 2 or n < 2 * period:
+        return None
+
+    phase = np.arange(n) % period
+    profile = np.bincount(phase, weights=values, minlength=period) / np.bincount(phase, minlength=period)
+    return values - profile[phase]
+
+
+def seasonal_residual_zscore(values, period, window, min_scale=1e-6):
+    """Z-score of each reading against its seasonal profile and local residual spread."""
+    residual = seasonal_residual(values, period)
+    if residual is None:
+        return np.zeros(len(values), dtype=np.float32)
+
+    mean, std = rolling_mean_std(residual, window)
+    return ((residual - mean) / np.maximum(std, min_scale)).astype(np.float32)
+
+
+def cusum(z, slack=0.5):
+    """One-sided upper CUSUM of standardised values, computed without a Python loop."""
+    c = np.concatenate(([0.0], np.cumsum(np.asarray(z, dtype=np.float64) - slack)))
+    return (c - np.minimum.accumulate(c))[1:].astype(np.float32)
+
+
+def detect_anomalies(values, window, period=0, threshold=3.5, drift_threshold=5.0, min_scale=1e-6):
+    """Flag spikes (robust or seasonal z above threshold) and sustained upward drift."""
+    values = np.asarray(values, dtype=np.float32)
+    if len(values) == 0:
+        empty = np.zeros(0, dtype=np.float32)
+        return AnomalyResult(empty, empty, empty, empty, empty.astype(bool), empty.astype(bool))
+
+    median, mad = rolling_median_mad(values, window)
+    scale = np.maximum(mad * MAD_TO_STD, min_scale)
+    robust_z = (values - median) / scale
+    seasonal_z = seasonal_residual_zscore(values, period, window, min_scale)
+
+    # Drift is measured on the deseasonalised series against its robust level;
+    # clipping keeps a single spike from registering as a sustained shift
+    base = seasonal_residual(values, period)
+    base = values.astype(np.float64) if base is None else base
+    level = np.median(base)
+    spread = max(float(np.median(np.abs(base - level))) * MAD_TO_STD, min_scale)
+    drift = cusum(np.clip((base - level) / spread, -threshold, threshold))
+
+    spikes = (robust_z > threshold) | (seasonal_z > threshold)
+    drifting = drift > drift_threshold
+    return AnomalyResult(median, robust_z, seasonal_z, drift, spikes, drifting)
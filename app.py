@@ -0,0 +1,14 @@
+import streamlit as st
+
+# One server for every page: they share the process, its imports and the
+# st.cache_resource objects in resources.py. Run with `streamlit run app.py`;
+# each page sets its own title and layout.
+st.set_page_config(page_title="Energy Suite", page_icon="⚡", layout="wide")
+
+pages = st.navigation([
+    st.Page("energy.py", title="Consumption Tracker", icon="⚡", default=True),
+    st.Page("energy_calc.py", title="Weekly Calculator", icon="🔢"),
+    st.Page("explore.py", title="Fleet Explorer", icon="🔎"),
+    st.Page("sigma.py", title="Sigma Calculator", icon="💀"),
+])
+pages.run()
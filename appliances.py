@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REGISTRY_PATH = Path(__file__).with_name("appliances.csv")
+
+# Appliances offered by default before the user picks their own
+DEFAULT_APPLIANCES = ["AC", "Fridge", "Washing Machine"]
+
+
+def load_registry(path=REGISTRY_PATH):
+    """Appliance registry indexed by name, with a derived `kwh_per_day` column."""
+    registry = pd.read_csv(path).set_index("name")
+    registry["kwh_per_day"] = (
+        registry["rated_watts"] * registry["hours_per_day"] * registry["duty_cycle"] / 1000
+    ).round(3)
+    return registry
+
+
+def bhk_base_kwh(bhk):
+    """Daily base load (lighting, fans, standby) for a home of `bhk` rooms."""
+    return (bhk + 1) * 0.4 + (bhk + 1) * 0.8
+
+
+def kwh_vector(registry, names):
+    """Typical daily kWh for each appliance in `names`, in order."""
+    return registry.loc[list(names), "kwh_per_day"].to_numpy(dtype=np.float64)
+
+
+def daily_consumption(usage, kwh, base=0.0):
+    """Daily kWh as `usage @ kwh + base`.
+
+    `usage` is any array whose last axis runs over appliances (booleans for
+    used/not used, or unit counts), e.g. days × households × appliances.
+    `base` broadcasts against the result, e.g. one value per household.
+    """
+    return np.asarray(usage, dtype=np.float64) @ np.asarray(kwh, dtype=np.float64) + base
+
+
+def slug(name):
+    """Widget-key fragment for an appliance name."""
+    return name.lower().replace(" ", "_").replace(".", "_")
@@ -0,0 +1,190 @@
+import argparse
+import os
+import time
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Local Parquet meter archive: readings/*.parquet (household_id, timestamp, kwh)
+# and households.parquet (household_id, area, bhk)
+ARCHIVE_DIR = Path(os.environ.get("ENERGY_ARCHIVE", Path(__file__).with_name("archive")))
+
+# Rows per Arrow record batch streamed out of DuckDB
+BATCH_ROWS = 100_000
+
+# Parameterised queries over the `readings` and `households` views.
+# Parameters are DuckDB named parameters ($name), bound at execution time.
+# Readings are aggregated per household before joining the small households
+# table, so the join never runs over the raw rows.
+QUERY_TEMPLATES = {
+    "Top consumers per area": {
+        "description": "Households using the most electricity in each area between two dates.",
+        "params": {"start": pd.Timestamp("2025-01-01"), "end": pd.Timestamp("2026-01-01"), "top": 10},
+        "sql": """
+            WITH totals AS (
+                SELECT household_id, sum(kwh) AS kwh
+                FROM readings
+                WHERE timestamp >= $start AND timestamp < $end
+                GROUP BY household_id
+            )
+            SELECT h.area, t.household_id, h.bhk, t.kwh,
+                   row_number() OVER (PARTITION BY h.area ORDER BY t.kwh DESC) AS rank
+            FROM totals t JOIN households h USING (household_id)
+            QUALIFY rank <= $top
+            ORDER BY h.area, rank
+        """,
+    },
+    "AC-heavy homes": {
+        "description": "Homes whose daily use in the summer months exceeds winter by at least the given ratio.",
+        "params": {"summer": [4, 5, 6], "winter": [12, 1, 2], "min_ratio": 1.5},
+        "sql": """
+            WITH daily AS (
+                SELECT household_id, CAST(timestamp AS DATE) AS day, sum(kwh) AS kwh
+                FROM readings
+                GROUP BY ALL
+            ), seasons AS (
+                SELECT household_id,
+                       avg(kwh) FILTER (WHERE list_contains($summer, month(day))) AS summer_kwh_per_day,
+                       avg(kwh) FILTER (WHERE list_contains($winter, month(day))) AS winter_kwh_per_day
+                FROM daily
+                GROUP BY household_id
+            )
+            SELECT h.area, s.household_id, h.bhk, s.summer_kwh_per_day, s.winter_kwh_per_day,
+                   s.summer_kwh_per_day / s.winter_kwh_per_day AS ratio
+            FROM seasons s JOIN households h USING (household_id)
+            WHERE s.summer_kwh_per_day >= $min_ratio * s.winter_kwh_per_day
+            ORDER BY ratio DESC
+        """,
+    },
+    "Month-over-month by area": {
+        "description": "Monthly kWh per area with the change from the month before; empty area means all.",
+        "params": {"area": ""},
+        "sql": """
+            WITH by_home AS (
+                -- year()/month() keys group about twice as fast as date_trunc
+                SELECT household_id, year(timestamp) AS y, month(timestamp) AS m, sum(kwh) AS kwh
+                FROM readings
+                GROUP BY ALL
+            ), monthly AS (
+                SELECT h.area, make_date(b.y, b.m, 1) AS month, sum(b.kwh) AS kwh, count(*) AS households
+                FROM by_home b JOIN households h USING (household_id)
+                WHERE $area = '' OR h.area = $area
+                GROUP BY ALL
+            )
+            SELECT area, month, households, kwh,
+                   kwh - lag(kwh) OVER w AS delta_kwh,
+                   kwh / lag(kwh) OVER w - 1 AS change
+            FROM monthly
+            WINDOW w AS (PARTITION BY area ORDER BY month)
+            ORDER BY area, month
+        """,
+    },
+}
+
+
+def _quote(path):
+    return "'" + str(path).replace("'", "''") + "'"
+
+
+def connect(path=ARCHIVE_DIR, threads=None):
+    """In-process DuckDB connection with `readings` and `households` views over the archive.
+
+    The views read the Parquet files on every query, so scans stream from
+    disk with column pruning and row-group filtering, and nothing is loaded
+    up front. Use `.cursor()` per thread; a DuckDB connection object is not
+    safe to share between concurrent queries.
+
+    File access is confined to the archive directory and the configuration
+    locked, so no query on the connection or its cursors can read other
+    files, write outside the archive, attach databases or load extensions.
+    """
+    path = Path(path).resolve()
+    con = duckdb.connect()
+    if threads:
+        con.execute(f"SET threads = {int(threads)}")
+    con.execute("SET allowed_directories = [?]", [f"{path}/"])
+    con.execute("SET enable_external_access = false")
+    con.execute(f"CREATE VIEW readings AS SELECT * FROM read_parquet({_quote(path / 'readings' / '*.parquet')})")
+    con.execute(f"CREATE VIEW households AS SELECT * FROM read_parquet({_quote(path / 'households.parquet')})")
+    con.execute("SET lock_configuration = true")
+    return con
+
+
+def run(con, sql, params=None, batch_rows=BATCH_ROWS):
+    """Execute `sql` and return a pyarrow RecordBatchReader over the result."""
+    return con.execute(sql, params or {}).to_arrow_reader(batch_rows)
+
+
+def run_template(con, name, **params):
+    """Run a QUERY_TEMPLATES entry, with `params` overriding its defaults."""
+    template = QUERY_TEMPLATES[name]
+    return run(con, template["sql"], {**template["params"], **params})
+
+
+def generate(path, households=1000, days=365, start="2025-01-01", areas=8, chunk=500, seed=0):
+    """Write a synthetic hourly archive for benchmarking; returns the number of readings.
+
+    Usage scales with home size and season; about a third of homes run AC,
+    which adds afternoon load in the hot months.
+    """
+    rng = np.random.default_rng(seed)
+    path = Path(path)
+    (path / "readings").mkdir(parents=True, exist_ok=True)
+
+    ids = np.arange(households, dtype=np.int32)
+    bhk = rng.integers(1, 5, households).astype(np.int8)
+    area = rng.integers(0, areas, households)
+    ac = rng.random(households) < 0.35
+    pq.write_table(pa.table({
+        "household_id": ids,
+        "area": np.array([f"Area {chr(ord('A') + i)}" for i in range(areas)])[area],
+        "bhk": bhk,
+    }), path / "households.parquet")
+
+    hours = pd.date_range(start, periods=days * 24, freq="h")
+    hour_of_day = hours.hour.to_numpy()
+    # Hot-month factor peaking in May, 0 in winter
+    heat = np.clip(np.cos((hours.month.to_numpy() - 5) / 12 * 2 * np.pi), 0, None)
+    afternoon = (hour_of_day >= 12) & (hour_of_day < 20)
+    evening = 1 + 0.6 * ((hour_of_day >= 18) & (hour_of_day < 23))
+    stamps = hours.to_numpy(dtype="datetime64[us]")
+
+    for part, first in enumerate(range(0, households, chunk)):
+        members = slice(first, min(first + chunk, households))
+        n = members.stop - members.start
+        base = (bhk[members, None] + 1) * 0.25 * evening
+        cooling = ac[members, None] * 1.2 * heat * afternoon
+        kwh = ((base + cooling) * rng.lognormal(0, 0.25, (n, len(hours)))).astype(np.float32)
+        pq.write_table(pa.table({
+            "household_id": np.repeat(ids[members], len(hours)),
+            "timestamp": np.tile(stamps, n),
+            "kwh": kwh.ravel(),
+        }), path / "readings" / f"part-{part:05d}.parquet", row_group_size=1_000_000)
+    return households * len(hours)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query or generate the Parquet meter archive")
+    parser.add_argument("--archive", default=ARCHIVE_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    gen = commands.add_parser("generate", help="write a synthetic archive")
+    gen.add_argument("--households", type=int, default=1000)
+    gen.add_argument("--days", type=int, default=365)
+    bench = commands.add_parser("bench", help="time every query template")
+    bench.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "generate":
+        readings = generate(args.archive, args.households, args.days)
+        print(f"{readings:,} readings in {time.perf_counter() - start:.1f}s → {args.archive}/")
+    else:
+        con = connect(args.archive, args.threads)
+        for name in QUERY_TEMPLATES:
+            start = time.perf_counter()
+            rows = sum(batch.num_rows for batch in run_template(con, name))
+            print(f"{name}: {rows} rows in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,153 @@
+import argparse
+import time
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from solar import LOAD_SHAPE, clear_sky_kw, interval_index, net_metering
+
+# Battery sizes compared on the dashboard, kWh
+CAPACITIES = (2.5, 5.0, 7.5, 10.0, 13.5, 20.0)
+
+# Charge and discharge power as a share of capacity per hour (0.5: a full charge takes two hours)
+C_RATE = 0.5
+
+# Share of energy put in that comes back out; losses are split evenly between charging and discharging
+ROUND_TRIP = 0.9
+
+# Share of capacity kept in reserve, which also protects the cells from deep discharge
+RESERVE = 0.1
+
+
+class Dispatch(NamedTuple):
+    flow: np.ndarray
+    soc: np.ndarray
+    throughput: np.ndarray
+
+
+def dispatch(net, prices, capacity_kwh, power_kw, interval_hours, grid_charge=True, round_trip=ROUND_TRIP,
+             reserve=RESERVE):
+    """Simulate one battery per configuration against `net` kWh per interval (load − generation).
+
+    The battery soaks up surplus generation, covers the household's deficit
+    outside the cheapest-priced intervals and, with `grid_charge`, tops up
+    from the grid during them, but only to the average daily deficit that
+    surplus generation leaves uncovered. `prices` is ₹/kWh per interval or
+    flat, and `net` starts at midnight. A
+    battery's state depends on the previous interval, so the loop runs over
+    intervals, but each step updates every configuration at once: 100
+    batteries cost about as much as one. `capacity_kwh` and `power_kw`
+    broadcast against each other.
+
+    Returns intervals × configurations `flow` (kWh into the battery as seen
+    by the meter, negative when discharging), the final state of charge and
+    the kWh discharged per configuration.
+    """
+    net = np.asarray(net, dtype=np.float64)
+    capacity, limit = np.broadcast_arrays(np.asarray(capacity_kwh, dtype=np.float64),
+                                          np.asarray(power_kw, dtype=np.float64) * interval_hours)
+    prices = np.broadcast_to(np.asarray(prices, dtype=np.float64), net.shape)
+    # Arbitrage only pays when the cheapest price beats the dearest after losses
+    cheap = prices <= prices.min()
+    if not grid_charge or prices.min() >= prices.max() * round_trip:
+        cheap = np.zeros_like(cheap)
+
+    # Per interval, before the battery's own limits: what it may absorb and what it is asked for
+    surplus = np.clip(-net, 0, None)
+    wanted = np.where(cheap, 0.0, np.clip(net, 0, None))
+    efficiency = np.sqrt(round_trip)
+    floor = capacity * reserve
+    days = max(len(net) * interval_hours / 24, 1.0)
+    need = max(wanted.sum() - surplus.sum() * round_trip, 0.0) / days
+    ceiling = floor + np.minimum(capacity - floor, need / efficiency)
+
+    soc = floor.copy()
+    flow = np.empty((len(net), capacity.size))
+    for t in range(len(net)):
+        absorb = surplus[t] + np.clip(ceiling - soc, 0, None) / efficiency if cheap[t] else surplus[t]
+        charge = np.minimum(np.minimum(limit, (capacity - soc) / efficiency), absorb)
+        supply = np.minimum(np.minimum(limit, (soc - floor) * efficiency), wanted[t])
+        soc += charge * efficiency - supply / efficiency
+        flow[t] = charge - supply
+    return Dispatch(flow, soc, np.clip(-flow, 0, None).sum(axis=0))
+
+
+def dispatch_loop(net, prices, capacity_kwh, power_kw, interval_hours, grid_charge=True, round_trip=ROUND_TRIP,
+                  reserve=RESERVE):
+    """dispatch() for a single battery in plain Python, for checking and timing against."""
+    net = np.asarray(net, dtype=np.float64)
+    prices = np.broadcast_to(np.asarray(prices, dtype=np.float64), net.shape)
+    low, high = prices.min(), prices.max()
+    arbitrage = grid_charge and low < high * round_trip
+    limit, efficiency = power_kw * interval_hours, round_trip ** 0.5
+    floor = soc = capacity_kwh * reserve
+    wanted = np.clip(net, 0, None)[~(arbitrage & (prices <= low))].sum()
+    need = max(wanted - np.clip(-net, 0, None).sum() * round_trip, 0.0) / max(len(net) * interval_hours / 24, 1.0)
+    ceiling = floor + min(capacity_kwh - floor, need / efficiency)
+    flow = []
+    for kwh, price in zip(net.tolist(), prices.tolist()):
+        cheap = arbitrage and price <= low
+        absorb = max(-kwh, 0.0) + (max(ceiling - soc, 0.0) / efficiency if cheap else 0.0)
+        charge = min(limit, (capacity_kwh - soc) / efficiency, absorb)
+        supply = 0.0 if cheap else min(limit, (soc - floor) * efficiency, max(kwh, 0.0))
+        soc += charge * efficiency - supply / efficiency
+        flow.append(charge - supply)
+    return np.array(flow)
+
+
+def battery_savings(load, generation, import_rate, export_rate, interval_hours, capacities=CAPACITIES,
+                    c_rate=C_RATE, grid_charge=True):
+    """Bill and savings per battery size for one household's interval `load` and `generation` kWh.
+
+    Bills use solar.net_metering, so imports, exports and their tariffs are
+    treated exactly as without a battery; the first row is no battery.
+    """
+    load = np.asarray(load, dtype=np.float64)
+    generation = np.asarray(generation, dtype=np.float64)
+    capacities = np.asarray(capacities, dtype=np.float64)
+    result = dispatch(load - generation, import_rate, capacities, capacities * c_rate, interval_hours, grid_charge)
+    # One row per configuration: the household's load plus what the battery draws
+    metered = np.vstack([load, load[None, :] + result.flow.T])
+    bills = net_metering(metered, generation, import_rate, export_rate)
+    return pd.DataFrame({
+        "Capacity (kWh)": np.concatenate([[0.0], capacities]),
+        "Power (kW)": np.concatenate([[0.0], capacities * c_rate]),
+        "Imported (kWh)": bills.imported,
+        "Exported (kWh)": bills.exported,
+        "Bill (₹)": bills.bill,
+        "Savings (₹)": bills.bill[0] - bills.bill,
+        "Cycles": np.concatenate([[0.0], result.throughput / np.where(capacities > 0, capacities, 1)]),
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time battery dispatch across many battery sizes")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--minutes", type=int, default=5, help="interval length")
+    parser.add_argument("--configs", type=int, default=200, help="battery sizes simulated together")
+    parser.add_argument("--kwp", type=float, default=4.0, help="rooftop solar capacity")
+    parser.add_argument("--rate", type=float, default=8.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    interval_hours = args.minutes / 60
+    index = pd.date_range("2026-01-01", periods=args.days * 24 * 60 // args.minutes, freq=f"{args.minutes}min")
+    load = rng.uniform(8, 30, args.days).repeat(len(index) // args.days) * LOAD_SHAPE[index.hour] * interval_hours
+    load *= rng.uniform(0.5, 1.5, len(index))
+    generation = clear_sky_kw(interval_index(index[0], index[-1]), 19.1)
+    generation = np.repeat(generation, round(0.25 / interval_hours))[:len(index)] * args.kwp * interval_hours
+    prices = args.rate * pd.read_csv("tou_tariff.csv").sort_values("hour")["multiplier"].to_numpy()[index.hour]
+    capacities = np.linspace(1, 30, args.configs)
+
+    start = time.perf_counter()
+    result = dispatch(load - generation, prices, capacities, capacities * C_RATE, interval_hours)
+    vectorized = time.perf_counter() - start
+    start = time.perf_counter()
+    single = dispatch_loop(load - generation, prices, capacities[-1], capacities[-1] * C_RATE, interval_hours)
+    looped = time.perf_counter() - start
+
+    print(f"{args.configs} batteries × {len(index):,} intervals: {vectorized:.2f}s vectorized, "
+          f"~{looped * args.configs:.1f}s as a Python loop per battery ({looped:.2f}s each)")
+    table = battery_savings(load, generation, prices, 3.0, interval_hours)
+    print(table.round(1).to_string(index=False))
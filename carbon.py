@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+INTENSITY_PATH = Path(__file__).with_name("grid_intensity.csv")
+
+
+def load_intensity(path=INTENSITY_PATH):
+    """Grid carbon intensity table, sorted by time.
+
+    Either a 24-row hour-of-day profile (`hour`, `g_co2_per_kwh`) or a
+    timestamped series (`timestamp`, `g_co2_per_kwh`), e.g. a utility's
+    hourly history.
+    """
+    table = pd.read_csv(path)
+    if "timestamp" in table:
+        table["timestamp"] = pd.to_datetime(table["timestamp"])
+        return table.sort_values("timestamp", ignore_index=True)
+    return table.sort_values("hour", ignore_index=True)
+
+
+def hourly_profile(table):
+    """g CO₂/kWh for each hour of the day (a timestamped table is averaged by hour)."""
+    if "timestamp" in table:
+        profile = table.groupby(table["timestamp"].dt.hour)["g_co2_per_kwh"].mean()
+        return profile.reindex(range(24)).interpolate(limit_direction="both").to_numpy()
+    return table["g_co2_per_kwh"].to_numpy(dtype=np.float64)
+
+
+def intensity_at(timestamps, table):
+    """g CO₂/kWh in force at each timestamp.
+
+    A timestamped table is aligned backward like merge_asof (the latest row
+    at or before each reading, the first row for readings before the table
+    starts); an hour-of-day profile is looked up by the reading's hour.
+    """
+    timestamps = pd.DatetimeIndex(timestamps)
+    if "timestamp" not in table:
+        return hourly_profile(table)[timestamps.hour]
+    table_times = table["timestamp"].to_numpy(dtype="datetime64[ns]")
+    index = np.searchsorted(table_times, timestamps.to_numpy(dtype="datetime64[ns]"), side="right") - 1
+    return table["g_co2_per_kwh"].to_numpy(dtype=np.float64)[np.maximum(index, 0)]
+
+
+def interval_emissions(timestamps, kwh, table):
+    """kg CO₂ for each consumption interval starting at `timestamps`.
+
+    `kwh` is one value per interval, or intervals × appliances.
+    """
+    kwh = np.asarray(kwh, dtype=np.float64)
+    factors = intensity_at(timestamps, table) / 1000
+    return kwh * factors.reshape(-1, *[1] * (kwh.ndim - 1))
+
+
+def window_factor(table, start=0, end=24):
+    """Mean kg CO₂/kWh for a load spread evenly over hours [start, end), which may wrap past midnight."""
+    if end <= start:
+        end += 24
+    hours = np.arange(start, end) % 24
+    return hourly_profile(table)[hours].mean() / 1000
+
+
+def appliance_factors(registry, names, table):
+    """kg CO₂/kWh per appliance: averaged over its run window when it has one, else the whole day."""
+    rows = registry.loc[list(names)]
+    factors = np.full(len(rows), window_factor(table))
+    windowed = rows["window_start"].notna() & rows["window_end"].notna()
+    for i in np.flatnonzero(windowed.to_numpy()):
+        factors[i] = window_factor(table, int(rows["window_start"].iloc[i]), int(rows["window_end"].iloc[i]))
+    return factors
+
+
+def emissions(usage, kwh, factors, base=0.0, base_factor=0.0):
+    """kg CO₂ per appliance and in total for any ... × appliances usage array.
+
+    `usage` is days × households × appliances (or any leading shape) of
+    booleans or unit counts, `kwh` the daily kWh per unit and `factors` the
+    kg CO₂/kWh per appliance. Returns (per-appliance kg with `usage`'s shape,
+    total kg over appliances plus `base` kWh at `base_factor`).
+    """
+    per_appliance = np.asarray(usage, dtype=np.float64) * (np.asarray(kwh) * np.asarray(factors))
+    return per_appliance, per_appliance.sum(axis=-1) + np.asarray(base) * base_factor
@@ -0,0 +1,101 @@
+import numpy as np
+import plotly
+import plotly.io as pio
+
+# plotly.py 6+ serialises NumPy arrays as base64 typed arrays ({"dtype", "bdata"});
+# older versions write every element out as JSON text
+TYPED_ARRAYS = int(plotly.__version__.split(".")[0]) >= 6
+
+# Below this many elements the typed-array wrapper costs more than plain JSON
+MIN_TYPED_ARRAY = 16
+
+# Trace properties holding per-point numeric data
+DATA_PROPS = ("x", "y", "z", "r", "values", "customdata", "open", "high", "low", "close")
+
+
+def payload_bytes(fig):
+    """Size of the JSON Streamlit ships to the browser for `fig`."""
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
+
+
+def _numeric(value):
+    if value is None or isinstance(value, (str, bytes, dict)):
+        return None
+    try:
+        array = np.asarray(value)
+    except (TypeError, ValueError):
+        return None
+    if array.ndim == 0 or array.dtype.kind not in "biuf":
+        return None
+    return array
+
+
+def _compact_array(array, decimals):
+    typed = TYPED_ARRAYS and array.size >= MIN_TYPED_ARRAY
+    if array.dtype.kind in "biu":
+        if not typed:
+            return array.tolist()
+        # Narrowest integer type holding the range; plotly.js has no 64-bit int arrays
+        if array.size:
+            narrow = np.result_type(np.min_scalar_type(array.min()), np.min_scalar_type(array.max()))
+            if narrow.itemsize <= 4:
+                return array.astype(narrow)
+        return array
+    rounded = np.round(array.astype(np.float64), decimals)
+    return rounded.astype(np.float32) if typed else rounded.tolist()
+
+
+def _text_template(text, values, source):
+    """A texttemplate reproducing `text` from `values`, or None if it can't."""
+    if values is None or text.shape != values.shape:
+        return None
+    for places in range(4):
+        if np.allclose(text, np.round(values, places), rtol=0, atol=1e-9):
+            return f"%{{{source}:.{places}f}}"
+    return None
+
+
+def compact_figure(fig, decimals=2):
+    """Shrink `fig`'s data payload in place and return it.
+
+    Numeric trace arrays are rounded to `decimals` and downcast to float32
+    (typed arrays where supported), and per-point `text` that only repeats a
+    rounded y/z/r value is replaced by an equivalent `texttemplate`.
+    """
+    for trace in fig.data:
+        arrays = {}
+        for prop in DATA_PROPS:
+            if prop in trace:
+                arrays[prop] = _numeric(trace[prop])
+
+        text = _numeric(trace["text"]) if "text" in trace else None
+        if text is not None:
+            for source in ("y", "z", "r"):
+                template = _text_template(text, arrays.get(source), source)
+                if template is not None:
+                    trace.update(text=None, texttemplate=template)
+                    break
+
+        updates = {prop: _compact_array(array, decimals) for prop, array in arrays.items() if array is not None}
+        marker_size = _numeric(trace.marker.size) if "marker" in trace and "size" in trace.marker else None
+        if marker_size is not None and marker_size.ndim == 1:
+            updates["marker_size"] = _compact_array(marker_size, decimals)
+        if updates:
+            # Plotly skips assignments equal to the current value, which would
+            # drop a pure dtype change, so clear the properties first
+            trace.update({prop: None for prop in updates})
+            trace.update(updates)
+    return fig
+
+
+def measure(fig, decimals=2):
+    """Compact `fig` in place, returning its payload bytes before and after.
+
+    The sizes are kept on the figure, so measuring a figure reused across
+    reruns reports its original saving rather than an already-compacted one.
+    """
+    if getattr(fig, "_payload_sizes", None) is None:
+        before = payload_bytes(fig)
+        compact_figure(fig, decimals)
+        fig._payload_sizes = (before, payload_bytes(fig))
+    return fig._payload_sizes
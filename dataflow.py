@@ -0,0 +1,313 @@
+import inspect
+import time
+
+import numpy as np
+import pandas as pd
+
+from anomaly import detect_anomalies
+from appliances import bhk_base_kwh, daily_consumption
+from carbon import appliance_factors, emissions, window_factor
+import figure_pool as pooled
+from figures import appliance_frame, cost_table, day_labels, weekday_means, weekly_frame, weekly_totals
+from tables import SortedTable
+
+
+def _same(a, b):
+    # Inputs are treated as immutable: the same object is an unchanged value
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, (pd.DataFrame, pd.Series, pd.Index)):
+        return a.equals(b)
+    if isinstance(a, np.ndarray):
+        return a.shape == b.shape and a.dtype == b.dtype and np.array_equal(a, b)
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+class Graph:
+    """Inputs and memoized derived nodes, recomputed only downstream of a change.
+
+    A node is a function whose parameter names are the inputs or nodes it
+    reads. Values are pulled: reading a node first brings its dependencies
+    up to date, then reruns the function only if one of them has a new
+    version since the node last ran. Setting an input to an equal value
+    keeps its version, so nothing below it reruns. Transient nodes are
+    evaluated on every read and never stored, for values that are cheap to
+    rebuild but large to keep. Keep one graph per session; describe() and
+    to_dot() show its shape and what ran.
+    """
+
+    def __init__(self):
+        self._inputs = {}  # input name -> value
+        self._nodes = {}  # node name -> (function, dependencies passed, dependencies only tracked)
+        self._transient = set()  # nodes evaluated on every read, never stored
+        self._values = {}  # node name -> last value
+        self._versions = {}  # input or node name -> bumped whenever its value changes
+        self._seen = {}  # node name -> dependency versions its value was computed from
+        self._runs = {}  # node name -> evaluations so far
+        self._seconds = {}  # node name -> duration of the last evaluation
+
+    def set(self, name, value):
+        """Set input `name`; returns whether its value changed."""
+        if name in self._nodes:
+            raise ValueError(f"{name} is a derived node, not an input")
+        if name in self._inputs and _same(self._inputs[name], value):
+            return False
+        self._inputs[name] = value
+        self._versions[name] = self._versions.get(name, 0) + 1
+        return True
+
+    def update(self, **inputs):
+        """Set several inputs; returns the names that changed."""
+        return [name for name, value in inputs.items() if self.set(name, value)]
+
+    def node(self, func=None, *, name=None, uses=(), transient=False):
+        """Register `func` as a node (usable as a decorator).
+
+        `uses` names inputs that invalidate the node without being passed
+        to it, e.g. a setting that changes how its result is displayed.
+        A `transient` node reruns on every read and keeps no value; nodes
+        that read it rerun every time too.
+        """
+        if func is None:
+            return lambda func: self.node(func, name=name, uses=uses, transient=transient)
+        deps = tuple(inspect.signature(func).parameters)
+        name = name or func.__name__
+        self._nodes[name] = (func, deps, tuple(uses))
+        if transient:
+            self._transient.add(name)
+        return func
+
+    @property
+    def version(self):
+        """A number that changes whenever an input or a stored node value does (transient nodes aside)."""
+        return sum(self._versions.get(name, 0) for name in (*self._inputs, *self._values))
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def get(self, name):
+        """Current value of an input or node, recomputing stale nodes on the way."""
+        if name in self._inputs:
+            return self._inputs[name]
+        if name not in self._nodes:
+            raise KeyError(f"{name} is neither an input nor a node")
+        func, deps, uses = self._nodes[name]
+        args = [self.get(dep) for dep in deps]
+        for dep in uses:
+            self.get(dep)
+        seen = tuple(self._versions.get(dep, 0) for dep in deps + uses)
+        if name in self._transient or self._seen.get(name) != seen:
+            start = time.perf_counter()
+            value = func(*args)
+            self._seconds[name] = time.perf_counter() - start
+            self._runs[name] = self._runs.get(name, 0) + 1
+            self._versions[name] = self._versions.get(name, 0) + 1
+            if name in self._transient:
+                return value
+            self._values[name] = value
+            self._seen[name] = seen
+        return self._values[name]
+
+    def _stale(self, name, memo):
+        if name in self._inputs or name not in self._nodes:
+            return False
+        if name not in memo:
+            _, deps, uses = self._nodes[name]
+            seen = tuple(self._versions.get(dep, 0) for dep in deps + uses)
+            memo[name] = (name in self._transient or self._seen.get(name) != seen
+                          or any(self._stale(dep, memo) for dep in deps + uses))
+        return memo[name]
+
+    def downstream(self, *names):
+        """Nodes that depend, directly or not, on any of `names`."""
+        below, frontier = set(), set(names)
+        while frontier:
+            frontier = {node for node, (_, deps, uses) in self._nodes.items()
+                        if node not in below and frontier.intersection(deps + uses)}
+            below |= frontier
+        return [node for node in self._nodes if node in below]
+
+    def reset_counts(self):
+        """Zero the evaluation counters, e.g. at the start of a rerun."""
+        self._runs = dict.fromkeys(self._runs, 0)
+
+    def describe(self):
+        """One row per input and node: dependencies, version, evaluations, last duration and state."""
+        memo = {}
+        rows = [{"Name": name, "Kind": "input", "Depends on": "", "Version": self._versions.get(name, 0),
+                 "Runs": None, "Last (ms)": None, "State": "set"} for name in self._inputs]
+        for name, (_, deps, uses) in self._nodes.items():
+            rows.append({
+                "Name": name,
+                "Kind": "node",
+                "Depends on": ", ".join(deps + tuple(f"({dep})" for dep in uses)),
+                "Version": self._versions.get(name, 0),
+                "Runs": self._runs.get(name, 0),
+                "Last (ms)": round(self._seconds[name] * 1000, 2) if name in self._seconds else None,
+                "State": "transient" if name in self._transient else "stale" if self._stale(name, memo) else "fresh",
+            })
+        return pd.DataFrame(rows)
+
+    def to_dot(self, highlight=()):
+        """Graphviz source for the graph; nodes in `highlight` are filled, e.g. those that just ran, and transient ones dashed."""
+        lines = ["digraph dataflow {", "  rankdir=LR;", '  node [fontname="Helvetica", fontsize=10];']
+        for name in self._inputs:
+            lines.append(f'  "{name}" [shape=box, style=rounded];')
+        for name, (_, deps, uses) in self._nodes.items():
+            style = ["filled"] * (name in highlight) + ["dashed"] * (name in self._transient)
+            fill = ', fillcolor="#ffd166"' if name in highlight else ""
+            lines.append(f'  "{name}" [shape=ellipse, style="{",".join(style)}"{fill}];')
+            lines += [f'  "{dep}" -> "{name}";' for dep in deps]
+            lines += [f'  "{dep}" -> "{name}" [style=dashed];' for dep in uses]
+        lines.append("}")
+        return "\n".join(lines)
+
+    @property
+    def last_runs(self):
+        """Nodes evaluated since the last reset_counts()."""
+        return [name for name, runs in self._runs.items() if runs]
+
+
+def dashboard_graph(pool, registry, intensity):
+    """The tracker's derived values and figures as a Graph.
+
+    Inputs: usage (dates × appliances bool frame), appliance_kwh, bhk,
+    rate, theme, metered (meter breakdown or None), and metered_co2 and
+    metered_home_co2 (kg CO₂ per date and detected appliance, and per
+    metered date for the whole home, from the meter's intervals; or None). `pool` (a
+    FigurePool), `registry` and `intensity` are process-wide resources the
+    nodes read directly rather than per-session inputs. Derived frames
+    are memoized; figures are transient, patched from the pool's templates
+    on each read, so a session's graph holds a few kB instead of a figure
+    per chart. Nodes only read their parameters and those resources, so
+    the graph can outlive the script run that built it.
+    """
+    graph = Graph()
+
+    @graph.node
+    def base(bhk):
+        return bhk_base_kwh(bhk)
+
+    @graph.node
+    def consumption(usage, appliance_kwh, base):
+        kwh = [appliance_kwh[appliance] for appliance in usage.columns]
+        return pd.Series(daily_consumption(usage.to_numpy(), kwh, base), index=usage.index, dtype=float)
+
+    @graph.node
+    def co2(usage, appliance_kwh, base, metered_co2, metered_home_co2):
+        # (kg CO₂ per date and appliance, kg CO₂ per date). From the ticks, appliances
+        # at their run-window grid intensity and the base load at the day's average;
+        # with a meter, its appliances and the dates it covers come from its readings
+        per_appliance, daily = emissions(usage.to_numpy(), list(appliance_kwh.values()),
+                                         appliance_factors(registry, list(appliance_kwh), intensity),
+                                         base, window_factor(intensity))
+        if metered_co2 is None:
+            return pd.DataFrame(per_appliance, index=usage.index, columns=usage.columns), daily
+        daily = metered_home_co2.reindex(usage.index).fillna(pd.Series(daily, index=usage.index))
+        return metered_co2, daily.to_numpy()
+
+    @graph.node
+    def anomalies(consumption, base):
+        # Unusual days against the rolling weekly level (noise floor at 10% of base)
+        return detect_anomalies(consumption.to_numpy(), window=7, period=7, min_scale=base * 0.1)
+
+    @graph.node
+    def stats(consumption):
+        return {"total": consumption.sum(), "average": consumption.mean(), "peak": consumption.idxmax()}
+
+    @graph.node
+    def daily(consumption, base):
+        # Consumption-only columns, so the charts built from them ignore the rate
+        return weekly_frame(consumption, 0.0, base).drop(columns=["Cost", "Base_Cost", "Extra_Cost"])
+
+    @graph.node
+    def costs(consumption, rate, base, co2):
+        return weekly_frame(consumption, rate, base, co2[1], co2[0])
+
+    @graph.node
+    def cost_breakdown(costs, base):
+        return cost_table(costs, base, decimals=None)
+
+    @graph.node
+    def cost_index(cost_breakdown):
+        # Sorted indexes and prefix sums for paging the breakdown
+        appliance_co2 = [column for column in cost_breakdown if column.endswith("_CO2_kg")]
+        return SortedTable(cost_breakdown, ["Consumption", "Cost", "CO2_kg", *appliance_co2, "Base_Cost", "Extra_Cost"])
+
+    @graph.node
+    def spike_days(consumption, anomalies):
+        return day_labels(consumption.index[anomalies.spikes])
+
+    @graph.node
+    def appliance_rows(usage, appliance_kwh, metered):
+        # Measured kWh when a meter file is uploaded, else the ticked appliances
+        if metered is None:
+            return appliance_frame(usage, appliance_kwh)
+        rows = metered.set_axis(day_labels(metered.index)).rename_axis("Day").reset_index().melt(
+            id_vars="Day", var_name="Appliance", value_name="Consumption"
+        )
+        return rows[rows["Consumption"] > 0]
+
+    def figure(func):
+        return graph.node(func, transient=True)
+
+    @figure
+    def fig_bar(costs, base, rate, theme):
+        return pooled.cost_bars(pool, costs, base, rate, theme)
+
+    @figure
+    def fig_gauge(daily, theme):
+        return pooled.gauge(pool, daily["Efficiency"].mean(), theme)
+
+    @figure
+    def fig_radar(consumption, theme):
+        df_weekday = weekday_means(consumption).rename_axis("Day").reset_index(name="Consumption")
+        return pooled.radar(pool, df_weekday.fillna(0), theme)
+
+    @figure
+    def fig_stack(appliance_rows, theme):
+        return pooled.stack(pool, appliance_rows, theme) if not appliance_rows.empty else None
+
+    @figure
+    def fig_heatmap(usage, metered, theme):
+        # kWh per day when metered, else used/not used
+        if metered is not None:
+            return pooled.heatmap(pool, metered.round(2).values.tolist(), list(metered.columns),
+                                  day_labels(usage.index), theme)
+        return pooled.heatmap(pool, usage.to_numpy(dtype=int).tolist(), list(usage.columns),
+                              day_labels(usage.index), theme)
+
+    @figure
+    def fig_trend(daily, base, spike_days, theme):
+        return pooled.trend(pool, daily, base, spike_days, theme)
+
+    @figure
+    def fig_hist(daily, theme):
+        return pooled.histogram(pool, daily, theme)
+
+    @figure
+    def fig_box(daily, theme):
+        return pooled.box(pool, daily, theme)
+
+    @figure
+    def fig_weekdays(consumption, theme):
+        return pooled.weekdays(pool, weekday_means(consumption).dropna(), theme)
+
+    @figure
+    def fig_weeks(consumption, theme):
+        return pooled.weeks(pool, weekly_totals(consumption), theme)
+
+    @figure
+    def fig_cost_bar(costs, theme):
+        return pooled.cost_breakdown(pool, costs, theme)
+
+    @figure
+    def fig_scatter(costs, theme):
+        return pooled.scatter(pool, costs, theme)
+
+    return graph
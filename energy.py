@@ -1,9 +1,28 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import io
 import numpy as np
+from appliances import DEFAULT_APPLIANCES, bhk_base_kwh, daily_consumption, kwh_vector, slug
+from scheduler import optimal_schedule, shiftable_appliances
+from montecarlo import bill_bands, simulate_bills_parallel, weekday_profile
+from whatif import best_within_budget, what_if_frontier
+from figures import co2_column, cost_frontier, day_labels, live_power_trend, meter_history, rate_comparison, solar_day_profile
+from compact import compact_figure, measure
+from disaggregation import appliance_intervals, by_date, daily_breakdown, disaggregate, load_meter_csv
+from session import memory_breakdown
+from live_feed import FEED_URLS, energy_kwh, resample
+from carbon import interval_emissions
+from billing import billing_cycles, interval_kwh, load_bills, monthly_cycles, reconcile
+from pyramid import content_key, open_pyramid
+from tables import sorted_table
+from ingest import INVERTER_SCHEMA, METER_SCHEMA, memory_footprint, read_csv
+from battery import CAPACITIES, C_RATE, battery_savings
+from solar import (
+    INTERVAL_HOURS, binned_kwh, clear_sky_kw, interval_index, load_inverter_csv, net_flows, net_metering, shaped_load
+)
+import resources
+from dataflow import dashboard_graph
+import uuid
 
 # Set page config
 st.set_page_config(
@@ -141,7 +160,7 @@ bhk = st.sidebar.number_input("Enter your BHK:", min_value=1, max_value=10, valu
 electricity_rate = st.sidebar.number_input("Electricity Rate (₹/kWh):", min_value=1.0, max_value=20.0, value=5.0, step=0.5)
 
 # Calculate base consumption
-base_consumption = (bhk + 1) * 0.4 + (bhk + 1) * 0.8
+base_consumption = bhk_base_kwh(bhk)
 
 st.sidebar.markdown(f"""
 <div class="metric-card">
@@ -156,16 +175,207 @@ st.sidebar.markdown("### ⚙️ Display Settings")
 show_predictions = st.sidebar.checkbox("Show Predictions", value=True)
 show_comparisons = st.sidebar.checkbox("Show Comparisons", value=True)
 chart_theme = st.sidebar.selectbox("Chart Theme", ["plotly", "plotly_dark", "plotly_white"])
+compact_charts = st.sidebar.checkbox("Compact chart payloads", value=True,
+                                     help="Round chart data and send it as float32 typed arrays")
+show_payload_sizes = st.sidebar.checkbox("Show chart payload sizes", value=False)
+
+def show_chart(fig, **kwargs):
+    # Shrink the figure's data before it is serialised to the browser
+    if compact_charts and show_payload_sizes:
+        before, after = measure(fig)
+        event = st.plotly_chart(fig, use_container_width=True, **kwargs)
+        st.caption(f"Payload: {before:,} → {after:,} bytes ({1 - after / before:.0%} smaller)")
+        return event
+    if compact_charts:
+        compact_figure(fig)
+    return st.plotly_chart(fig, use_container_width=True, **kwargs)
+
+# Dates shown: the current Monday–Sunday week unless the user picks a range
+MAX_DAYS = 62
+st.sidebar.markdown("### 📅 Dates")
+today = pd.Timestamp.now().normalize()
+week_start = today - pd.Timedelta(days=today.dayofweek)
+picked = st.sidebar.date_input("Dates to track", value=(week_start, week_start + pd.Timedelta(days=6)),
+                               help=f"Pick a start and end date (up to {MAX_DAYS} days)")
+# While the user is mid-selection only the start date is set; show its week
+picked = picked if isinstance(picked, (tuple, list)) else (picked,)
+start_date = pd.Timestamp(picked[0])
+end_date = pd.Timestamp(picked[1]) if len(picked) > 1 else start_date + pd.Timedelta(days=6)
+if (end_date - start_date).days >= MAX_DAYS:
+    end_date = start_date + pd.Timedelta(days=MAX_DAYS - 1)
+    st.sidebar.caption(f"Showing the first {MAX_DAYS} days of the range.")
+dates = pd.date_range(start_date, end_date, freq="D")
+period = "week" if len(dates) == 7 else f"{len(dates)} days"
+
+# Appliances come from the registry; the user picks the ones they own
+registry = resources.registry()
+st.sidebar.markdown("### 🔌 Appliances")
+appliances = st.sidebar.multiselect("Appliances in your home", list(registry.index), default=DEFAULT_APPLIANCES)
+appliance_kwh = dict(zip(appliances, kwh_vector(registry, appliances)))
+
+# Smart meter upload for automatic appliance breakdown
+st.sidebar.markdown("### 📟 Smart Meter")
+meter_file = st.sidebar.file_uploader("Whole-home meter readings (CSV)", type="csv",
+                                      help="Columns: timestamp, power_w")
+
+@st.cache_data(show_spinner="Checking meter readings...")
+def upload_footprint(data, schema):
+    # Validates the whole file; a ValueError names the offending lines
+    return memory_footprint(read_csv(io.BytesIO(data), schema))
+
+def footprint_caption(footprint, container=st):
+    total = footprint.iloc[-1]
+    container.caption(f"{total['Dtype']}, {total['Bytes']:,} bytes in memory as "
+                      + ", ".join(f"{row.Column} ({row.Dtype})" for row in footprint.iloc[:-1].itertuples()))
+
+if meter_file is not None:
+    try:
+        footprint_caption(upload_footprint(meter_file.getvalue(), METER_SCHEMA), st.sidebar)
+    except ValueError as exc:
+        st.sidebar.error(f"Meter readings rejected: {exc}")
+        meter_file = None
+
+@st.cache_data(show_spinner="Detecting appliances from meter readings...")
+def metered_breakdown(data):
+    timestamps, power = load_meter_csv(io.BytesIO(data))
+    return disaggregate(timestamps, power)
+
+metered = daily_breakdown(metered_breakdown(meter_file.getvalue()), dates) if meter_file is not None else None
+
+@st.cache_data(show_spinner="Matching meter readings to grid carbon intensity...")
+def metered_emissions(data):
+    # kg CO₂ per day for the whole home and each detected appliance, every
+    # reading's interval at the grid intensity in force when it was taken
+    timestamps, power = load_meter_csv(io.BytesIO(data))
+    intensity = resources.grid_intensity()
+    days = pd.DatetimeIndex(timestamps.astype('datetime64[D]'))
+    home = interval_emissions(timestamps, interval_kwh(timestamps, power), intensity)
+    appliance_kwh = appliance_intervals(timestamps, power)
+    per_appliance = interval_emissions(timestamps, appliance_kwh.to_numpy(), intensity)
+    return (pd.Series(home).groupby(days).sum(),
+            pd.DataFrame(per_appliance, columns=appliance_kwh.columns).groupby(days).sum())
+
+metered_co2 = metered_home_co2 = None
+if meter_file is not None:
+    metered_home_co2, metered_co2 = metered_emissions(meter_file.getvalue())
+    metered_co2 = by_date(metered_co2, dates)
+
+# Points drawn across the meter history charts; the pyramid picks the level to match
+OVERVIEW_PIXELS = 300
+CHART_PIXELS = 1000
 
-# Days of the week
-days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-appliances = ["AC", "Fridge", "Washing Machine"]
+# Pyramids kept open per process; each is keyed by its file's content hash, not its bytes
+PYRAMID_ENTRIES = 16
 
-# Initialize session state
-if 'days_elec' not in st.session_state:
-    st.session_state.days_elec = {}
-if 'appliance_usage' not in st.session_state:
-    st.session_state.appliance_usage = {day: {"AC": False, "Fridge": False, "Washing Machine": False} for day in days}
+@st.cache_resource(show_spinner="Summarising meter readings for zooming...", max_entries=PYRAMID_ENTRIES, ttl="1h")
+def meter_pyramid(digest, _data):
+    # Memory-mapped from disk and shared read-only by every session
+    return open_pyramid(_data)
+
+def _selected_time(value):
+    # Plotly reports datetime-axis selections as date strings or epoch milliseconds
+    return pd.Timestamp(value, unit='ms') if isinstance(value, (int, float)) else pd.Timestamp(value)
+
+@st.fragment
+def meter_explorer(pyramid):
+    # Selecting on the overview reruns only this fragment, which then reads
+    # just the selected window from the on-disk levels
+    first, last = pd.Timestamp(pyramid.first, unit='s'), pd.Timestamp(pyramid.last + 60, unit='s')
+    level, df_overview = pyramid.query(first, last, OVERVIEW_PIXELS)
+    fig_overview = meter_history(df_overview, level, chart_theme)
+    fig_overview.update_layout(dragmode='select', height=250, title=f"Meter Overview ({level} bins)")
+    event = show_chart(fig_overview, on_select="rerun", selection_mode="box", key="meter_overview")
+    
+    boxes = event["selection"]["box"]
+    if not boxes:
+        st.caption("Drag a box across the overview to load finer detail for that window.")
+        return
+    start, end = sorted(_selected_time(x) for x in boxes[0]['x'])
+    level, df_detail = pyramid.query(max(start, first), min(end, last), CHART_PIXELS)
+    fig_detail = meter_history(df_detail, level, chart_theme)
+    fig_detail.update_layout(title=f"Meter Detail {start:%d %b %Y %H:%M} – {end:%d %b %Y %H:%M} ({level} bins)")
+    show_chart(fig_detail)
+
+@st.cache_data(show_spinner="Aligning meter readings to billing cycles...")
+def metered_cycles(data, start_day):
+    timestamps, power = load_meter_csv(io.BytesIO(data))
+    readings = pd.DataFrame({'household_id': 'home', 'timestamp': timestamps, 'kwh': interval_kwh(timestamps, power)})
+    return billing_cycles(readings, monthly_cycles(['home'], start_day, timestamps.min(), timestamps.max()))
+
+@st.cache_data(show_spinner="Netting solar generation against your load...")
+def solar_intervals(consumption, meter_data, inverter_data, capacity_kw, latitude):
+    # Load from the meter readings when uploaded, else the tracked days shaped by hour of day;
+    # generation from the inverter log when uploaded, else the clear-sky model
+    if meter_data is not None:
+        timestamps, power = load_meter_csv(io.BytesIO(meter_data))
+        index = interval_index(timestamps.min(), timestamps.max())
+        load = binned_kwh(timestamps, interval_kwh(timestamps, power), index)
+    else:
+        index = interval_index(consumption.index[0], consumption.index[-1])
+        load = shaped_load(consumption, index)
+    if inverter_data is not None:
+        generation = load_inverter_csv(io.BytesIO(inverter_data), index)
+    else:
+        generation = clear_sky_kw(index, latitude) * capacity_kw * INTERVAL_HOURS
+    imported, exported = net_flows(load, generation)
+    return pd.DataFrame({'Load': load, 'Generation': generation, 'Imported': imported, 'Exported': exported},
+                        index=index)
+
+@st.cache_data(show_spinner="Simulating batteries...")
+def cached_battery_savings(load, generation, import_rate, export_rate, grid_charge):
+    return battery_savings(load, generation, import_rate, export_rate, INTERVAL_HOURS, grid_charge=grid_charge)
+
+# Live feed from a meter gateway, ingested once per server for all sessions; visitors
+# pick from the gateways the server is configured with rather than typing an address
+st.sidebar.markdown("### 📡 Live Meter")
+live_url, live_refresh = None, 2
+if FEED_URLS:
+    live_url = st.sidebar.selectbox("Gateway feed", FEED_URLS, index=None, placeholder="Off")
+    live_refresh = st.sidebar.slider("Refresh every (s)", 1, 10, 2)
+else:
+    st.sidebar.caption("No meter gateways configured (ENERGY_LIVE_FEEDS).")
+
+live_feed = None
+if live_url:
+    try:
+        live_feed = resources.live_feed(live_url)
+    except ValueError as exc:
+        st.sidebar.error(str(exc))
+
+# Seconds of live readings shown on the dashboard
+LIVE_WINDOW = 15 * 60
+
+@st.fragment(run_every=live_refresh)
+def live_panel(feed):
+    # Reruns on its own timer without rerunning the rest of the page
+    timestamps, power = feed.buffer.since(LIVE_WINDOW)
+    if not len(timestamps):
+        st.info(f"Waiting for readings from {live_url}..." + (f" ({feed.error})" if feed.error else ""))
+        return
+    recent = timestamps >= timestamps[-1] - 10
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("⚡ Power Now", f"{power[recent][-10:].mean():,.0f} W")
+    col2.metric("📊 15-min Average", f"{power.mean():,.0f} W")
+    col3.metric("🔌 15-min Energy", f"{energy_kwh(timestamps, power):.3f} kWh",
+                f"₹{energy_kwh(timestamps, power) * electricity_rate:.2f}", delta_color="off")
+    col4.metric("📶 Readings/s", f"{recent.sum() / max(timestamps[-1] - timestamps[recent][0], 1):,.0f}")
+    show_chart(live_power_trend(*resample(timestamps, power, 300), chart_theme))
+
+@st.cache_data(show_spinner=False)
+def cached_frontier(items, base_cost):
+    return what_if_frontier(items, base_cost)
+
+@st.cache_data(show_spinner="Simulating bills...")
+def cached_bill_bands(weekday_kwh, residuals, start, periods, samples, rate, base):
+    dates = pd.date_range(start, periods=periods, freq="D")
+    return bill_bands(simulate_bills_parallel(weekday_kwh, dates, samples, rate, base, np.asarray(residuals)))
+
+session_store = resources.session_store()
+if 'session_key' not in st.session_state:
+    st.session_state.session_key = uuid.uuid4().hex
+history = session_store.get(st.session_state.session_key)
+history.select(appliances)
+history.ensure(dates.values)
 
 # Create tabs
 tab1, tab2, tab3, tab4, tab5 = st.tabs(["📝 Daily Input", "📊 Analytics Dashboard", "📈 Advanced Charts", "🎯 Insights & Tips", "💰 Cost Analysis"])
@@ -177,34 +387,32 @@ with tab1:
     # Create columns for better layout
     col1, col2 = st.columns(2)
     
-    for i, day in enumerate(days):
+    for i, date in enumerate(dates):
         current_col = col1 if i % 2 == 0 else col2
         
         with current_col:
             st.markdown(f"""
             <div class="day-card">
-                <h4 style="color: #667eea; margin-bottom: 1rem;">{day}</h4>
+                <h4 style="color: #667eea; margin-bottom: 1rem;">{date:%A, %d %B %Y}</h4>
             </div>
             """, unsafe_allow_html=True)
             
-            # Calculate energy for this day
-            cal_energy = base_consumption
-            
             # Appliance checkboxes with icons
-            appliance_icons = {"AC": "🌡️", "Fridge": "🧊", "Washing Machine": "🧺"}
-            
+            day_usage = []
             for appliance in appliances:
                 checked = st.checkbox(
-                    f"{appliance_icons[appliance]} {appliance} (+3 kWh)", 
-                    key=f"{appliance.lower().replace(' ', '_')}_{day}",
-                    value=st.session_state.appliance_usage[day][appliance]
+                    f"{registry.loc[appliance, 'icon']} {appliance} (+{appliance_kwh[appliance]:g} kWh)", 
+                    key=f"{slug(appliance)}_{date:%Y-%m-%d}",
+                    value=history.used(date, appliance)
                 )
-                st.session_state.appliance_usage[day][appliance] = checked
-                if checked:
-                    cal_energy += 3
+                history.set_used(date, appliance, checked)
+                day_usage.append(checked)
             
-            # Store in session state
-            st.session_state.days_elec[day] = cal_energy
+            # Calculate energy for this day
+            cal_energy = float(daily_consumption(day_usage, list(appliance_kwh.values()), base_consumption))
+            
+            # Store in the session's history
+            history.set_kwh(date, cal_energy)
             
             # Display consumption with enhanced styling
             consumption_color = "#28a745" if cal_energy <= base_consumption + 3 else "#ffc107" if cal_energy <= base_consumption + 6 else "#dc3545"
@@ -217,24 +425,45 @@ with tab1:
             
             st.markdown("---")
 
+# Everything below the inputs is derived through this session's dataflow
+# graph, so a rerun only recomputes the frames a changed input feeds, e.g. a
+# new rate rebuilds the cost frames but not the anomalies or weekly stats;
+# charts are patched from the pooled templates on every run
+if 'dataflow' not in st.session_state:
+    st.session_state.dataflow = dashboard_graph(resources.figure_pool(), registry, resources.grid_intensity())
+flow = st.session_state.dataflow
+flow.reset_counts()
+flow.update(usage=history.usage_frame(dates), appliance_kwh=appliance_kwh, bhk=bhk, rate=electricity_rate,
+            theme=chart_theme, metered=metered, metered_co2=metered_co2, metered_home_co2=metered_home_co2)
+consumption, usage = flow['consumption'], flow['usage']
+appliance_co2, daily_co2 = flow['co2']
+
+# Unusual days flagged against the rolling weekly level
+anomalies = flow['anomalies']
+spike_dates = dates[anomalies.spikes]
+drift_dates = dates[anomalies.drifting]
+spike_days = flow['spike_days']
+
 with tab2:
+    if live_feed is not None:
+        st.markdown("### 📡 Live Consumption")
+        live_panel(live_feed)
+    
     st.markdown("### 📊 Consumption Analytics Dashboard")
     
     # Calculate statistics
-    total_consumption = sum(st.session_state.days_elec.values())
-    avg_consumption = total_consumption / 7 if st.session_state.days_elec else 0
-    estimated_monthly = total_consumption * 4.33 * electricity_rate
-    max_day = max(st.session_state.days_elec.items(), key=lambda x: x[1]) if st.session_state.days_elec else ("N/A", 0)
-    min_day = min(st.session_state.days_elec.items(), key=lambda x: x[1]) if st.session_state.days_elec else ("N/A", 0)
+    stats = flow['stats']
+    total_consumption, avg_consumption, max_date = stats['total'], stats['average'], stats['peak']
+    estimated_monthly = avg_consumption * 7 * 4.33 * electricity_rate
     
     # Enhanced metrics with better styling
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.metric(
-            label="🔌 Total Weekly",
+            label="🔌 Total Weekly" if period == "week" else f"🔌 Total ({period})",
             value=f"{total_consumption:.1f} kWh",
-            delta=f"{total_consumption - (base_consumption * 7):.1f} kWh"
+            delta=f"{total_consumption - (base_consumption * len(dates)):.1f} kWh"
         )
     
     with col2:
@@ -254,283 +483,108 @@ with tab2:
     with col4:
         st.metric(
             label="⚡ Peak Day",
-            value=f"{max_day[1]:.1f} kWh",
-            delta=f"{max_day[0]}"
+            value=f"{consumption[max_date]:.1f} kWh",
+            delta=f"{max_date:%a %d %b}"
         )
     
     # Enhanced bar chart with dual axis
-    if st.session_state.days_elec:
-        df_viz = pd.DataFrame(list(st.session_state.days_elec.items()), columns=['Day', 'Consumption'])
-        df_viz['Cost'] = df_viz['Consumption'] * electricity_rate
-        df_viz['Efficiency'] = df_viz['Consumption'] / base_consumption
-        
-        fig_bar = make_subplots(
-            rows=1, cols=2,
-            subplot_titles=('Daily Consumption (kWh)', 'Daily Cost (₹)'),
-            specs=[[{"secondary_y": False}, {"secondary_y": False}]]
-        )
-        
-        # Consumption bar chart
-        fig_bar.add_trace(
-            go.Bar(
-                x=df_viz['Day'],
-                y=df_viz['Consumption'],
-                name='Consumption',
-                marker_color='#667eea',
-                text=df_viz['Consumption'].round(1),
-                textposition='auto',
-            ),
-            row=1, col=1
-        )
-        
-        # Cost bar chart
-        fig_bar.add_trace(
-            go.Bar(
-                x=df_viz['Day'],
-                y=df_viz['Cost'],
-                name='Cost',
-                marker_color='#28a745',
-                text=df_viz['Cost'].round(2),
-                textposition='auto',
-            ),
-            row=1, col=2
-        )
-        
-        fig_bar.add_hline(y=base_consumption, line_dash="dash", line_color="red", 
-                         annotation_text="Base Consumption", row=1, col=1)
-        fig_bar.add_hline(y=base_consumption * electricity_rate, line_dash="dash", line_color="red", 
-                         annotation_text="Base Cost", row=1, col=2)
-        
-        fig_bar.update_layout(
-            height=400,
-            showlegend=False,
-            template=chart_theme,
-            title_text="Daily Consumption & Cost Analysis"
-        )
-        
-        st.plotly_chart(fig_bar, use_container_width=True)
+    if len(consumption):
+        show_chart(flow['fig_bar'])
         
         # Efficiency gauge
-        avg_efficiency = df_viz['Efficiency'].mean()
-        fig_gauge = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=avg_efficiency,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Efficiency Ratio (vs Base Consumption)"},
-            delta={'reference': 1},
-            gauge={
-                'axis': {'range': [None, 3]},
-                'bar': {'color': "#667eea"},
-                'steps': [
-                    {'range': [0, 1], 'color': "#28a745"},
-                    {'range': [1, 1.5], 'color': "#ffc107"},
-                    {'range': [1.5, 3], 'color': "#dc3545"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 2
-                }
-            }
-        ))
-        fig_gauge.update_layout(height=300, template=chart_theme)
-        st.plotly_chart(fig_gauge, use_container_width=True)
+        show_chart(flow['fig_gauge'])
 
 with tab3:
     st.markdown("### 📈 Advanced Visualization & Analytics")
     
-    if st.session_state.days_elec:
-        # Create enhanced dataframe
-        df_viz = pd.DataFrame(list(st.session_state.days_elec.items()), columns=['Day', 'Consumption'])
-        df_viz['Cost'] = df_viz['Consumption'] * electricity_rate
-        df_viz['Day_Num'] = range(len(df_viz))
-        
-        # Calculate appliance contributions
-        appliance_data = []
-        for day in days:
-            for appliance in appliances:
-                if st.session_state.appliance_usage[day][appliance]:
-                    appliance_data.append({'Day': day, 'Appliance': appliance, 'Consumption': 3})
-        
-        df_appliances = pd.DataFrame(appliance_data)
-        
+    if len(consumption):
         # Multi-chart layout
         col1, col2 = st.columns(2)
         
         with col1:
-            # Radar chart for weekly pattern
-            fig_radar = go.Figure()
-            fig_radar.add_trace(go.Scatterpolar(
-                r=df_viz['Consumption'].tolist(),
-                theta=df_viz['Day'].tolist(),
-                fill='toself',
-                name='Weekly Pattern',
-                line_color='#667eea'
-            ))
-            fig_radar.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, max(df_viz['Consumption']) * 1.1]
-                    )),
-                showlegend=False,
-                title="Weekly Consumption Pattern",
-                template=chart_theme,
-                height=400
-            )
-            st.plotly_chart(fig_radar, use_container_width=True)
+            # Radar chart for the weekday pattern (averaged over the dates shown)
+            show_chart(flow['fig_radar'])
         
         with col2:
-            # Stacked bar chart for appliance breakdown
-            if not df_appliances.empty:
-                fig_stack = px.bar(
-                    df_appliances, 
-                    x='Day', 
-                    y='Consumption',
-                    color='Appliance',
-                    title='Appliance Usage Breakdown',
-                    color_discrete_map={
-                        'AC': '#ff6b6b',
-                        'Fridge': '#4ecdc4',
-                        'Washing Machine': '#45b7d1'
-                    }
-                )
-                fig_stack.update_layout(height=400, template=chart_theme)
-                st.plotly_chart(fig_stack, use_container_width=True)
+            # Stacked bar chart for appliance breakdown (measured when a meter file is uploaded)
+            fig_stack = flow['fig_stack']
+            if fig_stack is not None:
+                show_chart(fig_stack)
             else:
                 st.info("Select some appliances to see the breakdown chart.")
         
-        # Heatmap for appliance usage
-        heatmap_data = []
-        for day in days:
-            row = []
-            for appliance in appliances:
-                row.append(1 if st.session_state.appliance_usage[day][appliance] else 0)
-            heatmap_data.append(row)
-        
-        fig_heatmap = go.Figure(data=go.Heatmap(
-            z=heatmap_data,
-            x=appliances,
-            y=days,
-            colorscale='RdYlBu_r',
-            text=heatmap_data,
-            texttemplate="%{text}",
-            textfont={"size": 16},
-            hoverongaps=False
-        ))
-        fig_heatmap.update_layout(
-            title="Appliance Usage Heatmap",
-            template=chart_theme,
-            height=400
-        )
-        st.plotly_chart(fig_heatmap, use_container_width=True)
-        
-        # Time series with trend
-        fig_trend = go.Figure()
-        fig_trend.add_trace(go.Scatter(
-            x=df_viz['Day'],
-            y=df_viz['Consumption'],
-            mode='lines+markers',
-            name='Actual Consumption',
-            line=dict(color='#667eea', width=3),
-            marker=dict(size=8)
-        ))
-        
-        # Add trend line
-        z = np.polyfit(df_viz['Day_Num'], df_viz['Consumption'], 1)
-        p = np.poly1d(z)
-        fig_trend.add_trace(go.Scatter(
-            x=df_viz['Day'],
-            y=p(df_viz['Day_Num']),
-            mode='lines',
-            name='Trend Line',
-            line=dict(color='red', width=2, dash='dash')
-        ))
-        
-        fig_trend.add_hline(y=base_consumption, line_dash="dot", line_color="green", 
-                           annotation_text="Base Consumption")
-        
-        fig_trend.update_layout(
-            title="Consumption Trend Analysis",
-            xaxis_title="Day",
-            yaxis_title="Consumption (kWh)",
-            template=chart_theme,
-            height=400
-        )
-        st.plotly_chart(fig_trend, use_container_width=True)
+        # Heatmap for appliance usage (kWh per day when metered)
+        show_chart(flow['fig_heatmap'])
+        
+        # Time series with trend and anomaly markers
+        show_chart(flow['fig_trend'])
+        
+        # Coarse meter overview; selecting a window loads its detail from disk
+        if meter_file is not None:
+            meter_explorer(meter_pyramid(content_key(meter_file.getvalue()), meter_file.getvalue()))
         
         # Distribution analysis
         col1, col2 = st.columns(2)
         
         with col1:
-            fig_hist = px.histogram(
-                df_viz, 
-                x='Consumption', 
-                nbins=10,
-                title='Consumption Distribution',
-                color_discrete_sequence=['#667eea']
-            )
-            fig_hist.update_layout(template=chart_theme, height=300)
-            st.plotly_chart(fig_hist, use_container_width=True)
+            show_chart(flow['fig_hist'])
         
         with col2:
-            fig_box = px.box(
-                df_viz, 
-                y='Consumption',
-                title='Consumption Statistics',
-                color_discrete_sequence=['#667eea']
-            )
-            fig_box.update_layout(template=chart_theme, height=300)
-            st.plotly_chart(fig_box, use_container_width=True)
+            show_chart(flow['fig_box'])
+        
+        # Weekday and week-over-week views once the range spans more than a week
+        if len(dates) > 7:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                show_chart(flow['fig_weekdays'])
+            
+            with col2:
+                show_chart(flow['fig_weeks'])
 
 with tab4:
     st.markdown("### 🎯 Smart Insights & Energy Saving Tips")
     
-    if st.session_state.days_elec:
-        total_consumption = sum(st.session_state.days_elec.values())
-        avg_consumption = total_consumption / 7
-        
-        # Smart insights
-        if avg_consumption > base_consumption * 1.5:
-            st.markdown("""
+    if len(consumption):
+        # Smart insights driven by the anomaly detector
+        if len(spike_dates):
+            spike_list = ", ".join(f"{label} ({consumption[date]:.1f} kWh)" for label, date in zip(spike_days, spike_dates))
+            st.markdown(f"""
             <div class="warning-box">
-                <h4>⚠️ High Consumption Alert</h4>
-                <p>Your average consumption is significantly higher than the base consumption. Consider optimizing appliance usage.</p>
+                <h4>⚠️ Unusual Consumption Detected</h4>
+                <p>These days stand well above your typical daily level: {spike_list}.</p>
             </div>
             """, unsafe_allow_html=True)
-        elif avg_consumption < base_consumption * 1.2:
-            st.markdown("""
-            <div class="success-box">
-                <h4>✅ Excellent Energy Efficiency</h4>
-                <p>Great job! You're maintaining excellent energy efficiency with minimal excess consumption.</p>
+        if len(drift_dates):
+            st.markdown(f"""
+            <div class="insight-box">
+                <h4>📈 Consumption Creeping Up</h4>
+                <p>Your usage has stayed above its usual level since {drift_dates[0]:%a %d %b}. Check for appliances left running longer than needed.</p>
             </div>
             """, unsafe_allow_html=True)
-        else:
+        if not len(spike_dates) and not len(drift_dates):
             st.markdown("""
-            <div class="insight-box">
-                <h4>📊 Moderate Consumption</h4>
-                <p>Your consumption is moderate. There's room for improvement with smart energy practices.</p>
+            <div class="success-box">
+                <h4>✅ Steady Consumption</h4>
+                <p>Great job! No unusual spikes or upward drift in your daily consumption for these dates.</p>
             </div>
             """, unsafe_allow_html=True)
         
         # Personalized recommendations
         st.markdown("#### 💡 Personalized Recommendations")
         
-        # Analyze appliance usage
-        total_ac_usage = sum(1 for day in days if st.session_state.appliance_usage[day]["AC"])
-        total_fridge_usage = sum(1 for day in days if st.session_state.appliance_usage[day]["Fridge"])
-        total_wm_usage = sum(1 for day in days if st.session_state.appliance_usage[day]["Washing Machine"])
-        
-        recommendations = []
-        
-        if total_ac_usage > 5:
-            recommendations.append("🌡️ Consider using AC more efficiently: Set temperature to 24°C, use timers, and ensure proper insulation.")
-        
-        if total_fridge_usage == 7:
-            recommendations.append("🧊 Optimize fridge usage: Keep it well-organized, avoid frequent opening, and maintain proper temperature.")
+        appliance_tips = {
+            "AC": "🌡️ Consider using AC more efficiently: Set temperature to 24°C, use timers, and ensure proper insulation.",
+            "Fridge": "🧊 Optimize fridge usage: Keep it well-organized, avoid frequent opening, and maintain proper temperature.",
+            "Washing Machine": "🧺 Washing machine efficiency: Use cold water when possible, run full loads, and clean the filter regularly."
+        }
         
-        if total_wm_usage > 4:
-            recommendations.append("🧺 Washing machine efficiency: Use cold water when possible, run full loads, and clean the filter regularly.")
+        # Suggest tips for the appliances that were running on flagged days
+        flagged = usage.loc[spike_dates.union(drift_dates)].any()
+        recommendations = [
+            tip for appliance, tip in appliance_tips.items()
+            if flagged.get(appliance, False)
+        ]
         
         if not recommendations:
             recommendations.append("✨ You're doing great! Continue monitoring your usage patterns.")
@@ -541,101 +595,236 @@ with tab4:
         # Potential savings calculation
         st.markdown("#### 💰 Potential Savings")
         
-        potential_savings = []
-        if total_ac_usage > 0:
-            ac_savings = total_ac_usage * 3 * 0.2 * electricity_rate  # 20% savings possible
-            potential_savings.append(f"AC optimization: ₹{ac_savings:.2f}/week")
-        
-        if total_fridge_usage > 0:
-            fridge_savings = total_fridge_usage * 3 * 0.1 * electricity_rate  # 10% savings possible
-            potential_savings.append(f"Fridge optimization: ₹{fridge_savings:.2f}/week")
-        
-        if potential_savings:
-            st.success(f"Potential weekly savings: {', '.join(potential_savings)}")
+        # Cheapest run times for shiftable appliances under the time-of-use tariff
+        shiftable = shiftable_appliances(registry, appliances)
+        runs_per_week = (usage[shiftable.index].sum() * 7 / len(dates)).round(1).to_numpy()
+        
+        if runs_per_week.any():
+            schedule = optimal_schedule(
+                resources.tou_prices(electricity_rate),
+                shiftable['kwh_per_day'].to_numpy(),
+                shiftable['run_hours'].to_numpy(),
+                shiftable['window_start'].to_numpy(),
+                shiftable['window_end'].to_numpy()
+            )
+            df_schedule = pd.DataFrame({
+                'Appliance': shiftable.index,
+                'Allowed Window': [f"{start:02d}:00–{end % 24:02d}:00" for start, end in
+                                   zip(shiftable['window_start'], shiftable['window_end'])],
+                'Best Start': [f"{int(hour):02d}:{int(round(hour % 1 * 60)):02d}" for hour in schedule.start[0]],
+                'Runs/Week': runs_per_week,
+                'Weekly Savings (₹)': (schedule.savings[0] * runs_per_week).round(2)
+            })
+            df_schedule = df_schedule[df_schedule['Runs/Week'] > 0]
+            
+            st.dataframe(df_schedule, use_container_width=True, hide_index=True)
+            st.success(f"Potential weekly savings by shifting run times: ₹{df_schedule['Weekly Savings (₹)'].sum():.2f}")
+        else:
+            st.info("Use a shiftable appliance (washing machine, dishwasher, EV charger, water heater) to see load-shifting savings.")
+        
+        # What-if planner: which appliance-days to skip to stay within a weekly budget
+        st.markdown("#### 🔮 What-If Planner")
+        
+        day_index, app_index = np.nonzero(usage.to_numpy())
+        df_items = pd.DataFrame({
+            'Day': np.asarray(day_labels(dates))[day_index],
+            'Appliance': usage.columns[app_index],
+            'Cost': usage.columns[app_index].map(appliance_kwh).to_numpy(dtype=float) * electricity_rate,
+            'Comfort': 1.0
+        })
+        
+        frontier = None
+        if not df_items.empty:
+            base_weekly_cost = base_consumption * len(dates) * electricity_rate
+            current_cost = base_weekly_cost + df_items['Cost'].sum()
+            try:
+                frontier = cached_frontier(df_items[['Cost', 'Comfort']], base_weekly_cost)
+            except ValueError as exc:
+                st.info(f"The what-if planner can't cover this many appliance-days ({exc}). Try a shorter date range.")
+        
+        if frontier is not None:
+            budget = st.number_input(
+                "Weekly budget (₹)" if period == "week" else f"Budget for {period} (₹)", min_value=0.0, value=float(round(current_cost * 0.9)), step=10.0
+            )
+            
+            fig_frontier = cost_frontier(frontier, current_cost, df_items['Comfort'].sum(), budget, chart_theme)
+            show_chart(fig_frontier)
+            
+            best = best_within_budget(frontier, budget)
+            if best is None:
+                st.warning(f"Even skipping every appliance costs ₹{frontier['Cost'].min():.2f} per {period}.")
+            else:
+                skipped = df_items[~best['Keep']]
+                if skipped.empty:
+                    st.success(f"Your current {period} (₹{current_cost:.2f}) already fits the budget.")
+                else:
+                    plan = "; ".join(
+                        f"{appliance} on {', '.join(group['Day'])}"
+                        for appliance, group in skipped.groupby('Appliance', sort=False)
+                    )
+                    st.info(f"To stay within ₹{budget:.0f} per {period} (₹{best['Cost']:.2f}), skip: {plan}.")
     else:
         st.info("Enter your daily consumption data to get personalized insights and recommendations.")
 
 with tab5:
     st.markdown("### 💰 Detailed Cost Analysis")
     
-    if st.session_state.days_elec:
-        df_viz = pd.DataFrame(list(st.session_state.days_elec.items()), columns=['Day', 'Consumption'])
-        df_viz['Cost'] = df_viz['Consumption'] * electricity_rate
-        df_viz['Base_Cost'] = base_consumption * electricity_rate
-        df_viz['Extra_Cost'] = df_viz['Cost'] - df_viz['Base_Cost']
+    if len(consumption):
+        df_viz = flow['costs']
         
         # Cost metrics
         col1, col2, col3, col4 = st.columns(4)
         
+        # Estimates scale the daily average, so ranges other than a week compare fairly
+        weekly_cost, weekly_co2 = df_viz['Cost'].mean() * 7, df_viz['CO2_kg'].mean() * 7
+        
         with col1:
-            st.metric("Weekly Cost", f"₹{df_viz['Cost'].sum():.2f}")
+            st.metric("Weekly Cost", f"₹{weekly_cost:.2f}", f"{weekly_co2:.1f} kg CO₂", delta_color="off")
         
         with col2:
-            st.metric("Daily Average", f"₹{df_viz['Cost'].mean():.2f}")
+            st.metric("Daily Average", f"₹{df_viz['Cost'].mean():.2f}", f"{df_viz['CO2_kg'].mean():.1f} kg CO₂", delta_color="off")
         
         with col3:
-            st.metric("Monthly Estimate", f"₹{df_viz['Cost'].sum() * 4.33:.2f}")
+            st.metric("Monthly Estimate", f"₹{weekly_cost * 4.33:.2f}", f"{weekly_co2 * 4.33:.0f} kg CO₂", delta_color="off")
         
         with col4:
-            st.metric("Annual Estimate", f"₹{df_viz['Cost'].sum() * 52:.2f}")
+            st.metric("Annual Estimate", f"₹{weekly_cost * 52:.2f}", f"{weekly_co2 * 52 / 1000:.2f} t CO₂", delta_color="off")
+        
+        # Monte Carlo bill bands with weekday and seasonal effects
+        if st.checkbox("🎲 Show bill uncertainty bands (Monte Carlo)"):
+            samples = st.select_slider("Simulated periods", options=[10_000, 100_000, 1_000_000], value=100_000)
+            # Weekday means plus each tracked day's ratio to its weekday mean, resampled as day-to-day variation
+            weekday_kwh, residuals = weekday_profile(consumption.index.dayofweek, consumption.to_numpy())
+            weekday_kwh, residuals = tuple(weekday_kwh), tuple(residuals)
+            next_month = pd.Timestamp.now().normalize() + pd.offsets.MonthBegin(1)
+            month_bands = cached_bill_bands(weekday_kwh, residuals, next_month, next_month.days_in_month,
+                                            samples, electricity_rate, base_consumption)
+            year_bands = cached_bill_bands(weekday_kwh, residuals, next_month, 365,
+                                           max(samples // 10, 10_000), electricity_rate, base_consumption)
+            
+            df_bands = pd.DataFrame({
+                'Period': [f"Next month ({next_month:%b %Y})", "Next 12 months"],
+                'P10 (₹)': [month_bands['P10'], year_bands['P10']],
+                'P50 (₹)': [month_bands['P50'], year_bands['P50']],
+                'P90 (₹)': [month_bands['P90'], year_bands['P90']]
+            }).round(2)
+            st.dataframe(df_bands, use_container_width=True, hide_index=True)
+            st.caption("8 in 10 simulated bills fall between P10 and P90. Seasonal factors scale usage above your base load; "
+                       "once more than a week is tracked, day-to-day swings are resampled from your own days.")
+        
+        # Metered usage per utility billing cycle, checked against uploaded bills
+        with st.expander("🧾 Billing Cycles"):
+            if meter_file is None:
+                st.info("Upload smart meter readings in the sidebar to split them into billing cycles.")
+            else:
+                cycle_day = st.number_input("Billing cycle starts on day", min_value=1, max_value=28, value=1, step=1)
+                df_cycles = metered_cycles(meter_file.getvalue(), cycle_day)
+                bill_file = st.file_uploader("Utility bills (CSV)", type="csv", key="bill_file",
+                                             help="Columns: cycle_start, billed_kwh")
+                bills = None
+                if bill_file is not None:
+                    try:
+                        bills = load_bills(bill_file)
+                        footprint_caption(memory_footprint(bills))
+                    except ValueError as exc:
+                        st.error(f"Bills rejected: {exc}")
+                if bills is not None:
+                    if 'household_id' not in bills:
+                        bills['household_id'] = 'home'
+                    df_cycles = reconcile(df_cycles, bills)
+                    mismatched = df_cycles[df_cycles['status'] == 'mismatch']
+                    if not mismatched.empty:
+                        st.warning("Billed kWh differs from your meter for cycles starting " +
+                                   ", ".join(f"{start:%d %b %Y}" for start in mismatched['cycle_start']) + ".")
+                    else:
+                        st.success("Every billed cycle your meter readings fully cover matches them.")
+                df_cycles['Cost (₹)'] = (df_cycles['kwh'] * electricity_rate).round(2)
+                df_cycles = df_cycles.drop(columns='household_id')
+                numeric = df_cycles.select_dtypes('number').columns
+                df_cycles[numeric] = df_cycles[numeric].round(2)
+                st.dataframe(df_cycles, use_container_width=True, hide_index=True)
+        
+        # Rooftop solar netted against the load per 15-minute interval
+        with st.expander("☀️ Rooftop Solar & Net Metering"):
+            col1, col2, col3 = st.columns(3)
+            capacity_kw = col1.number_input("Panel capacity (kWp)", min_value=0.0, max_value=20.0, value=3.0, step=0.5)
+            latitude = col2.number_input("Latitude (°)", min_value=-60.0, max_value=60.0, value=19.1, step=0.5,
+                                         help="Used by the clear-sky generation model")
+            export_rate = col3.number_input("Export tariff (₹/kWh)", min_value=0.0, max_value=20.0, value=3.0, step=0.5)
+            tou_import = st.checkbox("Bill imports at time-of-use prices", key="solar_tou")
+            inverter_file = st.file_uploader("Inverter output (CSV)", type="csv", key="inverter_file",
+                                             help="Columns: timestamp, power_w; replaces the clear-sky model")
+            inverter_data = None
+            if inverter_file is not None:
+                try:
+                    footprint_caption(upload_footprint(inverter_file.getvalue(), INVERTER_SCHEMA))
+                    inverter_data = inverter_file.getvalue()
+                except ValueError as exc:
+                    st.error(f"Inverter readings rejected: {exc}")
+            
+            df_solar = solar_intervals(consumption, meter_file.getvalue() if meter_file is not None else None,
+                                       inverter_data, capacity_kw, latitude)
+            import_rate = resources.tou_prices(electricity_rate)[df_solar.index.hour] if tou_import else electricity_rate
+            solar = net_metering(df_solar['Load'].to_numpy(), df_solar['Generation'].to_numpy(), import_rate, export_rate)
+            generated, exported = solar.generation[0], solar.exported[0]
+            days = len(df_solar) * INTERVAL_HOURS / 24
+            
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("☀️ Generated", f"{generated:.1f} kWh", f"over {days:.0f} days", delta_color="off")
+            col2.metric("🏠 Used On Site", f"{generated - exported:.1f} kWh",
+                        f"{(generated - exported) / generated:.0%} of generation" if generated else None, delta_color="off")
+            col3.metric("🔌 Imported / Exported", f"{solar.imported[0]:.1f} / {exported:.1f} kWh")
+            col4.metric("💰 Net Bill", f"₹{solar.bill[0]:.2f}" if solar.bill[0] >= 0 else f"₹{-solar.bill[0]:.2f} credit",
+                        f"-₹{solar.bill_without_solar[0] - solar.bill[0]:.2f}", delta_color="inverse")
+            profile = df_solar.groupby(df_solar.index.strftime('%H:%M')).mean()
+            show_chart(solar_day_profile(profile, chart_theme))
+            source = "your inverter log" if inverter_data is not None else "a clear-sky model, so cloudy days will produce less"
+            load_source = "smart meter readings" if meter_file is not None else "tracked days spread over a typical daily load shape"
+            st.caption(f"Generation from {source}; load from {load_source}. Each 15-minute interval imports what "
+                       f"generation does not cover and exports the surplus.")
+        
+        # Battery sizes simulated together against the same load, solar and tariffs
+        with st.expander("🔋 Home Battery"):
+            col1, col2 = st.columns(2)
+            grid_charge = col1.checkbox("Charge from the grid at the cheapest time-of-use hours", value=True,
+                                        disabled=not tou_import, key="battery_grid_charge")
+            cost_per_kwh = col2.number_input("Installed cost (₹/kWh)", min_value=0.0, max_value=100_000.0,
+                                             value=25_000.0, step=1_000.0)
+            df_battery = cached_battery_savings(df_solar['Load'].to_numpy(), df_solar['Generation'].to_numpy(),
+                                                import_rate, export_rate, grid_charge and tou_import)
+            df_battery['Annual Savings (₹)'] = df_battery['Savings (₹)'] * 365 / days
+            df_battery['Payback (years)'] = (df_battery['Capacity (kWh)'] * cost_per_kwh
+                                             / df_battery['Annual Savings (₹)'].where(df_battery['Annual Savings (₹)'] > 0))
+            best = df_battery.iloc[1:]['Annual Savings (₹)'].idxmax()
+            if df_battery.loc[best, 'Savings (₹)'] > 0:
+                st.success(f"A {df_battery.loc[best, 'Capacity (kWh)']:g} kWh battery saves the most: "
+                           f"₹{df_battery.loc[best, 'Annual Savings (₹)']:,.0f} a year.")
+            else:
+                st.info("No battery size lowers this bill: there is no solar surplus to store"
+                        + ("." if tou_import else " and a flat tariff leaves nothing to shift."))
+            st.dataframe(df_battery.round(2), use_container_width=True, hide_index=True)
+            st.caption(f"Uses the load, solar and tariffs from Rooftop Solar above. Each battery charges and "
+                       f"discharges at up to {C_RATE:g}× its capacity per hour; sizes {', '.join(f'{c:g}' for c in CAPACITIES)} "
+                       f"kWh are simulated side by side over {days:.0f} days and scaled to a year.")
         
         # Cost breakdown charts
         col1, col2 = st.columns(2)
         
         with col1:
             # Daily cost breakdown
-            fig_cost_bar = px.bar(
-                df_viz, 
-                x='Day', 
-                y=['Base_Cost', 'Extra_Cost'],
-                title='Daily Cost Breakdown',
-                color_discrete_map={'Base_Cost': '#28a745', 'Extra_Cost': '#dc3545'}
-            )
-            fig_cost_bar.update_layout(template=chart_theme, height=400)
-            st.plotly_chart(fig_cost_bar, use_container_width=True)
+            show_chart(flow['fig_cost_bar'])
         
         with col2:
             # Cost vs consumption scatter
-            fig_scatter = px.scatter(
-                df_viz, 
-                x='Consumption', 
-                y='Cost',
-                size='Extra_Cost',
-                color='Day',
-                title='Cost vs Consumption Analysis',
-                hover_data=['Day', 'Consumption', 'Cost']
-            )
-            fig_scatter.update_layout(template=chart_theme, height=400)
-            st.plotly_chart(fig_scatter, use_container_width=True)
+            show_chart(flow['fig_scatter'])
         
         # Cost comparison table
         st.markdown("#### 📊 Detailed Cost Breakdown")
-        df_display = df_viz.copy()
-        df_display['Efficiency'] = (df_display['Consumption'] / base_consumption).round(2)
-        df_display = df_display.round(2)
-        
-        st.dataframe(
-            df_display[['Day', 'Consumption', 'Cost', 'Base_Cost', 'Extra_Cost', 'Efficiency']],
-            use_container_width=True
-        )
+        sorted_table(flow['cost_index'], "cost_breakdown")
         
         # Rate comparison
         st.markdown("#### ⚖️ Rate Comparison Impact")
-        rates = [3, 4, 5, 6, 7, 8]
-        total_consumption = df_viz['Consumption'].sum()
-        
-        comparison_data = []
-        for rate in rates:
-            weekly_cost = total_consumption * rate
-            monthly_cost = weekly_cost * 4.33
-            comparison_data.append({
-                'Rate (₹/kWh)': rate,
-                'Weekly Cost': f"₹{weekly_cost:.2f}",
-                'Monthly Cost': f"₹{monthly_cost:.2f}",
-                'Annual Cost': f"₹{weekly_cost * 52:.2f}"
-            })
-        
-        df_comparison = pd.DataFrame(comparison_data)
+        df_comparison = rate_comparison(consumption.mean() * 7)
         st.dataframe(df_comparison, use_container_width=True)
     else:
         st.info("Enter your daily consumption data to see detailed cost analysis.")
@@ -651,34 +840,33 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Export functionality
-if st.session_state.days_elec:
+if len(consumption):
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 📥 Export Options")
     
     # Create comprehensive export data
-    export_data = []
-    for day in days:
-        row = {
-            'Day': day,
-            'Consumption_kWh': st.session_state.days_elec.get(day, 0),
-            'Cost_INR': st.session_state.days_elec.get(day, 0) * electricity_rate,
-            'AC_Used': st.session_state.appliance_usage[day]["AC"],
-            'Fridge_Used': st.session_state.appliance_usage[day]["Fridge"],
-            'Washing_Machine_Used': st.session_state.appliance_usage[day]["Washing Machine"]
-        }
-        export_data.append(row)
-    
-    df_export = pd.DataFrame(export_data)
+    df_export = pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%d'),
+        'Day': dates.day_name(),
+        'Consumption_kWh': consumption.to_numpy(),
+        'Cost_INR': consumption.to_numpy() * electricity_rate,
+        'CO2_kg': daily_co2,
+    })
+    df_export = df_export.join(usage.set_axis([f"{appliance.replace(' ', '_')}_Used" for appliance in appliances],
+                                              axis=1).reset_index(drop=True))
+    df_export = df_export.join(appliance_co2.set_axis([co2_column(appliance) for appliance in appliance_co2.columns],
+                                                      axis=1).reset_index(drop=True))
     
     # Add summary row
     summary_row = {
-        'Day': 'TOTAL/AVERAGE',
+        'Date': 'TOTAL/AVERAGE',
         'Consumption_kWh': df_export['Consumption_kWh'].sum(),
         'Cost_INR': df_export['Cost_INR'].sum(),
-        'AC_Used': df_export['AC_Used'].sum(),
-        'Fridge_Used': df_export['Fridge_Used'].sum(),
-        'Washing_Machine_Used': df_export['Washing_Machine_Used'].sum()
+        'CO2_kg': df_export['CO2_kg'].sum(),
     }
+    for column in df_export.columns:
+        if column.endswith(('_Used', '_CO2_kg')):
+            summary_row[column] = df_export[column].sum()
     df_export = pd.concat([df_export, pd.DataFrame([summary_row])], ignore_index=True)
     
     csv = df_export.to_csv(index=False)
@@ -691,6 +879,36 @@ if st.session_state.days_elec:
     
     # Quick stats in sidebar
     st.sidebar.markdown("### 📈 Quick Stats")
-    st.sidebar.metric("Total Consumption", f"{sum(st.session_state.days_elec.values()):.1f} kWh")
-    st.sidebar.metric("Total Cost", f"₹{sum(st.session_state.days_elec.values()) * electricity_rate:.2f}")
-    st.sidebar
\ No newline at end of file
+    st.sidebar.metric("Total Consumption", f"{consumption.sum():.1f} kWh")
+    st.sidebar.metric("Total Cost", f"₹{consumption.sum() * electricity_rate:.2f}")
+    st.sidebar.metric("Total Emissions", f"{daily_co2.sum():.1f} kg CO₂")
+    st.sidebar
+
+# Memory accounting: this session's objects, and every session on this server. Sizes only
+# change when the graph stores a new value, the history grows or state gains a key, so
+# the breakdown is only retaken then rather than on every rerun
+session_state = {key: value for key, value in st.session_state.to_dict().items()
+                 if key not in ('memory_version', 'session_memory')}
+memory_version = (flow.version, history.usage.shape, len(session_state))
+if st.session_state.get('memory_version') != memory_version:
+    st.session_state.session_memory = memory_breakdown({**session_state, 'history': history})
+    st.session_state.memory_version = memory_version
+    session_store.record(st.session_state.session_key, st.session_state.session_memory)
+session_memory = st.session_state.session_memory
+if st.sidebar.checkbox("🧠 Show memory usage", value=False):
+    st.sidebar.caption(f"This session: {session_memory['Bytes'].sum():,} bytes")
+    st.sidebar.dataframe(session_memory, hide_index=True)
+    server_memory, store_stats = session_store.report()
+    st.sidebar.caption(
+        f"Server: {store_stats['Sessions']} sessions, {store_stats['Resident']} in memory "
+        f"({store_stats['Resident Bytes']:,} bytes), {store_stats['Spilled']} spilled to disk"
+    )
+    st.sidebar.dataframe(server_memory, hide_index=True)
+
+# Dataflow introspection: what this rerun recomputed, and the whole graph
+if st.sidebar.checkbox("🔀 Show dataflow graph", value=False):
+    recomputed = flow.last_runs
+    st.sidebar.caption(f"Recomputed this run: {', '.join(recomputed) or 'nothing'}")
+    with st.expander("🔀 Dataflow graph", expanded=True):
+        st.graphviz_chart(flow.to_dot(highlight=recomputed))
+        st.dataframe(flow.describe(), use_container_width=True, hide_index=True)
@@ -2,6 +2,10 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 import numpy as np
+from figures import weekday_means, weekly_totals
+from tables import energy_highlight, paged_table
+from appliances import DEFAULT_APPLIANCES, daily_consumption, kwh_vector, slug
+import resources
 
 # Page configuration
 st.set_page_config(
@@ -77,64 +81,63 @@ with st.sidebar:
     base_energy = (bhk + 1) * 4 + (bhk + 1) * 8
     st.info(f"Base Energy: ({bhk}+1) × 4 + ({bhk}+1) × 8 = {base_energy} kWh")
     
-    # Appliance energy consumption
+    # Appliance energy consumption from the registry
     st.subheader("⚡ Appliance Consumption")
-    appliance_data = {
-        "Appliance": ["AC", "Fridge", "Washing Machine"],
-        "Energy (kWh)": [3, 3, 3],
-        "Icon": ["❄️", "🧊", "🧺"]
-    }
+    registry = resources.registry()
+    appliances = st.multiselect("Appliances in your home", list(registry.index), default=DEFAULT_APPLIANCES)
+    appliance_kwh = kwh_vector(registry, appliances)
+    
+    for appliance, energy in zip(appliances, appliance_kwh):
+        st.markdown(f"{registry.loc[appliance, 'icon']} **{appliance}**: {energy:g} kWh")
     
-    for i, (appliance, energy, icon) in enumerate(zip(
-        appliance_data["Appliance"], 
-        appliance_data["Energy (kWh)"], 
-        appliance_data["Icon"]
-    )):
-        st.markdown(f"{icon} **{appliance}**: {energy} kWh")
+    st.markdown("---")
+    st.header("📅 Dates")
+    
+    # The current Monday–Sunday week unless the user picks another range
+    MAX_DAYS = 31
+    today = pd.Timestamp.now().normalize()
+    week_start = today - pd.Timedelta(days=today.dayofweek)
+    picked = st.date_input("Dates to calculate", value=(week_start, week_start + pd.Timedelta(days=6)),
+                           help=f"Pick a start and end date (up to {MAX_DAYS} days)")
+    picked = picked if isinstance(picked, (tuple, list)) else (picked,)
+    start_date = pd.Timestamp(picked[0])
+    end_date = pd.Timestamp(picked[1]) if len(picked) > 1 else start_date + pd.Timedelta(days=6)
+    end_date = min(end_date, start_date + pd.Timedelta(days=MAX_DAYS - 1))
+    dates = pd.date_range(start_date, end_date, freq="D")
 
 # Main content area
 col1, col2 = st.columns([2, 1])
 
 with col1:
-    st.header("📅 Weekly Energy Consumption")
+    st.header("📅 Daily Energy Consumption")
     
-    # Days of the week
-    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    days_elec = {}
+    daily_energy = []
     
-    # Create tabs for each day
-    day_tabs = st.tabs(days)
+    # Create tabs for each date
+    day_tabs = st.tabs(list(dates.strftime("%a %d %b")))
     
-    for i, day in enumerate(days):
+    for i, date in enumerate(dates):
         with day_tabs[i]:
-            st.subheader(f"🗓️ {day}")
+            st.subheader(f"🗓️ {date:%A, %d %B %Y}")
             
-            col_a, col_b, col_c = st.columns(3)
+            appliance_cols = st.columns(3)
+            day_usage = []
             
-            with col_a:
-                ac = st.checkbox(f"❄️ AC", key=f"ac_{day}")
-                
-            with col_b:
-                fridge = st.checkbox(f"🧊 Fridge", key=f"fridge_{day}")
-                
-            with col_c:
-                washing_machine = st.checkbox(f"🧺 Washing Machine", key=f"wm_{day}")
+            for j, appliance in enumerate(appliances):
+                with appliance_cols[j % 3]:
+                    day_usage.append(st.checkbox(
+                        f"{registry.loc[appliance, 'icon']} {appliance}", key=f"{slug(appliance)}_{date:%Y-%m-%d}"
+                    ))
             
             # Calculate energy for this day
-            cal_energy = base_energy
-            if ac:
-                cal_energy += 3
-            if fridge:
-                cal_energy += 3
-            if washing_machine:
-                cal_energy += 3
+            cal_energy = round(float(daily_consumption(day_usage, appliance_kwh, base_energy)), 3)
             
-            days_elec[day] = cal_energy
+            daily_energy.append(cal_energy)
             
             # Show daily consumption
             st.markdown(f"""
             <div class="day-card">
-                <h4>{day} Total: {cal_energy} kWh</h4>
+                <h4>{date:%A} Total: {cal_energy} kWh</h4>
                 <p>Base: {base_energy} kWh + Appliances: {cal_energy - base_energy} kWh</p>
             </div>
             """, unsafe_allow_html=True)
@@ -142,17 +145,21 @@ with col1:
 with col2:
     st.header("📈 Quick Stats")
     
+    # Daily kWh indexed by date
+    days_elec = pd.Series(daily_energy, index=dates, name="Energy (kWh)")
+    
     # Calculate statistics
-    total_weekly = sum(days_elec.values())
-    avg_daily = total_weekly / 7
-    max_day = max(days_elec, key=days_elec.get)
-    min_day = min(days_elec, key=days_elec.get)
+    total_energy = days_elec.sum()
+    avg_daily = days_elec.mean()
+    total_weekly = avg_daily * 7
+    max_day = days_elec.idxmax()
+    min_day = days_elec.idxmin()
     
     # Display metrics
-    st.metric("Total Weekly", f"{total_weekly:.1f} kWh")
+    st.metric("Total" if len(dates) != 7 else "Total Weekly", f"{total_energy:.1f} kWh")
     st.metric("Average Daily", f"{avg_daily:.1f} kWh")
-    st.metric("Highest Day", f"{max_day}", f"{days_elec[max_day]:.1f} kWh")
-    st.metric("Lowest Day", f"{min_day}", f"{days_elec[min_day]:.1f} kWh")
+    st.metric("Highest Day", f"{max_day:%a %d %b}", f"{days_elec[max_day]:.1f} kWh")
+    st.metric("Lowest Day", f"{min_day:%a %d %b}", f"{days_elec[min_day]:.1f} kWh")
     
     # Energy cost estimation
     st.subheader("💰 Cost Estimation")
@@ -171,18 +178,14 @@ col1, col2 = st.columns(2)
 
 with col1:
     # Bar chart using Streamlit's built-in charting
-    chart_df = pd.DataFrame({
-        'Day': days,
-        'Energy (kWh)': list(days_elec.values())
-    })
     st.subheader("📊 Daily Energy Consumption")
-    st.bar_chart(chart_df.set_index('Day'), use_container_width=True)
+    st.bar_chart(days_elec.rename_axis('Date'), use_container_width=True)
 
 with col2:
     # Pie chart data using metrics instead
     if total_weekly > 0:
-        base_total = base_energy * 7
-        appliance_total = total_weekly - base_total
+        base_total = base_energy * len(dates)
+        appliance_total = total_energy - base_total
         
         st.subheader("🔌 Energy Breakdown")
         
@@ -191,16 +194,16 @@ with col2:
         
         with break_col1:
             st.metric("Base Consumption", f"{base_total:.1f} kWh", 
-                     f"{(base_total/total_weekly)*100:.1f}%")
+                     f"{(base_total/total_energy)*100:.1f}%")
         
         with break_col2:
             st.metric("Appliances", f"{appliance_total:.1f} kWh", 
-                     f"{(appliance_total/total_weekly)*100:.1f}%")
+                     f"{(appliance_total/total_energy)*100:.1f}%")
         
         # Visual progress bars
-        st.write("**Weekly Distribution:**")
-        base_percentage = base_total / total_weekly
-        appliance_percentage = appliance_total / total_weekly
+        st.write("**Distribution:**")
+        base_percentage = base_total / total_energy
+        appliance_percentage = appliance_total / total_energy
         
         st.write(f"Base: {base_percentage:.1%}")
         st.progress(base_percentage)
@@ -208,32 +211,34 @@ with col2:
         st.progress(appliance_percentage)
 
 # Line chart for weekly trend using Streamlit's built-in line chart
-st.subheader("📈 Weekly Energy Consumption Trend")
-line_df = pd.DataFrame({
-    'Day': days,
-    'Energy (kWh)': list(days_elec.values())
-})
-st.line_chart(line_df.set_index('Day'), use_container_width=True)
+st.subheader("📈 Energy Consumption Trend")
+st.line_chart(days_elec.rename_axis('Date'), use_container_width=True)
+
+# Weekday and week-over-week views once the range spans more than a week
+if len(dates) > 7:
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📅 Average by Weekday")
+        st.bar_chart(weekday_means(days_elec).dropna().rename('Average (kWh)'), sort=False, use_container_width=True)
+    
+    with col2:
+        st.subheader("📆 Week over Week")
+        st.bar_chart(weekly_totals(days_elec)['Consumption'].rename_axis('Week of'), use_container_width=True)
 
 # Data table
 st.header("📋 Detailed Consumption Data")
 df = pd.DataFrame({
-    'Day': days,
-    'Energy (kWh)': list(days_elec.values()),
-    'Cost (₹)': [energy * rate_per_kwh for energy in days_elec.values()]
+    'Date': dates.date,
+    'Day': dates.day_name(),
+    'Energy (kWh)': days_elec.to_numpy(),
+    'Cost (₹)': days_elec.to_numpy() * rate_per_kwh
 })
 
-# Add color coding to the dataframe
-def color_code_energy(val):
-    if val > avg_daily:
-        return 'background-color: #ffcccc'
-    elif val < avg_daily * 0.8:
-        return 'background-color: #ccffcc'
-    else:
-        return 'background-color: #ffffcc'
-
-styled_df = df.style.applymap(color_code_energy, subset=['Energy (kWh)'])
-st.dataframe(styled_df, use_container_width=True)
+# Colour-code energy against the average over all dates, styling only the visible page
+paged_table(df, "consumption_table", style=lambda page: page.style.apply(
+    energy_highlight, average=avg_daily, subset=['Energy (kWh)']
+))
 
 # Energy saving tips
 st.markdown("---")
@@ -0,0 +1,102 @@
+import io
+import time
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from archive import ARCHIVE_DIR, QUERY_TEMPLATES, run
+from resources import archive_connection
+
+# Result rows kept for display; larger results are cut off with a notice
+MAX_ROWS = 200_000
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Page configuration
+st.set_page_config(
+    page_title="Fleet Explorer",
+    page_icon="🔎",
+    layout="wide"
+)
+
+st.markdown("## 🔎 Fleet Explorer")
+st.caption("Parameterised queries over the Parquet meter archive, run in-process by DuckDB.")
+
+# The archive location is set on the server (ENERGY_ARCHIVE), never by the visitor
+archive_path = ARCHIVE_DIR
+if not (archive_path / "households.parquet").exists() or not any((archive_path / "readings").glob("*.parquet")):
+    st.info("No meter archive is available on this server yet.")
+    st.stop()
+
+con = archive_connection(str(archive_path))
+
+@st.cache_data(ttl=600)
+def list_areas(path):
+    return [row[0] for row in archive_connection(path).cursor().execute(
+        "SELECT DISTINCT area FROM households ORDER BY area").fetchall()]
+
+# Query choice and parameters
+# Only the templates run; visitors pick one and set its parameters, which DuckDB binds
+name = st.selectbox("Query", list(QUERY_TEMPLATES))
+params = {}
+template = QUERY_TEMPLATES[name]
+st.caption(template["description"])
+sql = template["sql"]
+columns = st.columns(len(template["params"]))
+for column, (param, default) in zip(columns, template["params"].items()):
+    label = param.replace("_", " ").capitalize()
+    with column:
+        if isinstance(default, pd.Timestamp):
+            params[param] = pd.Timestamp(st.date_input(label, value=default))
+        elif isinstance(default, list):
+            picked = st.multiselect(label, MONTHS, default=[MONTHS[m - 1] for m in default])
+            params[param] = [MONTHS.index(month) + 1 for month in picked]
+        elif isinstance(default, int):
+            params[param] = st.number_input(label, min_value=1, value=default, step=1)
+        elif isinstance(default, float):
+            params[param] = st.number_input(label, min_value=0.0, value=default, step=0.1)
+        elif param == "area":
+            params[param] = st.selectbox(label, ["", *list_areas(str(archive_path))],
+                                         format_func=lambda area: area or "All areas")
+        else:
+            params[param] = st.text_input(label, value=default)
+
+if st.button("▶️ Run query", type="primary"):
+    progress = st.empty()
+    start = time.perf_counter()
+    try:
+        # Batches arrive as DuckDB produces them; nothing goes through pandas
+        reader = run(con.cursor(), sql, params)
+        batches, rows = [], 0
+        for batch in reader:
+            batches.append(batch)
+            rows += batch.num_rows
+            progress.caption(f"{rows:,} rows after {time.perf_counter() - start:.1f}s...")
+            if rows >= MAX_ROWS:
+                break
+        table = pa.Table.from_batches(batches, schema=reader.schema).slice(0, MAX_ROWS)
+        st.session_state.explore_result = (name, table, time.perf_counter() - start, rows >= MAX_ROWS)
+    except duckdb.Error as exc:
+        st.session_state.pop("explore_result", None)
+        st.error(f"Query failed: {exc}")
+    progress.empty()
+
+# The last result stays on screen across reruns from other widgets
+if "explore_result" in st.session_state:
+    result_name, table, elapsed, truncated = st.session_state.explore_result
+    st.markdown(f"#### {result_name}")
+    st.caption(f"{table.num_rows:,} rows in {elapsed:.2f}s" +
+               (f" (showing the first {MAX_ROWS:,})" if truncated else ""))
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+    if result_name == "Month-over-month by area" and table.num_rows:
+        st.line_chart(table.select(["month", "area", "kwh"]).to_pandas(), x="month", y="kwh", color="area")
+
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    st.download_button("📥 Download result (Parquet)", buffer.getvalue(),
+                       file_name=f"{result_name.lower().replace(' ', '_')}.parquet",
+                       mime="application/vnd.apache.parquet")
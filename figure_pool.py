@@ -0,0 +1,218 @@
+import argparse
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from figures import (
+    SCATTER_SIZE_MAX, appliance_frame, appliance_stack, consumption_box, consumption_cost_bars,
+    consumption_histogram, consumption_trend, cost_breakdown_bar, cost_scatter, efficiency_gauge,
+    appliance_heatmap, trend_line, week_over_week_bars, weekday_bars, weekly_frame, weekly_radar
+)
+
+
+class FigurePool:
+    """Prebuilt figures per chart, theme and trace layout, patched instead of rebuilt.
+
+    The first request for a key builds the figure with its builder from
+    figures.py and keeps it as a plain dict. Later requests copy that dict
+    down to the trace and annotation level, let `patch` overwrite the data
+    arrays and positions, and wrap it in go.Figure without validation. The
+    stored dicts are never modified, so one pool serves every session.
+    """
+
+    def __init__(self):
+        self._templates = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.patches = 0
+
+    def __len__(self):
+        return len(self._templates)
+
+    def figure(self, key, build, patch):
+        """Figure for `key`: `build()` the first time, else the template patched by `patch(fig_dict)`."""
+        template = self._templates.get(key)
+        if template is None:
+            fig = build()
+            with self._lock:
+                self._templates.setdefault(key, fig.to_dict())
+                self.builds += 1
+            return fig
+        layout = dict(template["layout"])
+        for items in ("shapes", "annotations"):
+            if items in layout:
+                layout[items] = [dict(item) for item in layout[items]]
+        fig = {"data": [dict(trace) for trace in template["data"]], "layout": layout}
+        patch(fig)
+        self.patches += 1
+        return go.Figure(fig, _validate=False)
+
+
+def _bars(trace, x, y, text=None):
+    trace.update(x=np.asarray(x), y=np.asarray(y, dtype=np.float64))
+    if text is not None:
+        trace["text"] = np.asarray(text)
+
+
+def _hline(layout, index, y):
+    # add_hline stores a shape spanning the x domain plus an annotation at its height
+    layout["shapes"][index].update(y0=y, y1=y)
+
+
+def cost_bars(pool, df_viz, base_consumption, rate, theme):
+    def patch(fig):
+        consumption, cost = fig["data"]
+        _bars(consumption, df_viz["Day"], df_viz["Consumption"], df_viz["Consumption"].round(1))
+        _bars(cost, df_viz["Day"], df_viz["Cost"], df_viz["Cost"].round(2))
+        layout = fig["layout"]
+        _hline(layout, 0, base_consumption)
+        _hline(layout, 1, base_consumption * rate)
+        # Annotations: the two subplot titles, then one per hline
+        layout["annotations"][2]["y"] = base_consumption
+        layout["annotations"][3]["y"] = base_consumption * rate
+    return pool.figure(("cost_bars", theme), lambda: consumption_cost_bars(df_viz, base_consumption, rate, theme),
+                       patch)
+
+
+def gauge(pool, avg_efficiency, theme):
+    def patch(fig):
+        fig["data"][0]["value"] = float(avg_efficiency)
+    return pool.figure(("gauge", theme), lambda: efficiency_gauge(avg_efficiency, theme), patch)
+
+
+def radar(pool, df_viz, theme):
+    def patch(fig):
+        fig["data"][0].update(r=df_viz["Consumption"].tolist(), theta=df_viz["Day"].tolist())
+        fig["layout"]["polar"] = {**fig["layout"]["polar"], "radialaxis": {
+            **fig["layout"]["polar"]["radialaxis"], "range": [0, max(df_viz["Consumption"]) * 1.1]}}
+    return pool.figure(("radar", theme), lambda: weekly_radar(df_viz, theme), patch)
+
+
+def heatmap(pool, heatmap_data, appliances, days, theme):
+    def patch(fig):
+        fig["data"][0].update(z=heatmap_data, text=heatmap_data, x=list(appliances), y=list(days))
+    return pool.figure(("heatmap", theme), lambda: appliance_heatmap(heatmap_data, appliances, days, theme), patch)
+
+
+def trend(pool, df_viz, base_consumption, spike_days, theme):
+    fitted = trend_line(df_viz)
+
+    def patch(fig):
+        _bars(fig["data"][0], df_viz["Day"], df_viz["Consumption"])
+        if fitted is not None:
+            _bars(fig["data"][1], df_viz["Day"], fitted)
+        if spike_days:
+            spikes = df_viz[df_viz["Day"].isin(spike_days)]
+            _bars(fig["data"][-1], spikes["Day"], spikes["Consumption"])
+        _hline(fig["layout"], 0, base_consumption)
+        fig["layout"]["annotations"][0]["y"] = base_consumption
+    # With and without the trend line and the anomaly trace are separate templates
+    return pool.figure(("trend", theme, fitted is not None, bool(spike_days)),
+                       lambda: consumption_trend(df_viz, base_consumption, spike_days, theme), patch)
+
+
+def histogram(pool, df_viz, theme):
+    def patch(fig):
+        fig["data"][0]["x"] = df_viz["Consumption"].to_numpy(dtype=np.float64)
+    return pool.figure(("histogram", theme), lambda: consumption_histogram(df_viz, theme), patch)
+
+
+def box(pool, df_viz, theme):
+    def patch(fig):
+        fig["data"][0]["y"] = df_viz["Consumption"].to_numpy(dtype=np.float64)
+    return pool.figure(("box", theme), lambda: consumption_box(df_viz, theme), patch)
+
+
+def cost_breakdown(pool, df_viz, theme):
+    def patch(fig):
+        for trace, column in zip(fig["data"], ["Base_Cost", "Extra_Cost"]):
+            _bars(trace, df_viz["Day"], df_viz[column])
+    return pool.figure(("cost_breakdown", theme), lambda: cost_breakdown_bar(df_viz, theme), patch)
+
+
+def stack(pool, rows, theme):
+    # One trace per appliance, in order of first appearance, each over the days it was used
+    appliances = tuple(pd.unique(rows["Appliance"]))
+
+    def patch(fig):
+        for trace, appliance in zip(fig["data"], appliances):
+            used = rows[rows["Appliance"] == appliance]
+            _bars(trace, used["Day"], used["Consumption"])
+    return pool.figure(("stack", theme, appliances), lambda: appliance_stack(rows, theme), patch)
+
+
+def scatter(pool, df_viz, theme):
+    # One single-point trace per day; colours follow the day's position
+    size = df_viz["Extra_Cost"].clip(lower=0).to_numpy(dtype=np.float64)
+
+    def patch(fig):
+        sizeref = size.max() / SCATTER_SIZE_MAX ** 2
+        for i, trace in enumerate(fig["data"]):
+            day = df_viz["Day"].iloc[i]
+            trace.update(customdata=np.array([[day]], dtype=object), legendgroup=day, name=day,
+                         x=df_viz["Consumption"].to_numpy(dtype=np.float64)[i:i + 1],
+                         y=df_viz["Cost"].to_numpy(dtype=np.float64)[i:i + 1])
+            trace["marker"] = {**trace["marker"], "size": size[i:i + 1], "sizeref": sizeref}
+    return pool.figure(("scatter", theme, len(df_viz)), lambda: cost_scatter(df_viz, theme), patch)
+
+
+def weekdays(pool, means, theme):
+    def patch(fig):
+        _bars(fig["data"][0], means.index, means.to_numpy())
+    return pool.figure(("weekdays", theme), lambda: weekday_bars(means, theme), patch)
+
+
+def weeks(pool, weekly, theme):
+    def patch(fig):
+        _bars(fig["data"][0], weekly.index.strftime("Week of %d %b"), weekly["Consumption"],
+              [f"{change:+.0%}" if pd.notna(change) else "" for change in weekly["Change"]])
+    return pool.figure(("weeks", theme), lambda: week_over_week_bars(weekly, theme), patch)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time pooled figures against building them from scratch")
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2026-01-05", periods=args.days, freq="D")
+    consumption = pd.Series(rng.uniform(10, 30, args.days), index=dates)
+    df_viz = weekly_frame(consumption, 5.0, 24.0)
+    means = consumption.groupby(dates.dayofweek).mean()
+    weekly = consumption.resample("W-MON").sum().to_frame("Consumption").assign(Change=0.1)
+    usage = rng.integers(0, 2, (args.days, 3)).tolist()
+    spikes = list(df_viz["Day"].iloc[[3, 9]])
+    charts = {
+        "cost_bars": (cost_bars, consumption_cost_bars, (df_viz, 24.0, 5.0)),
+        "gauge": (gauge, efficiency_gauge, (1.2,)),
+        "radar": (radar, weekly_radar, (df_viz,)),
+        "heatmap": (heatmap, appliance_heatmap, (usage, ["AC", "Fridge", "Washing Machine"], list(df_viz["Day"]))),
+        "trend": (trend, consumption_trend, (df_viz, 24.0, spikes)),
+        "histogram": (histogram, consumption_histogram, (df_viz,)),
+        "box": (box, consumption_box, (df_viz,)),
+        "cost_breakdown": (cost_breakdown, cost_breakdown_bar, (df_viz,)),
+        "weekdays": (weekdays, weekday_bars, (means,)),
+        "weeks": (weeks, week_over_week_bars, (weekly,)),
+        "stack": (stack, appliance_stack, (appliance_frame(pd.DataFrame(
+            np.array(usage, dtype=bool), index=dates, columns=["AC", "Fridge", "Washing Machine"]),
+            {"AC": 3.0, "Fridge": 1.2, "Washing Machine": 1.5}),)),
+        "scatter": (scatter, cost_scatter, (df_viz,)),
+    }
+
+    pool = FigurePool()
+    print(f"{'chart':<16}{'build ms':>10}{'pooled ms':>11}{'speed-up':>10}")
+    for name, (pooled, builder, chart_args) in charts.items():
+        pooled(pool, *chart_args, "plotly")
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            builder(*chart_args, "plotly")
+        built = (time.perf_counter() - start) / args.repeat * 1000
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            pooled(pool, *chart_args, "plotly")
+        patched = (time.perf_counter() - start) / args.repeat * 1000
+        print(f"{name:<16}{built:>10.2f}{patched:>11.2f}{built / patched:>9.0f}×")
@@ -0,0 +1,465 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# Figure builders shared by the dashboard and the batch reporter; none of
+# them touch Streamlit so they can run in worker processes.
+
+APPLIANCE_COLORS = {
+    'AC': '#ff6b6b',
+    'Fridge': '#4ecdc4',
+    'Washing Machine': '#45b7d1',
+    'Other': '#96ceb4'
+}
+
+# Largest marker diameter in the cost scatter (plotly express' default)
+SCATTER_SIZE_MAX = 20
+
+
+def day_labels(index):
+    """Chart category labels: "Mon 19 Oct" for dates, unchanged for day names."""
+    if isinstance(index, pd.DatetimeIndex):
+        return list(index.strftime('%a %d %b'))
+    return list(index)
+
+
+def weekly_frame(consumption, rate, base_consumption, co2=None, appliance_co2=None):
+    """Per-day consumption and cost table the charts are built from, with kg CO₂ if given.
+
+    `consumption` is daily kWh as a date-indexed Series (or a dict keyed by day name).
+    `appliance_co2` (days × appliances kg, in the same day order) adds one
+    `<Appliance>_CO2_kg` column per appliance.
+    """
+    consumption = pd.Series(consumption, dtype=float)
+    df_viz = pd.DataFrame({'Day': day_labels(consumption.index), 'Consumption': consumption.to_numpy()})
+    if isinstance(consumption.index, pd.DatetimeIndex):
+        df_viz.insert(0, 'Date', consumption.index)
+    df_viz['Cost'] = df_viz['Consumption'] * rate
+    df_viz['Efficiency'] = df_viz['Consumption'] / base_consumption
+    df_viz['Day_Num'] = range(len(df_viz))
+    df_viz['Base_Cost'] = base_consumption * rate
+    df_viz['Extra_Cost'] = df_viz['Cost'] - df_viz['Base_Cost']
+    if co2 is not None:
+        df_viz['CO2_kg'] = co2
+    if appliance_co2 is not None:
+        for appliance in appliance_co2.columns:
+            df_viz[co2_column(appliance)] = appliance_co2[appliance].to_numpy()
+    return df_viz
+
+
+def co2_column(appliance):
+    """Column holding an appliance's kg CO₂, named like the export's `<Appliance>_Used`."""
+    return f"{appliance.replace(' ', '_')}_CO2_kg"
+
+
+def appliance_frame(usage, appliance_kwh):
+    """Long-form kWh per day and appliance for the days each appliance was used.
+
+    `usage` is a days × appliances bool frame indexed by date or day name.
+    """
+    rows, cols = np.nonzero(usage.to_numpy(dtype=bool))
+    kwh = np.array([appliance_kwh[appliance] for appliance in usage.columns], dtype=float)
+    return pd.DataFrame({
+        'Day': np.asarray(day_labels(usage.index), dtype=object)[rows],
+        'Appliance': usage.columns[cols],
+        'Consumption': kwh[cols]
+    })
+
+
+def weekday_means(consumption):
+    """Mean daily kWh by weekday (Monday first) over a date-indexed Series."""
+    means = consumption.groupby(consumption.index.dayofweek).mean().reindex(range(7))
+    return means.set_axis(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'])
+
+
+def weekly_totals(consumption):
+    """kWh per Monday-starting week with the change from the week before."""
+    weekly = consumption.resample('W-MON', label='left', closed='left').agg(['sum', 'count'])
+    weekly.index.name = 'Week'
+    weekly = weekly.rename(columns={'sum': 'Consumption', 'count': 'Days'})
+    weekly['Change'] = weekly['Consumption'].pct_change()
+    return weekly
+
+
+def consumption_cost_bars(df_viz, base_consumption, rate, theme):
+    fig_bar = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=('Daily Consumption (kWh)', 'Daily Cost (₹)'),
+        specs=[[{"secondary_y": False}, {"secondary_y": False}]]
+    )
+
+    # Consumption bar chart
+    fig_bar.add_trace(
+        go.Bar(
+            x=df_viz['Day'],
+            y=df_viz['Consumption'],
+            name='Consumption',
+            marker_color='#667eea',
+            text=df_viz['Consumption'].round(1),
+            textposition='auto',
+        ),
+        row=1, col=1
+    )
+
+    # Cost bar chart
+    fig_bar.add_trace(
+        go.Bar(
+            x=df_viz['Day'],
+            y=df_viz['Cost'],
+            name='Cost',
+            marker_color='#28a745',
+            text=df_viz['Cost'].round(2),
+            textposition='auto',
+        ),
+        row=1, col=2
+    )
+
+    fig_bar.add_hline(y=base_consumption, line_dash="dash", line_color="red",
+                      annotation_text="Base Consumption", row=1, col=1)
+    fig_bar.add_hline(y=base_consumption * rate, line_dash="dash", line_color="red",
+                      annotation_text="Base Cost", row=1, col=2)
+
+    fig_bar.update_layout(
+        height=400,
+        showlegend=False,
+        template=theme,
+        title_text="Daily Consumption & Cost Analysis"
+    )
+    return fig_bar
+
+
+def efficiency_gauge(avg_efficiency, theme):
+    fig_gauge = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=avg_efficiency,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Efficiency Ratio (vs Base Consumption)"},
+        delta={'reference': 1},
+        gauge={
+            'axis': {'range': [None, 3]},
+            'bar': {'color': "#667eea"},
+            'steps': [
+                {'range': [0, 1], 'color': "#28a745"},
+                {'range': [1, 1.5], 'color': "#ffc107"},
+                {'range': [1.5, 3], 'color': "#dc3545"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 2
+            }
+        }
+    ))
+    fig_gauge.update_layout(height=300, template=theme)
+    return fig_gauge
+
+
+def weekly_radar(df_viz, theme):
+    fig_radar = go.Figure()
+    fig_radar.add_trace(go.Scatterpolar(
+        r=df_viz['Consumption'].tolist(),
+        theta=df_viz['Day'].tolist(),
+        fill='toself',
+        name='Weekly Pattern',
+        line_color='#667eea'
+    ))
+    fig_radar.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, max(df_viz['Consumption']) * 1.1]
+            )),
+        showlegend=False,
+        title="Weekly Consumption Pattern",
+        template=theme,
+        height=400
+    )
+    return fig_radar
+
+
+def appliance_stack(df_appliances, theme):
+    fig_stack = px.bar(
+        df_appliances,
+        x='Day',
+        y='Consumption',
+        color='Appliance',
+        title='Appliance Usage Breakdown',
+        color_discrete_map=APPLIANCE_COLORS
+    )
+    fig_stack.update_layout(height=400, template=theme)
+    return fig_stack
+
+
+def appliance_heatmap(heatmap_data, appliances, days, theme):
+    fig_heatmap = go.Figure(data=go.Heatmap(
+        z=heatmap_data,
+        x=appliances,
+        y=days,
+        colorscale='RdYlBu_r',
+        text=heatmap_data,
+        texttemplate="%{text}",
+        textfont={"size": 16},
+        hoverongaps=False
+    ))
+    fig_heatmap.update_layout(
+        title="Appliance Usage Heatmap",
+        template=theme,
+        height=400
+    )
+    return fig_heatmap
+
+
+def trend_line(df_viz):
+    """Least-squares line through daily consumption, or None when fewer than two days leave nothing to fit."""
+    if len(df_viz) < 2:
+        return None
+    return np.poly1d(np.polyfit(df_viz['Day_Num'], df_viz['Consumption'], 1))(df_viz['Day_Num'])
+
+
+def consumption_trend(df_viz, base_consumption, spike_days, theme):
+    fig_trend = go.Figure()
+    fig_trend.add_trace(go.Scatter(
+        x=df_viz['Day'],
+        y=df_viz['Consumption'],
+        mode='lines+markers',
+        name='Actual Consumption',
+        line=dict(color='#667eea', width=3),
+        marker=dict(size=8)
+    ))
+
+    # Add trend line
+    fitted = trend_line(df_viz)
+    if fitted is not None:
+        fig_trend.add_trace(go.Scatter(
+            x=df_viz['Day'],
+            y=fitted,
+            mode='lines',
+            name='Trend Line',
+            line=dict(color='red', width=2, dash='dash')
+        ))
+
+    # Mark anomalous days detected by the rolling median/MAD check
+    if spike_days:
+        df_spikes = df_viz[df_viz['Day'].isin(spike_days)]
+        fig_trend.add_trace(go.Scatter(
+            x=df_spikes['Day'],
+            y=df_spikes['Consumption'],
+            mode='markers',
+            name='Anomaly',
+            marker=dict(color='#dc3545', size=14, symbol='x')
+        ))
+
+    fig_trend.add_hline(y=base_consumption, line_dash="dot", line_color="green",
+                        annotation_text="Base Consumption")
+
+    fig_trend.update_layout(
+        title="Consumption Trend Analysis",
+        xaxis_title="Day",
+        yaxis_title="Consumption (kWh)",
+        template=theme,
+        height=400
+    )
+    return fig_trend
+
+
+def live_power_trend(timestamps, watts, theme):
+    fig_live = go.Figure(go.Scatter(
+        x=pd.to_datetime(timestamps, unit='s'),
+        y=watts,
+        mode='lines',
+        name='Power',
+        line=dict(color='#667eea', width=2),
+        fill='tozeroy'
+    ))
+    fig_live.update_layout(
+        title="Live Power (last 15 min)",
+        xaxis_title="Time (UTC)",
+        yaxis_title="Power (W)",
+        template=theme,
+        height=300,
+        uirevision='live'
+    )
+    return fig_live
+
+
+def meter_history(frame, level, theme):
+    """Mean power per bin with a min–max band, from a Pyramid query."""
+    fig_history = go.Figure()
+    fig_history.add_trace(go.Scatter(
+        x=frame['time'], y=frame['max'], mode='lines', line=dict(width=0),
+        name='Max', showlegend=False, hoverinfo='skip'
+    ))
+    fig_history.add_trace(go.Scatter(
+        x=frame['time'], y=frame['min'], mode='lines', line=dict(width=0),
+        fill='tonexty', fillcolor='rgba(102, 126, 234, 0.2)', name='Min–Max'
+    ))
+    fig_history.add_trace(go.Scatter(
+        x=frame['time'], y=frame['mean'], mode='lines', name='Mean',
+        line=dict(color='#667eea', width=2)
+    ))
+    fig_history.update_layout(
+        title=f"Meter Power ({level} bins)",
+        xaxis_title="Time (UTC)",
+        yaxis_title="Power (W)",
+        template=theme,
+        height=400,
+        hovermode='x unified'
+    )
+    return fig_history
+
+def weekday_bars(means, theme):
+    fig_weekday = px.bar(
+        x=means.index,
+        y=means.to_numpy(),
+        labels={'x': 'Weekday', 'y': 'Average (kWh)'},
+        title='Average Consumption by Weekday',
+        color_discrete_sequence=['#667eea']
+    )
+    fig_weekday.update_layout(template=theme, height=300)
+    return fig_weekday
+
+
+def week_over_week_bars(weekly, theme):
+    fig_weeks = go.Figure(go.Bar(
+        x=weekly.index.strftime('Week of %d %b'),
+        y=weekly['Consumption'],
+        text=[f"{change:+.0%}" if pd.notna(change) else "" for change in weekly['Change']],
+        textposition='outside',
+        marker_color='#764ba2'
+    ))
+    fig_weeks.update_layout(
+        title="Week over Week",
+        yaxis_title="Consumption (kWh)",
+        template=theme,
+        height=300
+    )
+    return fig_weeks
+
+
+def consumption_histogram(df_viz, theme):
+    fig_hist = px.histogram(
+        df_viz,
+        x='Consumption',
+        nbins=10,
+        title='Consumption Distribution',
+        color_discrete_sequence=['#667eea']
+    )
+    fig_hist.update_layout(template=theme, height=300)
+    return fig_hist
+
+
+def consumption_box(df_viz, theme):
+    fig_box = px.box(
+        df_viz,
+        y='Consumption',
+        title='Consumption Statistics',
+        color_discrete_sequence=['#667eea']
+    )
+    fig_box.update_layout(template=theme, height=300)
+    return fig_box
+
+
+def cost_frontier(frontier, current_cost, current_comfort, budget, theme):
+    fig_frontier = go.Figure()
+    fig_frontier.add_trace(go.Scatter(
+        x=frontier['Cost'],
+        y=frontier['Comfort'],
+        mode='lines+markers',
+        line_shape='hv',
+        name='Best Possible',
+        line=dict(color='#667eea', width=3)
+    ))
+    fig_frontier.add_trace(go.Scatter(
+        x=[current_cost],
+        y=[current_comfort],
+        mode='markers',
+        name='Current Week',
+        marker=dict(color='#dc3545', size=14, symbol='star')
+    ))
+    fig_frontier.add_vline(x=budget, line_dash="dash", line_color="green", annotation_text="Budget")
+    fig_frontier.update_layout(
+        title="Cost vs Comfort Trade-off",
+        xaxis_title="Weekly Cost (₹)",
+        yaxis_title="Appliance-Days Kept",
+        template=theme,
+        height=400
+    )
+    return fig_frontier
+
+
+def cost_breakdown_bar(df_viz, theme):
+    fig_cost_bar = px.bar(
+        df_viz,
+        x='Day',
+        y=['Base_Cost', 'Extra_Cost'],
+        title='Daily Cost Breakdown',
+        color_discrete_map={'Base_Cost': '#28a745', 'Extra_Cost': '#dc3545'}
+    )
+    fig_cost_bar.update_layout(template=theme, height=400)
+    return fig_cost_bar
+
+
+def cost_scatter(df_viz, theme):
+    fig_scatter = px.scatter(
+        df_viz,
+        x='Consumption',
+        y='Cost',
+        size=df_viz['Extra_Cost'].clip(lower=0),
+        size_max=SCATTER_SIZE_MAX,
+        color='Day',
+        title='Cost vs Consumption Analysis',
+        hover_data=['Day', 'Consumption', 'Cost']
+    )
+    fig_scatter.update_layout(template=theme, height=400)
+    return fig_scatter
+
+
+def solar_day_profile(profile, theme):
+    """Average kWh per interval over the day: load and generation, with the grid import and export between them."""
+    fig_solar = go.Figure()
+    for column, color, fill in [('Load', '#667eea', None), ('Generation', '#ffc107', 'tozeroy'),
+                                ('Imported', '#dc3545', None), ('Exported', '#28a745', None)]:
+        fig_solar.add_trace(go.Scatter(
+            x=profile.index, y=profile[column], mode='lines', name=column, fill=fill,
+            line=dict(color=color, width=3 if fill is None and column == 'Load' else 2,
+                      dash='dot' if column in ('Imported', 'Exported') else None)
+        ))
+    fig_solar.update_layout(
+        title="Average Day: Load vs Rooftop Solar",
+        xaxis_title="Time of Day",
+        yaxis_title="kWh per 15 min",
+        template=theme,
+        height=400
+    )
+    return fig_solar
+
+
+def cost_table(df_viz, base_consumption, decimals=2):
+    """Per-day cost breakdown shown under the cost charts, rounded unless `decimals` is None."""
+    columns = ['Day', 'Consumption', 'Cost', 'Base_Cost', 'Extra_Cost', 'Efficiency']
+    if 'CO2_kg' in df_viz:
+        columns[3:3] = ['CO2_kg'] + [column for column in df_viz if column.endswith('_CO2_kg')]
+    if 'Date' in df_viz:
+        columns.insert(0, 'Date')
+    df_display = df_viz[columns].assign(Efficiency=df_viz['Consumption'] / base_consumption)
+    if decimals is not None:
+        numeric = df_display.select_dtypes('number').columns
+        df_display[numeric] = df_display[numeric].round(decimals)
+    return df_display
+
+
+def rate_comparison(total_consumption, rates=(3, 4, 5, 6, 7, 8)):
+    """Weekly, monthly and annual cost of the same week at other tariffs."""
+    comparison_data = []
+    for rate in rates:
+        weekly_cost = total_consumption * rate
+        monthly_cost = weekly_cost * 4.33
+        comparison_data.append({
+            'Rate (₹/kWh)': rate,
+            'Weekly Cost': f"₹{weekly_cost:.2f}",
+            'Monthly Cost': f"₹{monthly_cost:.2f}",
+            'Annual Cost': f"₹{weekly_cost * 52:.2f}"
+        })
+    return pd.DataFrame(comparison_data)
@@ -0,0 +1,310 @@
+import argparse
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+# Readings kept in memory: an hour at 1 kHz
+DEFAULT_CAPACITY = 3_600_000
+
+# Seconds between reconnect attempts to a stream gateway
+RECONNECT_SECONDS = 2.0
+
+# Gateways the dashboard may listen to, comma-separated; set by whoever runs the
+# server, since a listener connects out to the host or binds the port it names
+FEED_URLS = [url.strip() for url in os.environ.get("ENERGY_LIVE_FEEDS", "").split(",") if url.strip()]
+
+
+class RingBuffer:
+    """Fixed-size buffer of (timestamp, power W) readings, oldest overwritten first.
+
+    One ingestion thread writes while any number of sessions read; both take
+    a short lock around index bookkeeping and array copies.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity)
+        self.power = np.zeros(capacity, dtype=np.float32)
+        self.total = 0  # readings written since start
+        self._lock = threading.Lock()
+
+    def extend(self, timestamps, power):
+        timestamps = np.asarray(timestamps, dtype=np.float64)[-self.capacity:]
+        power = np.asarray(power, dtype=np.float32)[-self.capacity:]
+        n = len(timestamps)
+        with self._lock:
+            start = self.total % self.capacity
+            first = min(n, self.capacity - start)
+            self.timestamps[start:start + first] = timestamps[:first]
+            self.power[start:start + first] = power[:first]
+            # Wrap around to the front
+            self.timestamps[:n - first] = timestamps[first:]
+            self.power[:n - first] = power[first:]
+            self.total += n
+
+    def _ordered(self, start):
+        # Copy readings from logical position `start` (0 = oldest held) onwards
+        held = min(self.total, self.capacity)
+        begin = (self.total - held + start) % self.capacity
+        end = self.total % self.capacity
+        if start >= held:
+            return self.timestamps[:0].copy(), self.power[:0].copy()
+        if begin < end:
+            return self.timestamps[begin:end].copy(), self.power[begin:end].copy()
+        return (np.concatenate([self.timestamps[begin:], self.timestamps[:end]]),
+                np.concatenate([self.power[begin:], self.power[:end]]))
+
+    def latest(self, n=None):
+        """The last `n` readings (all held readings by default) in arrival order."""
+        with self._lock:
+            held = min(self.total, self.capacity)
+            return self._ordered(0 if n is None else held - min(n, held))
+
+    def since(self, seconds):
+        """Readings from the last `seconds` of feed time."""
+        with self._lock:
+            held = min(self.total, self.capacity)
+            if not held:
+                return self._ordered(0)
+            end = self.total % self.capacity
+            begin = (self.total - held) % self.capacity
+            cutoff = self.timestamps[end - 1] - seconds
+            # Timestamps rise through the buffer except at the wrap point
+            if begin < end:
+                start = np.searchsorted(self.timestamps[begin:end], cutoff)
+            else:
+                older = self.timestamps[begin:]
+                start = np.searchsorted(older, cutoff)
+                if start == len(older):
+                    start += np.searchsorted(self.timestamps[:end], cutoff)
+            return self._ordered(int(start))
+
+
+def parse_readings(data):
+    """Parse b"timestamp,power_w" lines into two arrays; returns (ts, power, leftover).
+
+    `leftover` is a trailing partial line, to be prefixed to the next chunk.
+    Lines without exactly two numeric fields are skipped.
+    """
+    data, _, leftover = data.rpartition(b"\n")
+    if not data:
+        return np.empty(0), np.empty(0, dtype=np.float32), leftover
+    # The one-shot split below only lines up if every line has exactly one
+    # comma, i.e. the separators run comma, newline, comma, ..., comma
+    raw = np.frombuffer(data, dtype=np.uint8)
+    separators = raw[(raw == ord(",")) | (raw == ord("\n"))]
+    aligned = (len(separators) % 2 == 1 and (separators[0::2] == ord(",")).all()
+               and (separators[1::2] == ord("\n")).all())
+    try:
+        if not aligned:
+            raise ValueError("lines without exactly two fields")
+        values = np.array(data.replace(b"\n", b",").split(b","), dtype=np.float64).reshape(-1, 2)
+    except ValueError:
+        # Skip malformed lines rather than dropping the whole chunk
+        values = []
+        for line in data.split(b"\n"):
+            row = line.split(b",")
+            if len(row) != 2:
+                continue
+            try:
+                values.append((float(row[0]), float(row[1])))
+            except ValueError:
+                continue
+        values = np.array(values, dtype=np.float64).reshape(-1, 2)
+    return values[:, 0], values[:, 1].astype(np.float32), leftover
+
+
+class _FeedProtocol(asyncio.Protocol, asyncio.DatagramProtocol):
+    def __init__(self, buffer, closed=None):
+        self.buffer = buffer
+        self.closed = closed
+        self.pending = b""
+
+    def data_received(self, data):
+        timestamps, power, self.pending = parse_readings(self.pending + data)
+        if len(timestamps):
+            self.buffer.extend(timestamps, power)
+
+    def datagram_received(self, data, addr):
+        # Each datagram carries whole lines
+        timestamps, power, _ = parse_readings(data if data.endswith(b"\n") else data + b"\n")
+        if len(timestamps):
+            self.buffer.extend(timestamps, power)
+
+    def connection_lost(self, exc):
+        if self.closed is not None and not self.closed.done():
+            self.closed.set_result(exc)
+
+
+class LiveFeed:
+    """Ingests a meter gateway feed into a RingBuffer on a background event loop.
+
+    `url` is udp://host:port (readings are sent to us), tcp://host:port or
+    unix:///path (we connect to the gateway and reconnect if it drops).
+    Every message is one or more "timestamp,power_w" lines.
+    """
+
+    def __init__(self, url, capacity=DEFAULT_CAPACITY):
+        self.url = urlparse(url)
+        if self.url.scheme not in ("udp", "tcp", "unix"):
+            raise ValueError(f"unsupported feed URL {url!r}; use udp://, tcp:// or unix://")
+        self.buffer = RingBuffer(capacity)
+        self.connected = False
+        self.error = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="live-feed", daemon=True)
+        self._transport = None
+
+    def start(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._ingest(), self._loop)
+        return self
+
+    def stop(self):
+        """Close the connection or socket and end the ingestion thread."""
+        if not self._thread.is_alive():
+            return
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self.connected = False
+
+    async def _close(self):
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._transport is not None:
+            self._transport.close()
+
+    async def _ingest(self):
+        loop = asyncio.get_running_loop()
+        if self.url.scheme == "udp":
+            try:
+                self._transport, _ = await loop.create_datagram_endpoint(
+                    lambda: _FeedProtocol(self.buffer), local_addr=(self.url.hostname, self.url.port))
+                self.connected = True
+            except OSError as exc:
+                self.error = exc
+            return
+        while True:
+            closed = loop.create_future()
+            try:
+                if self.url.scheme == "tcp":
+                    self._transport, _ = await loop.create_connection(lambda: _FeedProtocol(self.buffer, closed),
+                                                                      self.url.hostname, self.url.port)
+                else:
+                    self._transport, _ = await loop.create_unix_connection(
+                        lambda: _FeedProtocol(self.buffer, closed), self.url.path)
+                self.connected, self.error = True, None
+                self.error = await closed
+            except OSError as exc:
+                self.error = exc
+            self.connected = False
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+
+def resample(timestamps, power, bins):
+    """Mean power in `bins` equal time bins; returns (bin start times, means)."""
+    if len(timestamps) < 2:
+        return timestamps, power
+    edges = np.linspace(timestamps[0], timestamps[-1], bins + 1)
+    index = np.clip(np.searchsorted(edges, timestamps, side="right") - 1, 0, bins - 1)
+    counts = np.bincount(index, minlength=bins)
+    sums = np.bincount(index, weights=power, minlength=bins)
+    filled = counts > 0
+    return edges[:-1][filled], sums[filled] / counts[filled]
+
+
+def energy_kwh(timestamps, power):
+    """kWh over the readings, holding each reading until the next one."""
+    if len(timestamps) < 2:
+        return 0.0
+    return float(np.dot(power[:-1], np.diff(timestamps))) / 3.6e6
+
+
+def _synthetic_power(timestamps, rng):
+    # Standby plus a cycling fridge compressor, an AC block and meter noise
+    fridge = 150 * (timestamps % 1800 < 600)
+    ac = 1500 * (timestamps % 7200 < 2400)
+    return 300 + fridge + ac + rng.normal(0, 15, len(timestamps))
+
+
+async def simulate(url, rate, batch_seconds=0.01):
+    """Act as a meter gateway emitting `rate` readings per second to `url`."""
+    url = urlparse(url)
+    rng = np.random.default_rng()
+    loop = asyncio.get_running_loop()
+    writers = set()
+
+    def batches():
+        last = time.time()
+        while True:
+            now = time.time()
+            n = int((now - last) * rate)
+            if n:
+                timestamps = last + np.arange(1, n + 1) / rate
+                last = timestamps[-1]
+                lines = "".join(f"{t:.4f},{p:.1f}\n" for t, p in zip(timestamps, _synthetic_power(timestamps, rng)))
+                yield lines.encode()
+            else:
+                yield b""
+
+    if url.scheme == "udp":
+        transport, _ = await loop.create_datagram_endpoint(asyncio.DatagramProtocol,
+                                                           remote_addr=(url.hostname, url.port))
+        for data in batches():
+            # Keep datagrams under a typical MTU-safe payload, split on line ends
+            while data:
+                cut = data.rfind(b"\n", 0, 1400) + 1 or len(data)
+                transport.sendto(data[:cut])
+                data = data[cut:]
+            await asyncio.sleep(batch_seconds)
+
+    async def serve(reader, writer):
+        writers.add(writer)
+        try:
+            await reader.read()
+        except ConnectionError:
+            pass
+        finally:
+            writers.discard(writer)
+
+    if url.scheme == "tcp":
+        server = await asyncio.start_server(serve, url.hostname, url.port)
+    else:
+        server = await asyncio.start_unix_server(serve, url.path)
+    async with server:
+        for data in batches():
+            for writer in list(writers):
+                writer.write(data)
+            await asyncio.sleep(batch_seconds)
+
+
+def _listen(url, seconds):
+    feed = LiveFeed(url).start()
+    start = feed.buffer.total
+    time.sleep(seconds)
+    received = feed.buffer.total - start
+    timestamps, power = feed.buffer.since(seconds)
+    print(f"{received / seconds:,.0f} readings/s, mean {power.mean() if len(power) else 0:.0f} W, "
+          f"{energy_kwh(timestamps, power):.4f} kWh over {seconds:g}s, error: {feed.error}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulated meter gateway and feed listener")
+    parser.add_argument("mode", choices=["simulate", "listen"])
+    parser.add_argument("url", help="udp://host:port, tcp://host:port or unix:///path")
+    parser.add_argument("--rate", type=float, default=1000, help="readings per second to simulate")
+    parser.add_argument("--seconds", type=float, default=10, help="how long to listen")
+    args = parser.parse_args()
+
+    if args.mode == "simulate":
+        asyncio.run(simulate(args.url, args.rate))
+    else:
+        _listen(args.url, args.seconds)
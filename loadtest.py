@@ -0,0 +1,208 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+SCRIPTS = ["energy.py", "energy_calc.py", "sigma.py"]
+
+# Relative frequency of each kind of interaction a simulated user performs
+ACTION_WEIGHTS = {
+    "checkbox": 6,
+    "number_input": 2,
+    "selectbox": 1,
+    "slider": 1,
+    "text_input": 1,
+    "button": 1
+}
+
+# Metrics compared against a baseline run; higher is worse for all of them
+COMPARED = ["rerun_p50_ms", "rerun_p95_ms", "rerun_p99_ms", "first_run_p50_ms", "peak_rss_mb"]
+
+
+def _interact(at, rng):
+    """Apply one random widget interaction to `at`; returns its kind, or None."""
+    kinds = [kind for kind in ACTION_WEIGHTS if len(getattr(at, kind))]
+    if not kinds:
+        return None
+    kind = rng.choices(kinds, weights=[ACTION_WEIGHTS[kind] for kind in kinds])[0]
+    widget = rng.choice(list(getattr(at, kind)))
+
+    if kind == "checkbox":
+        widget.set_value(not widget.value)
+    elif kind in ("number_input", "slider"):
+        step = widget.step or 1
+        # Unbounded inputs wander up to ten steps either side of their value
+        low = widget.min if widget.min is not None else widget.value - 10 * step
+        high = widget.max if widget.max is not None else widget.value + 10 * step
+        value = low + rng.randint(0, int(round((high - low) / step))) * step
+        widget.set_value(type(widget.value)(value))
+    elif kind == "selectbox":
+        widget.select(rng.choice(widget.options))
+    elif kind == "text_input":
+        widget.input(f"user{rng.randint(0, 999)}")
+    else:
+        widget.click()
+    return kind
+
+
+def _timed_run(at, attempts=3):
+    """Run `at` and return (seconds, retries).
+
+    AppTest sets up a throwaway runtime per run that isn't thread-safe; a
+    run that races another session's setup renders nothing and is retried.
+    """
+    for retry in range(attempts):
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        if len(at.main.children) or at.exception:
+            break
+    return elapsed, retry
+
+
+def simulate_user(script, steps, seed, timeout):
+    """Run one headless session: a first load then `steps` interactions.
+
+    Returns (first-run seconds, rerun seconds, runs that raised, harness retries).
+    """
+    rng = random.Random(seed)
+    at = AppTest.from_file(str(script), default_timeout=timeout)
+    first, retries = _timed_run(at)
+    errors = int(bool(at.exception))
+
+    reruns = []
+    for _ in range(steps):
+        if _interact(at, rng) is None:
+            break
+        elapsed, retried = _timed_run(at)
+        reruns.append(elapsed)
+        errors += int(bool(at.exception))
+        retries += retried
+    return first, reruns, errors, retries
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+
+
+def _percentiles(seconds, prefix):
+    ms = np.asarray(seconds) * 1000
+    if not len(ms):
+        return {}
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {f"{prefix}_p50_ms": p50, f"{prefix}_p95_ms": p95, f"{prefix}_p99_ms": p99, f"{prefix}_max_ms": ms.max()}
+
+
+def load_test(script, users=8, steps=20, seed=0, timeout=60):
+    """Drive `users` concurrent sessions of `script` and summarise latency and memory.
+
+    Sessions run on threads in this process, as Streamlit serves them, so
+    they share caches and contend for the GIL the way real users do.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        results = list(pool.map(lambda user: simulate_user(script, steps, seed * 10_000 + user, timeout),
+                                range(users)))
+    elapsed = time.perf_counter() - start
+
+    firsts = [first for first, _, _, _ in results]
+    reruns = [rerun for _, user_reruns, _, _ in results for rerun in user_reruns]
+    summary = {
+        "users": users,
+        "steps": steps,
+        "runs": len(firsts) + len(reruns),
+        "errors": sum(errors for _, _, errors, _ in results),
+        "harness_retries": sum(retries for _, _, _, retries in results),
+        "runs_per_s": (len(firsts) + len(reruns)) / elapsed,
+        **_percentiles(firsts, "first_run"),
+        **_percentiles(reruns, "rerun"),
+        "peak_rss_mb": peak_rss_mb()
+    }
+    return {key: round(value, 2) if isinstance(value, float) else value for key, value in summary.items()}
+
+
+def _quiet_worker():
+    # Script errors are counted in the results; keep their tracebacks off the console
+    logging.disable(logging.CRITICAL)
+    # Script threads lost to AppTest's setup race are retried (see _timed_run)
+    threading.excepthook = lambda args: None
+
+
+def _revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, tolerance):
+    """Print metric changes per script; returns the regressions beyond `tolerance`."""
+    regressions = []
+    for script, metrics in current["scripts"].items():
+        before = baseline["scripts"].get(script)
+        if before is None:
+            continue
+        print(f"\n{script}  ({baseline.get('revision')} → {current.get('revision')})")
+        for metric in COMPARED:
+            if metric not in metrics or metric not in before:
+                continue
+            change = metrics[metric] / before[metric] - 1 if before[metric] else 0.0
+            flag = "  REGRESSION" if change > tolerance else ""
+            print(f"  {metric:<18} {before[metric]:>10.2f} → {metrics[metric]:>10.2f}  {change:+7.1%}{flag}")
+            if flag:
+                regressions.append((script, metric, change))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the Streamlit apps")
+    parser.add_argument("scripts", nargs="*", default=SCRIPTS)
+    parser.add_argument("-u", "--users", type=int, default=8, help="concurrent sessions per script")
+    parser.add_argument("-n", "--steps", type=int, default=20, help="interactions per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per rerun")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--compare", help="baseline JSON from an earlier revision")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    results = {
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "seed": args.seed,
+        "scripts": {}
+    }
+    for script in args.scripts:
+        path = Path(script).resolve()
+        # A fresh process per script so peak RSS isn't inherited from the previous one
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_quiet_worker) as pool:
+            metrics = pool.submit(load_test, path, args.users, args.steps, args.seed, args.timeout).result()
+        results["scripts"][path.name] = metrics
+        print(f"{path.name}: {metrics['runs']} runs, {metrics['runs_per_s']:.1f} runs/s, "
+              f"rerun p50/p95/p99 {metrics.get('rerun_p50_ms', 0):.0f}/{metrics.get('rerun_p95_ms', 0):.0f}/"
+              f"{metrics.get('rerun_p99_ms', 0):.0f} ms, peak RSS {metrics['peak_rss_mb']:.0f} MB, "
+              f"{metrics['errors']} errors")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    if args.compare:
+        regressions = compare(json.loads(Path(args.compare).read_text()), results, args.tolerance)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,100 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Relative usage of the variable (above-base) load by calendar month, Jan..Dec;
+# pre-monsoon summer drives AC use, winter evenings add a little heating
+SEASONAL_FACTORS = np.array([0.85, 0.85, 0.95, 1.15, 1.3, 1.25, 1.05, 1.0, 1.0, 0.95, 0.9, 0.85])
+
+# Day-to-day spread not visible in a short history, as a coefficient of variation
+DEFAULT_NOISE_CV = 0.1
+
+# Simulations generated per block (bounds the days × samples working set)
+CHUNK_SIMS = 1 << 14
+
+# Below this many simulations a process pool costs more than it saves
+PARALLEL_THRESHOLD = 200_000
+
+
+def weekday_profile(weekdays, kwh):
+    """Mean kWh per weekday (Mon=0) and ratio residuals of each day to its weekday mean."""
+    weekdays = np.asarray(weekdays)
+    kwh = np.asarray(kwh, dtype=np.float64)
+    totals = np.bincount(weekdays, weights=kwh, minlength=7)
+    counts = np.bincount(weekdays, minlength=7)
+    overall = kwh.mean() if len(kwh) else 0.0
+    means = np.where(counts > 0, totals / np.maximum(counts, 1), overall)
+    residuals = kwh / np.where(means[weekdays] > 0, means[weekdays], 1.0)
+    return means, residuals
+
+
+def simulate_bills(weekday_kwh, dates, n, rate, base=0.0, residuals=None,
+                   noise_cv=DEFAULT_NOISE_CV, seed=None):
+    """Total bill for `n` simulated runs over `dates`, as a float64 array.
+
+    Each day draws its weekday's mean with the above-base part scaled by the
+    month's seasonal factor, then multiplies by a bootstrapped residual (when
+    the history has repeat weekdays) and mean-one lognormal noise.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.DatetimeIndex(dates)
+    weekday_kwh = np.asarray(weekday_kwh, dtype=np.float64)
+    mean = weekday_kwh[dates.dayofweek]
+    season = SEASONAL_FACTORS[dates.month - 1]
+    expected = (base + np.maximum(mean - base, 0.0) * season).astype(np.float32)
+    bootstrap = residuals is not None and len(residuals) > 7 and np.ptp(residuals) > 0
+
+    bills = np.empty(n)
+    for start in range(0, n, CHUNK_SIMS):
+        m = min(CHUNK_SIMS, n - start)
+        noise = rng.lognormal(-noise_cv ** 2 / 2, noise_cv, size=(m, len(dates))).astype(np.float32)
+        if bootstrap:
+            noise *= rng.choice(np.asarray(residuals, dtype=np.float32), size=(m, len(dates)))
+        bills[start:start + m] = (noise @ expected) * rate
+    return bills
+
+
+def _simulate_part(args):
+    return simulate_bills(*args)
+
+
+def simulate_bills_parallel(weekday_kwh, dates, n, rate, base=0.0, residuals=None,
+                            noise_cv=DEFAULT_NOISE_CV, seed=None, processes=None):
+    """simulate_bills() with large sample counts split across worker processes."""
+    processes = processes or os.cpu_count() or 1
+    if n < PARALLEL_THRESHOLD or processes == 1:
+        return simulate_bills(weekday_kwh, dates, n, rate, base, residuals, noise_cv, seed)
+
+    # Independent child streams keep the parts statistically separate
+    seeds = np.random.SeedSequence(seed).spawn(processes)
+    sizes = np.full(processes, n // processes)
+    sizes[:n % processes] += 1
+    parts = [(weekday_kwh, dates, int(size), rate, base, residuals, noise_cv, child)
+             for size, child in zip(sizes, seeds)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return np.concatenate(list(pool.map(_simulate_part, parts)))
+
+
+def bill_bands(bills, percentiles=(10, 50, 90)):
+    """Percentile bands of simulated bills, keyed like "P10"."""
+    return dict(zip((f"P{p}" for p in percentiles), np.percentile(bills, percentiles)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bill bands for tracked histories of growing day-to-day spread")
+    parser.add_argument("--days", type=int, default=28, help="days of tracked history")
+    parser.add_argument("--samples", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    history = pd.date_range("2026-01-05", periods=args.days, freq="D")
+    month = pd.date_range("2026-03-01", periods=31, freq="D")
+    for spread in (0.0, 0.1, 0.3):
+        kwh = 20 * rng.lognormal(-spread ** 2 / 2, spread, args.days) if spread else np.full(args.days, 20.0)
+        means, residuals = weekday_profile(history.dayofweek, kwh)
+        bands = bill_bands(simulate_bills(means, month, args.samples, 6.0, 8.0, residuals, seed=1))
+        print(f"day-to-day spread {spread:.0%}: P10 ₹{bands['P10']:,.0f}  P50 ₹{bands['P50']:,.0f}  "
+              f"P90 ₹{bands['P90']:,.0f}  (width ₹{bands['P90'] - bands['P10']:,.0f})")
@@ -0,0 +1,250 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from disaggregation import load_meter_csv
+
+# Level name -> bin width in seconds, finest first; each width divides the next
+LEVELS = {"1min": 60, "15min": 15 * 60, "hour": 3600, "day": 86400, "week": 7 * 86400}
+
+# Bins are aligned to a Monday 00:00 UTC (the Unix epoch fell on a Thursday), which
+# keeps day bins on midnight and week bins on Monday for every level at once
+ORIGIN = 4 * 86400
+
+FIELDS = ("sum", "min", "max", "count")
+
+# Pyramids built from uploaded meter files, one directory per file's content hash
+PYRAMID_DIR = Path(os.environ.get("ENERGY_PYRAMID_DIR", Path(tempfile.gettempdir()) / "energy_pyramids"))
+
+# Pyramids not opened for this long are deleted (seconds)
+EXPIRE_SECONDS = 7 * 24 * 3600
+
+# Disk kept for pyramids; the least recently opened go first beyond it (bytes)
+MAX_BYTES = 2 * 1024 ** 3
+
+
+class Pyramid:
+    """Power readings summarised at several resolutions for zoomable charts.
+
+    Every level is a dense grid of bins starting at the same Monday, holding
+    the sum, min, max and count of the readings in each bin (NaN min/max for
+    empty bins). Because bins are dense, a time range maps to array indices
+    by arithmetic, so a query costs O(points returned) whatever the history
+    length, and levels saved with save() can be memory-mapped by load().
+    """
+
+    def __init__(self, start, levels, first, last):
+        self.start = int(start)  # seconds of the first bin on every level
+        self.levels = levels  # level name -> {field: array}
+        self.first, self.last = int(first), int(last)  # seconds of the first and last readings
+
+    @classmethod
+    def build(cls, timestamps, power):
+        """Build every level from raw (timestamp, power W) readings."""
+        seconds = np.asarray(timestamps, dtype="datetime64[s]").astype(np.int64)
+        power = np.asarray(power, dtype=np.float64)
+        if np.any(seconds[1:] < seconds[:-1]):
+            order = np.argsort(seconds, kind="stable")
+            seconds, power = seconds[order], power[order]
+
+        week = LEVELS["week"]
+        first, last = (seconds[0], seconds[-1]) if len(seconds) else (ORIGIN, ORIGIN)
+        start = (first - ORIGIN) // week * week + ORIGIN
+        width = LEVELS["1min"]
+        # Whole weeks of fine bins, so every coarser level is an exact reshape
+        weeks = (last - start) // week + 1
+        n = int(weeks * week // width)
+
+        index = (seconds - start) // width
+        bounds = np.flatnonzero(np.diff(index, prepend=-1))
+        filled = index[bounds]
+        finest = {
+            "sum": np.zeros(n),
+            "min": np.full(n, np.nan, dtype=np.float32),
+            "max": np.full(n, np.nan, dtype=np.float32),
+            "count": np.zeros(n, dtype=np.int32),
+        }
+        if len(bounds):
+            finest["sum"][filled] = np.add.reduceat(power, bounds)
+            finest["min"][filled] = np.minimum.reduceat(power, bounds)
+            finest["max"][filled] = np.maximum.reduceat(power, bounds)
+            finest["count"][filled] = np.diff(np.append(bounds, len(index)))
+
+        levels = {"1min": finest}
+        names = list(LEVELS)
+        for finer, name in zip(names, names[1:]):
+            ratio = LEVELS[name] // LEVELS[finer]
+            blocks = {field: array.reshape(-1, ratio) for field, array in levels[finer].items()}
+            levels[name] = {
+                "sum": blocks["sum"].sum(axis=1),
+                # fmin/fmax skip NaN bins and give NaN only when the whole block is empty
+                "min": np.fmin.reduce(blocks["min"], axis=1),
+                "max": np.fmax.reduce(blocks["max"], axis=1),
+                "count": blocks["count"].sum(axis=1, dtype=np.int32),
+            }
+        return cls(start, levels, first, last)
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for level in self.levels.values() for array in level.values())
+
+    def level_for(self, start, end, pixels):
+        """The coarsest level with at least `pixels` bins over [start, end), else the finest."""
+        for name in reversed(LEVELS):
+            if (end - start) / LEVELS[name] >= pixels:
+                return name
+        return next(iter(LEVELS))
+
+    def query(self, start, end, pixels=1000):
+        """Bins covering [start, end) at the level chosen for `pixels`.
+
+        `start`/`end` are anything pd.Timestamp accepts. Returns (level label,
+        DataFrame of time, mean, min, max, sum and count); empty bins have NaN
+        mean/min/max so charts show gaps. The level's bins are merged in equal
+        runs (labelled e.g. "6×hour") so at most `pixels` rows come back.
+        """
+        start, end = (int(pd.Timestamp(value).timestamp()) for value in (start, end))
+        name = self.level_for(start, end, pixels)
+        width = LEVELS[name]
+        level = self.levels[name]
+        n = len(level["count"])
+        first = min(max((start - self.start) // width, 0), n)
+        last = min(max(-(-(end - self.start) // width), first), n)
+
+        count = np.asarray(level["count"][first:last])
+        total = np.asarray(level["sum"][first:last])
+        low = np.asarray(level["min"][first:last])
+        high = np.asarray(level["max"][first:last])
+        merge = max(-(-(last - first) // max(pixels, 1)), 1)
+        if merge > 1:
+            runs = np.arange(0, last - first, merge)
+            count, total = np.add.reduceat(count, runs), np.add.reduceat(total, runs)
+            low, high = np.fmin.reduceat(low, runs), np.fmax.reduceat(high, runs)
+            name = f"{merge}×{name}"
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / count, np.nan)
+        frame = pd.DataFrame({
+            "time": pd.to_datetime(self.start + (first + np.arange(len(count)) * merge) * width, unit="s"),
+            "mean": mean,
+            "min": low,
+            "max": high,
+            "sum": total,
+            "count": count,
+        })
+        return name, frame
+
+    def save(self, path):
+        """Write one .npy file per level and field, plus meta.json, under directory `path`."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name, level in self.levels.items():
+            for field, array in level.items():
+                np.save(path / f"{name}_{field}.npy", array)
+        # Written last, so a directory without it holds an interrupted save
+        (path / "meta.json").write_text(json.dumps({"start": self.start, "first": self.first, "last": self.last,
+                                                    "levels": LEVELS}))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Open a saved pyramid; with `mmap` only the bins a query touches are read from disk."""
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        if meta["levels"] != LEVELS:
+            raise ValueError(f"{path} was built with different levels: {meta['levels']}")
+        mode = "r" if mmap else None
+        levels = {
+            name: {field: np.load(path / f"{name}_{field}.npy", mmap_mode=mode) for field in FIELDS}
+            for name in LEVELS
+        }
+        return cls(meta["start"], levels, meta["first"], meta["last"])
+
+
+def content_key(data):
+    """Name of the pyramid directory for a meter CSV's bytes."""
+    return hashlib.sha1(data).hexdigest()
+
+
+def open_pyramid(data, root=PYRAMID_DIR):
+    """Memory-mapped pyramid for a meter CSV's bytes, built on first use.
+
+    Pyramids are kept under `root` by content hash, so re-uploads and other
+    server processes reuse the same files. A pyramid is built in a private
+    directory and renamed into place whole, so files another process has
+    memory-mapped are never rewritten; when two processes race, the
+    first rename wins and the other's copy is discarded.
+    """
+    root = Path(root)
+    path = root / content_key(data)
+    if not (path / "meta.json").exists():
+        root.mkdir(parents=True, exist_ok=True)
+        expire(root)
+        # Only an interrupted save from before builds were renamed into place leaves this
+        shutil.rmtree(path, ignore_errors=True)
+        building = Path(tempfile.mkdtemp(prefix=f".{path.name}-", dir=root))
+        try:
+            Pyramid.build(*load_meter_csv(io.BytesIO(data))).save(building)
+            os.replace(building, path)
+        except OSError:
+            # Another process published this pyramid first
+            if not (path / "meta.json").exists():
+                raise
+        finally:
+            shutil.rmtree(building, ignore_errors=True)
+    # Marks the pyramid as recently used for expire()
+    os.utime(path / "meta.json")
+    return Pyramid.load(path)
+
+
+def expire(root=PYRAMID_DIR, max_age=EXPIRE_SECONDS, max_bytes=MAX_BYTES):
+    """Delete pyramids not opened for `max_age` seconds, then the least recently opened beyond `max_bytes`.
+
+    Processes that still have a deleted pyramid memory-mapped keep reading
+    it; its disk space is freed when they close it.
+    """
+    cutoff = time.time() - max_age
+    pyramids = []
+    for path in Path(root).iterdir():
+        meta = path / "meta.json"
+        if not meta.exists():
+            # A build in progress, or one abandoned by a crashed process
+            if path.stat().st_mtime < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+            continue
+        pyramids.append((meta.stat().st_mtime, sum(f.stat().st_size for f in path.iterdir()), path))
+    used = 0
+    for opened, size, path in sorted(pyramids, reverse=True):
+        used += size
+        if opened < cutoff or used > max_bytes:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a multi-resolution pyramid from meter readings")
+    parser.add_argument("readings", help="CSV with timestamp and power_w columns")
+    parser.add_argument("-o", "--output", default="pyramid")
+    parser.add_argument("--pixels", type=int, default=1000, help="chart width used for the timing queries")
+    args = parser.parse_args()
+
+    timestamps, power = load_meter_csv(args.readings)
+    start = time.perf_counter()
+    pyramid = Pyramid.build(timestamps, power)
+    pyramid.save(args.output)
+    print(f"{len(power)} readings → {pyramid.nbytes / 1e6:.1f} MB of levels in "
+          f"{time.perf_counter() - start:.2f}s → {args.output}/")
+
+    # Zoom from the whole history down to an hour, reading from the memory-mapped files
+    pyramid = Pyramid.load(args.output)
+    end = pd.Timestamp(timestamps.max())
+    for span in ["3650D", "365D", "30D", "7D", "1D", "1h"]:
+        start = time.perf_counter()
+        name, frame = pyramid.query(end - pd.Timedelta(span), end, args.pixels)
+        print(f"{span:>6}: {len(frame):>6} {name} bins in {(time.perf_counter() - start) * 1000:.2f} ms")
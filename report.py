@@ -0,0 +1,218 @@
+import argparse
+import html
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from anomaly import detect_anomalies
+from appliances import bhk_base_kwh, load_registry
+from carbon import appliance_factors, emissions, load_intensity, window_factor
+from compact import compact_figure
+import figure_pool as pooled
+from figures import appliance_frame, appliance_stack, cost_scatter, cost_table, rate_comparison, weekly_frame
+from ingest import FLEET_SCHEMA, read_csv
+from scheduler import load_tou_prices, optimal_schedule, shiftable_appliances
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Written once per output directory and shared by every report in it
+PLOTLY_JS = "plotly.min.js"
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Electricity Report – {title}</title>
+<script src="{plotly_js}"></script>
+<style>
+    body {{ font-family: sans-serif; max-width: 1100px; margin: 2rem auto; color: #333; }}
+    h1 {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 2rem; border-radius: 15px; }}
+    .metrics {{ display: flex; gap: 1rem; }}
+    .metric {{ flex: 1; background: #f8f9fa; border-left: 5px solid #667eea; padding: 1rem; border-radius: 10px; }}
+    .metric b {{ display: block; font-size: 1.5rem; }}
+    .alert {{ background: #fff3e0; border: 1px solid #ff9800; padding: 1rem; border-radius: 12px; margin: 1rem 0; }}
+    table {{ border-collapse: collapse; width: 100%; margin: 1rem 0; }}
+    th, td {{ border: 1px solid #e9ecef; padding: 0.4rem 0.8rem; text-align: right; }}
+    th:first-child, td:first-child {{ text-align: left; }}
+</style>
+</head>
+<body>
+<h1>⚡ Electricity Report – {title}</h1>
+<p>{bhk} BHK · ₹{rate:.2f}/kWh · generated {generated}</p>
+{body}
+</body>
+</html>
+"""
+
+
+def _metrics(items):
+    cards = "".join(f'<div class="metric">{html.escape(label)}<b>{html.escape(value)}</b></div>' for label, value in items)
+    return f'<div class="metrics">{cards}</div>'
+
+
+def _figure(fig):
+    return compact_figure(fig).to_html(full_html=False, include_plotlyjs=False)
+
+
+def household_usage(frame, appliances):
+    """Daily kWh Series and days × appliances bool frame.
+
+    Both are indexed by date when the frame has a Date column (the
+    dashboard's export), else by weekday name Monday to Sunday.
+    """
+    if "Date" in frame:
+        frame = frame.set_index("Date").sort_index()
+        frame.index = pd.DatetimeIndex(frame.index)
+    else:
+        frame = frame.set_index("Day").reindex(DAYS)
+    consumption = frame["Consumption_kWh"].fillna(0.0)
+    usage = frame[list(appliances.values())].fillna(False).astype(bool).set_axis(list(appliances), axis=1)
+    return consumption, usage
+
+
+# Chart templates for this worker process; each household's figures are patched copies
+_POOL = pooled.FigurePool()
+
+# Registry, carbon intensity, its time-of-use window factor and the TOU multipliers,
+# read once per worker process rather than once per household
+_TABLES = None
+
+
+def _tables():
+    global _TABLES
+    if _TABLES is None:
+        intensity = load_intensity()
+        _TABLES = load_registry(), intensity, window_factor(intensity), load_tou_prices(1.0)
+    return _TABLES
+
+
+def render_report(args):
+    """Write one household's HTML report and return the bytes written."""
+    household_id, frame, out_dir, theme = args
+    registry, intensity, window, tou_multipliers = _tables()
+    appliances = {
+        column[:-len("_Used")].replace("_", " "): column
+        for column in frame.columns if column.endswith("_Used")
+    }
+    appliances = {name: column for name, column in appliances.items() if name in registry.index}
+    appliance_kwh = registry.loc[list(appliances), "kwh_per_day"].to_dict()
+
+    bhk = int(frame["bhk"].iloc[0])
+    rate = float(frame["rate"].iloc[0])
+    base_consumption = bhk_base_kwh(bhk)
+    consumption, usage = household_usage(frame, appliances)
+    appliance_co2, daily_co2 = emissions(usage.to_numpy(), list(appliance_kwh.values()),
+                                         appliance_factors(registry, appliances, intensity),
+                                         base_consumption, window)
+    df_viz = weekly_frame(consumption, rate, base_consumption, daily_co2,
+                          pd.DataFrame(appliance_co2, columns=list(appliances)))
+    days = len(df_viz)
+
+    anomalies = detect_anomalies(df_viz["Consumption"].to_numpy(), window=len(DAYS), period=len(DAYS),
+                                 min_scale=base_consumption * 0.1)
+    spikes = anomalies.spikes.nonzero()[0]
+    spike_days = list(df_viz["Day"].iloc[spikes])
+    sections = []
+
+    # Analytics dashboard; estimates scale the daily average, so dated ranges other than a week compare fairly
+    total = df_viz["Consumption"].sum()
+    weekly = total / days * len(DAYS)
+    sections.append("<h2>📊 Analytics Dashboard</h2>")
+    sections.append(_metrics([
+        ("🔌 Total Weekly" if days == len(DAYS) else f"🔌 Total ({days} days)", f"{total:.1f} kWh"),
+        ("📊 Daily Average", f"{total / days:.1f} kWh"),
+        ("💰 Monthly Bill", f"₹{weekly * 4.33 * rate:.0f}"),
+        ("⚡ Peak Day", df_viz.loc[df_viz["Consumption"].idxmax(), "Day"])
+    ]))
+    sections.append(_figure(pooled.cost_bars(_POOL, df_viz, base_consumption, rate, theme)))
+    sections.append(_figure(pooled.gauge(_POOL, df_viz["Efficiency"].mean(), theme)))
+
+    # Advanced charts
+    sections.append("<h2>📈 Advanced Charts</h2>")
+    sections.append(_figure(pooled.radar(_POOL, df_viz, theme)))
+    df_appliances = appliance_frame(usage, appliance_kwh)
+    if not df_appliances.empty:
+        sections.append(_figure(appliance_stack(df_appliances, theme)))
+    heatmap_data = usage.to_numpy(dtype=int).tolist()
+    sections.append(_figure(pooled.heatmap(_POOL, heatmap_data, list(appliances), list(df_viz["Day"]), theme)))
+    sections.append(_figure(pooled.trend(_POOL, df_viz, base_consumption, spike_days, theme)))
+    sections.append(_figure(pooled.histogram(_POOL, df_viz, theme)))
+    sections.append(_figure(pooled.box(_POOL, df_viz, theme)))
+
+    # Insights
+    sections.append("<h2>🎯 Insights</h2>")
+    if spike_days:
+        spike_list = ", ".join(f"{day} ({kwh:.1f} kWh)"
+                               for day, kwh in zip(spike_days, df_viz["Consumption"].iloc[spikes]))
+        sections.append(f'<div class="alert">⚠️ Unusual consumption on {html.escape(spike_list)}.</div>')
+    else:
+        sections.append("<p>✅ No unusual spikes in your daily consumption.</p>")
+
+    shiftable = shiftable_appliances(registry, list(appliances))
+    runs_per_week = usage[shiftable.index].sum().to_numpy() * len(DAYS) / days
+    if runs_per_week.any():
+        schedule = optimal_schedule(
+            rate * tou_multipliers, shiftable["kwh_per_day"].to_numpy(), shiftable["run_hours"].to_numpy(),
+            shiftable["window_start"].to_numpy(), shiftable["window_end"].to_numpy()
+        )
+        df_schedule = pd.DataFrame({
+            "Appliance": shiftable.index,
+            "Best Start": [f"{int(hour):02d}:{int(round(hour % 1 * 60)):02d}" for hour in schedule.start[0]],
+            "Runs/Week": runs_per_week.round(1),
+            "Weekly Savings (₹)": (schedule.savings[0] * runs_per_week).round(2)
+        })
+        sections.append(df_schedule[df_schedule["Runs/Week"] > 0].to_html(index=False))
+
+    # Cost analysis
+    sections.append("<h2>💰 Cost Analysis</h2>")
+    weekly_cost = df_viz["Cost"].mean() * len(DAYS)
+    sections.append(_metrics([
+        ("Weekly Cost", f"₹{weekly_cost:.2f}"),
+        ("Daily Average", f"₹{df_viz['Cost'].mean():.2f}"),
+        ("Monthly Estimate", f"₹{weekly_cost * 4.33:.2f}"),
+        ("Annual Estimate", f"₹{weekly_cost * 52:.2f}"),
+        ("Weekly CO₂", f"{df_viz['CO2_kg'].mean() * len(DAYS):.1f} kg")
+    ]))
+    sections.append(_figure(pooled.cost_breakdown(_POOL, df_viz, theme)))
+    sections.append(_figure(cost_scatter(df_viz, theme)))
+    sections.append(cost_table(df_viz, base_consumption).to_html(index=False))
+    sections.append(rate_comparison(weekly).to_html(index=False))
+
+    page = PAGE.format(
+        title=html.escape(str(household_id)), plotly_js=PLOTLY_JS, bhk=bhk, rate=rate,
+        generated=pd.Timestamp.now().strftime("%Y-%m-%d"), body="\n".join(sections)
+    )
+    path = Path(out_dir) / f"report_{household_id}.html"
+    path.write_text(page, encoding="utf-8")
+    return path.stat().st_size
+
+
+def generate_reports(fleet, out_dir, theme="plotly", processes=None):
+    """Render every household in `fleet` to `out_dir` in a process pool; returns total bytes."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / PLOTLY_JS).write_text(get_plotlyjs(), encoding="utf-8")
+
+    jobs = [(household_id, frame, str(out_dir), theme) for household_id, frame in fleet.groupby("household_id")]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        sizes = list(pool.map(render_report, jobs, chunksize=max(len(jobs) // 64, 1)))
+    return len(jobs), sum(sizes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monthly HTML reports for every household")
+    parser.add_argument("fleet", help="CSV with household_id, bhk, rate, Day, Consumption_kWh and <Appliance>_Used "
+                                       "columns, plus Date for dated rows as in the dashboard's export")
+    parser.add_argument("-o", "--output", default="reports")
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    parser.add_argument("--theme", default="plotly", choices=["plotly", "plotly_dark", "plotly_white"])
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count, size = generate_reports(read_csv(args.fleet, FLEET_SCHEMA), args.output, args.theme, args.processes)
+    elapsed = time.perf_counter() - start
+    print(f"{count} reports in {elapsed:.1f}s ({count / elapsed:.1f} reports/s, "
+          f"{size / 1e6:.1f} MB) → {args.output}/")
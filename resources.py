@@ -0,0 +1,64 @@
+import streamlit as st
+
+from appliances import load_registry
+from archive import connect
+from carbon import load_intensity
+from figure_pool import FigurePool
+from live_feed import FEED_URLS, LiveFeed
+from scheduler import load_tou_prices
+from session import SessionStore
+
+# Process-wide resources shared by every page of app.py and every session.
+# st.cache_resource hands out the same object each time instead of a copy,
+# so callers treat these as read-only.
+
+
+@st.cache_resource
+def registry():
+    """Appliance registry, read once per process."""
+    return load_registry()
+
+
+@st.cache_resource
+def _tou_multipliers():
+    return load_tou_prices(1.0)
+
+
+def tou_prices(rate):
+    """Hourly ₹/kWh prices at a flat `rate`; the tariff file is read once per process."""
+    return rate * _tou_multipliers()
+
+
+@st.cache_resource
+def grid_intensity():
+    """Grid carbon intensity table, read once per process."""
+    return load_intensity()
+
+
+@st.cache_resource
+def session_store():
+    # The daily history of every session (compact arrays, idle sessions
+    # spilled to disk); session state only holds each session's key into it
+    store = SessionStore()
+    store.expire()
+    return store
+
+
+@st.cache_resource(max_entries=max(len(FEED_URLS), 1), on_release=LiveFeed.stop)
+def live_feed(url):
+    """One listener per configured gateway URL, ingesting for every session; stopped when evicted."""
+    if url not in FEED_URLS:
+        raise ValueError(f"{url!r} is not a configured gateway; add it to ENERGY_LIVE_FEEDS")
+    return LiveFeed(url).start()
+
+
+@st.cache_resource
+def figure_pool():
+    """Prebuilt chart templates per chart and theme, patched with each session's data."""
+    return FigurePool()
+
+
+@st.cache_resource
+def archive_connection(path):
+    # One DuckDB engine per archive; each run queries through its own cursor
+    return connect(path)
@@ -0,0 +1,128 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from appliances import load_registry
+
+TARIFF_PATH = Path(__file__).with_name("tou_tariff.csv")
+
+# Households handed to each worker process at a time
+CHUNK_HOUSEHOLDS = 2048
+
+
+class Schedule(NamedTuple):
+    start: np.ndarray
+    cost: np.ndarray
+    baseline_cost: np.ndarray
+    savings: np.ndarray
+
+
+def load_tou_prices(rate, path=TARIFF_PATH):
+    """Hourly ₹/kWh prices: the flat rate scaled by the time-of-use multipliers."""
+    tariff = pd.read_csv(path).sort_values("hour")
+    return rate * tariff["multiplier"].to_numpy(dtype=np.float64)
+
+
+def shiftable_appliances(registry, names=None):
+    """Registry rows for appliances whose run time can be moved, with `run_hours`."""
+    shiftable = registry[registry["shiftable"].fillna(False).astype(bool)].copy()
+    if names is not None:
+        shiftable = shiftable[shiftable.index.isin(names)]
+    shiftable["window_start"] = shiftable["window_start"].astype(int)
+    shiftable["window_end"] = shiftable["window_end"].astype(int)
+    shiftable["run_hours"] = shiftable["hours_per_day"]
+    return shiftable
+
+
+def optimal_schedule(prices, kwh, run_hours, window_start, window_end):
+    """Cheapest start slot per household and appliance.
+
+    `prices` is households × slots over one day (or a single day's slots).
+    Each appliance uses `kwh` spread evenly over `run_hours`, and must start
+    and finish inside [window_start, window_end) hours; windows may wrap past
+    midnight. The baseline runs each appliance as soon as its window opens.
+    Returns household × appliance arrays; `start` is an hour of day.
+    """
+    prices = np.atleast_2d(np.asarray(prices, dtype=np.float64))
+    households, slots = prices.shape
+    slot_hours = 24.0 / slots
+
+    # Two days back to back lets windows wrap midnight; cumsum gives O(1) window sums
+    doubled = np.concatenate([prices, prices], axis=1)
+    csum = np.concatenate([np.zeros((households, 1)), np.cumsum(doubled, axis=1)], axis=1)
+    starts = np.arange(slots)
+
+    n = len(kwh)
+    best_start = np.zeros((households, n))
+    best_cost = np.zeros((households, n))
+    baseline = np.zeros((households, n))
+
+    for a in range(n):
+        run = max(int(np.ceil(run_hours[a] / slot_hours)), 1)
+        first = int(window_start[a] / slot_hours) % slots
+        last = int(window_end[a] / slot_hours)
+        span = (last - first) % slots or slots
+        allowed = (starts - first) % slots <= span - run
+
+        # Mean price over each candidate run, scaled to the appliance's energy
+        run_cost = (csum[:, starts + run] - csum[:, starts]) / run * kwh[a]
+        masked = np.where(allowed, run_cost, np.inf)
+        choice = masked.argmin(axis=1)
+
+        best_start[:, a] = choice * slot_hours
+        best_cost[:, a] = masked[np.arange(households), choice]
+        baseline[:, a] = run_cost[:, first] if span >= run else np.inf
+
+    return Schedule(best_start, best_cost, baseline, baseline - best_cost)
+
+
+def _schedule_chunk(args):
+    return optimal_schedule(*args)
+
+
+def schedule_fleet(prices, kwh, run_hours, window_start, window_end, processes=None):
+    """optimal_schedule() over many households, split across worker processes."""
+    prices = np.atleast_2d(np.asarray(prices, dtype=np.float64))
+    chunks = [
+        (prices[i:i + CHUNK_HOUSEHOLDS], kwh, run_hours, window_start, window_end)
+        for i in range(0, len(prices), CHUNK_HOUSEHOLDS)
+    ]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        parts = list(pool.map(_schedule_chunk, chunks))
+    return Schedule(*(np.concatenate(field) for field in zip(*parts)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cheapest run times for shiftable appliances across a fleet")
+    parser.add_argument("fleet", help="CSV with household_id, rate and one runs-per-week column per shiftable appliance")
+    parser.add_argument("-o", "--output", default="schedules.csv")
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    fleet = pd.read_csv(args.fleet)
+    shiftable = shiftable_appliances(load_registry(), fleet.columns)
+    names = list(shiftable.index)
+    tou = load_tou_prices(1.0)
+    prices = fleet["rate"].to_numpy(dtype=np.float64)[:, None] * tou[None, :]
+
+    start = time.perf_counter()
+    schedule = schedule_fleet(
+        prices, shiftable["kwh_per_day"].to_numpy(), shiftable["run_hours"].to_numpy(),
+        shiftable["window_start"].to_numpy(), shiftable["window_end"].to_numpy(), args.processes
+    )
+    elapsed = time.perf_counter() - start
+
+    runs = fleet[names].to_numpy(dtype=np.float64)
+    result = pd.DataFrame({
+        "household_id": np.repeat(fleet["household_id"].to_numpy(), len(names)),
+        "appliance": np.tile(names, len(fleet)),
+        "start_hour": schedule.start.ravel(),
+        "weekly_savings": (schedule.savings * runs).ravel().round(2),
+    })
+    result.to_csv(args.output, index=False)
+    print(f"{len(fleet)} households in {elapsed:.2f}s ({len(fleet) / elapsed:,.0f}/s) → {args.output}")
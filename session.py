@@ -0,0 +1,220 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Sessions kept in memory before the least recently used one spills to disk
+MAX_RESIDENT = 256
+
+# Sessions idle for longer than this spill regardless of MAX_RESIDENT (seconds)
+IDLE_SECONDS = 600
+
+# Spill files untouched for this long belong to sessions that ended (seconds)
+EXPIRE_SECONDS = 7 * 24 * 3600
+
+SPILL_DIR = Path(os.environ.get("ENERGY_SPILL_DIR", Path(tempfile.gettempdir()) / "energy_sessions"))
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate bytes held by `obj` and everything it references."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(obj, bool) or obj is None:
+        # Shared singletons
+        return 0
+    if isinstance(obj, (str, bytes, int, float)):
+        return sys.getsizeof(obj)
+    if hasattr(obj, "to_plotly_json"):
+        # Plotly figures keep their data in nested dicts behind properties
+        return sys.getsizeof(obj) + deep_sizeof(obj.to_plotly_json(), seen)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name))
+    return size
+
+
+def memory_breakdown(state):
+    """Bytes per key of a session-state mapping, largest first."""
+    rows = [{"Key": key, "Type": type(value).__name__, "Bytes": deep_sizeof(value)} for key, value in state.items()]
+    return pd.DataFrame(rows, columns=["Key", "Type", "Bytes"]).sort_values("Bytes", ascending=False, ignore_index=True)
+
+
+class UsageHistory:
+    """One session's daily history: a dates × appliances bool matrix and daily kWh.
+
+    Rows are kept sorted by date and added as the user visits new dates.
+    Replaces per-session dicts keyed by weekday name, whose per-entry Python
+    objects cost ~100× the underlying data.
+    """
+
+    __slots__ = ("dates", "appliances", "usage", "kwh")
+
+    def __init__(self, appliances=(), dates=None, usage=None, kwh=None):
+        self.appliances = list(appliances)
+        self.dates = np.array([], dtype="datetime64[D]") if dates is None else np.asarray(dates, dtype="datetime64[D]")
+        self.usage = np.zeros((len(self.dates), len(self.appliances)), dtype=bool) if usage is None else usage
+        self.kwh = np.zeros(len(self.dates)) if kwh is None else kwh
+
+    def select(self, appliances):
+        """Switch to a new appliance selection, keeping ticks for appliances in both."""
+        appliances = list(appliances)
+        if appliances == self.appliances:
+            return
+        usage = np.zeros((len(self.dates), len(appliances)), dtype=bool)
+        index = {name: i for i, name in enumerate(self.appliances)}
+        for j, name in enumerate(appliances):
+            if name in index:
+                usage[:, j] = self.usage[:, index[name]]
+        self.appliances, self.usage = appliances, usage
+
+    def ensure(self, dates):
+        """Add empty rows for any of `dates` not yet in the history."""
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        new = np.setdiff1d(dates, self.dates)
+        if not len(new):
+            return
+        merged = np.union1d(self.dates, new)
+        rows = np.searchsorted(merged, self.dates)
+        usage = np.zeros((len(merged), len(self.appliances)), dtype=bool)
+        kwh = np.zeros(len(merged))
+        usage[rows], kwh[rows] = self.usage, self.kwh
+        self.dates, self.usage, self.kwh = merged, usage, kwh
+
+    def _rows(self, dates):
+        return np.searchsorted(self.dates, np.asarray(dates, dtype="datetime64[D]"))
+
+    def used(self, date, appliance):
+        return bool(self.usage[self._rows(date), self.appliances.index(appliance)])
+
+    def set_used(self, date, appliance, value):
+        self.usage[self._rows(date), self.appliances.index(appliance)] = value
+
+    def set_kwh(self, date, value):
+        self.kwh[self._rows(date)] = value
+
+    def consumption(self, dates):
+        """Daily kWh for `dates` (which must be in the history) as a date-indexed Series."""
+        index = pd.DatetimeIndex(dates)
+        return pd.Series(self.kwh[self._rows(index.values)], index=index, name="kWh")
+
+    def usage_frame(self, dates):
+        """Dates × appliances bool frame for `dates`, built per rerun and not stored."""
+        index = pd.DatetimeIndex(dates)
+        return pd.DataFrame(self.usage[self._rows(index.values)], index=index, columns=self.appliances)
+
+    @property
+    def nbytes(self):
+        return deep_sizeof(self)
+
+    def save(self, path):
+        np.savez(path, dates=self.dates.astype(np.int64), appliances=np.array(self.appliances, dtype=str),
+                 usage=np.packbits(self.usage, axis=1), kwh=self.kwh)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            appliances = data["appliances"].tolist()
+            usage = np.unpackbits(data["usage"], axis=1, count=len(appliances)).astype(bool)
+            return cls(appliances, data["dates"].astype("datetime64[D]"), usage, data["kwh"])
+
+
+class SessionStore:
+    """Process-wide UsageHistory store with LRU spill of idle sessions to disk.
+
+    Streamlit runs each session's script in its own thread, so every method
+    takes the store lock. Sessions are keyed by an id kept in session state.
+    """
+
+    def __init__(self, spill_dir=SPILL_DIR, max_resident=MAX_RESIDENT, idle_seconds=IDLE_SECONDS):
+        self.spill_dir = Path(spill_dir)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self.max_resident = max_resident
+        self.idle_seconds = idle_seconds
+        self._resident = OrderedDict()  # key -> (UsageHistory, last access)
+        self._breakdowns = {}  # key -> {type name: bytes} from the session's last rerun
+        self._lock = threading.Lock()
+        self.spills = self.loads = 0
+
+    def _path(self, key):
+        return self.spill_dir / f"{key}.npz"
+
+    def get(self, key):
+        """The session's UsageHistory, loaded from disk if it was spilled."""
+        with self._lock:
+            if key in self._resident:
+                history, _ = self._resident.pop(key)
+            elif self._path(key).exists():
+                try:
+                    history = UsageHistory.load(self._path(key))
+                    self.loads += 1
+                except (KeyError, ValueError, OSError):
+                    # Unreadable or from an older format; start the session afresh
+                    history = UsageHistory()
+                self._path(key).unlink()
+            else:
+                history = UsageHistory()
+            self._resident[key] = (history, time.monotonic())
+            self._evict()
+            return history
+
+    def _evict(self):
+        now = time.monotonic()
+        # Oldest first; stop at the first session that is recent and within budget
+        while self._resident:
+            key, (history, last) = next(iter(self._resident.items()))
+            if len(self._resident) <= self.max_resident and now - last < self.idle_seconds:
+                break
+            del self._resident[key]
+            history.save(self._path(key))
+            self.spills += 1
+
+    def expire(self, max_age=EXPIRE_SECONDS):
+        """Delete spill files of sessions not seen for `max_age` seconds."""
+        cutoff = time.time() - max_age
+        with self._lock:
+            for path in self.spill_dir.glob("*.npz"):
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+                    self._breakdowns.pop(path.stem, None)
+
+    def record(self, key, breakdown):
+        """Remember a session's memory_breakdown() summed by object type."""
+        with self._lock:
+            self._breakdowns[key] = breakdown.groupby("Type")["Bytes"].sum().to_dict()
+
+    def report(self):
+        """Bytes by object type across sessions, plus store counters."""
+        with self._lock:
+            by_type = pd.DataFrame.from_dict(self._breakdowns, orient="index").fillna(0)
+            resident = sum(history.nbytes for history, _ in self._resident.values())
+            stats = {
+                "Sessions": len(self._breakdowns),
+                "Resident": len(self._resident),
+                "Spilled": sum(1 for _ in self.spill_dir.glob("*.npz")),
+                "Resident Bytes": resident,
+                "Spills": self.spills,
+                "Loads": self.loads
+            }
+        totals = by_type.sum().sort_values(ascending=False).astype(int).rename("Bytes")
+        return totals.rename_axis("Type").reset_index(), stats
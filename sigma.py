@@ -1,5 +1,7 @@
 import streamlit as st
 import random
+from appliances import DEFAULT_APPLIANCES, daily_consumption, kwh_vector
+import resources
 
 # Set page configuration
 st.set_page_config(
@@ -110,10 +112,22 @@ with col2:
     
     st.subheader("🔌 WHAT APPLIANCES YOU GOT?")
     
-    # Appliance inputs with brainrot descriptions
-    ac = st.number_input("Air Conditioners (Cool Kid Equipment) ❄️", min_value=0, value=0, step=1)
-    fridge = st.number_input("Refrigerators (Food Storage Slay) 🧊", min_value=0, value=1, step=1)
-    wm = st.number_input("Washing Machines (Clean Clothes Era) 🧺", min_value=0, value=0, step=1)
+    # Appliance inputs from the registry, with brainrot descriptions for the classics
+    registry = resources.registry()
+    appliance_labels = {
+        "AC": "Air Conditioners (Cool Kid Equipment) ❄️",
+        "Fridge": "Refrigerators (Food Storage Slay) 🧊",
+        "Washing Machine": "Washing Machines (Clean Clothes Era) 🧺"
+    }
+    appliances = st.multiselect("Pick Your Appliance Squad 🔌", list(registry.index), default=DEFAULT_APPLIANCES)
+    counts = [
+        st.number_input(
+            appliance_labels.get(appliance, f"{appliance} {registry.loc[appliance, 'icon']}"),
+            min_value=0, value=1 if appliance == "Fridge" else 0, step=1
+        )
+        for appliance in appliances
+    ]
+    appliance_kwh = kwh_vector(registry, appliances)
 
 # Calculate button with extra brainrot
 if st.button("CALCULATE MY ENERGY CONSUMPTION FR FR 💀🔥", type="primary"):
@@ -122,8 +136,9 @@ if st.button("CALCULATE MY ENERGY CONSUMPTION FR FR 💀🔥", type="primary"):
         base_energy = {1: 2.4, 2: 3.6, 3: 4.8}
         total_energy = base_energy[bhk]
         
-        # Add appliance energy consumption
-        total_energy += (ac * 3) + (fridge * 4) + (wm * 3)
+        # Add appliance energy consumption (unit counts @ kWh per unit)
+        appliance_energy = [round(count * kwh, 3) for count, kwh in zip(counts, appliance_kwh)]
+        total_energy = round(float(daily_consumption(counts, appliance_kwh, total_energy)), 3)
         
         # Random success message
         success_messages = [
@@ -145,15 +160,19 @@ if st.button("CALCULATE MY ENERGY CONSUMPTION FR FR 💀🔥", type="primary"):
             st.write(f"**Housing:** {bhk} BHK {housing_type.split()[0]} (very mindful, very demure) 🏠")
         
         # Energy breakdown with brainrot metrics
-        col1, col2 = st.columns(2)
+        metric_labels = {
+            "AC": "AC Energy (Staying Cool) ❄️",
+            "Fridge": "Fridge Energy (Keeping It Fresh) 🧊",
+            "Washing Machine": "Washing Machine Energy (Clean Era) 🧺"
+        }
+        metric_cols = st.columns(2)
         
-        with col1:
+        with metric_cols[0]:
             st.metric("Base Energy (Your Foundation) 🏠", f"{base_energy[bhk]} kWh")
-            st.metric("AC Energy (Staying Cool) ❄️", f"{ac * 3} kWh")
         
-        with col2:
-            st.metric("Fridge Energy (Keeping It Fresh) 🧊", f"{fridge * 4} kWh")
-            st.metric("Washing Machine Energy (Clean Era) 🧺", f"{wm * 3} kWh")
+        for i, (appliance, energy) in enumerate(zip(appliances, appliance_energy), start=1):
+            with metric_cols[i % 2]:
+                st.metric(metric_labels.get(appliance, f"{appliance} Energy {registry.loc[appliance, 'icon']}"), f"{energy:g} kWh")
         
         # Total energy consumption with brainrot
         st.metric(
@@ -182,12 +201,12 @@ if st.button("CALCULATE MY ENERGY CONSUMPTION FR FR 💀🔥", type="primary"):
         st.info(f"💭 {random.choice(motivation)}")
         
         # Breakdown chart with brainrot
-        if ac > 0 or fridge > 0 or wm > 0:
+        if any(count > 0 for count in counts):
             st.subheader("📈 ENERGY BREAKDOWN (THE VISUAL SLAY)")
             
             breakdown_data = {
-                "Source": ["Base (House Vibes)", "Air Conditioners", "Refrigerators", "Washing Machines"],
-                "Energy (kWh)": [base_energy[bhk], ac * 3, fridge * 4, wm * 3]
+                "Source": ["Base (House Vibes)"] + appliances,
+                "Energy (kWh)": [base_energy[bhk]] + appliance_energy
             }
             
             # Filter out zero values for cleaner chart
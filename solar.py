@@ -0,0 +1,168 @@
+import argparse
+import time
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from billing import interval_kwh
+from ingest import INVERTER_SCHEMA, read_csv
+
+# Interval length for net metering; meters and inverters are binned to it
+INTERVAL = "15min"
+INTERVAL_HOURS = 0.25
+
+# AC output per kWp of panels relative to irradiance, after inverter,
+# wiring, temperature and soiling losses
+PERFORMANCE_RATIO = 0.8
+
+# Share of a day's household consumption per hour of day: a low overnight
+# base, a morning peak and a larger evening peak
+LOAD_SHAPE = np.array([
+    2.6, 2.3, 2.2, 2.1, 2.2, 2.8, 4.0, 5.2, 5.0, 4.2, 3.8, 3.6,
+    3.6, 3.5, 3.5, 3.6, 4.0, 4.8, 6.0, 6.8, 6.9, 6.2, 4.8, 3.6,
+])
+LOAD_SHAPE = LOAD_SHAPE / LOAD_SHAPE.sum()
+
+# Homes netted per block, bounding the temporary arrays to a few tens of MB
+CHUNK_HOMES = 256
+
+
+class NetMetering(NamedTuple):
+    load: np.ndarray
+    generation: np.ndarray
+    imported: np.ndarray
+    exported: np.ndarray
+    bill: np.ndarray
+    bill_without_solar: np.ndarray
+
+
+def interval_index(start, end):
+    """Interval start times covering the days from `start` to `end` inclusive."""
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    return pd.date_range(start, end, freq=INTERVAL, inclusive="left")
+
+
+def clear_sky_kw(index, latitude, longitude=None, utc_offset=None):
+    """Average AC kW per kWp of flat panels over each interval of `index`, under a clear sky.
+
+    The sun's height comes from the standard declination and equation-of-
+    time approximations at each interval's midpoint, and irradiance from the
+    Haurwitz clear-sky model, so no weather data is needed. Clock times are
+    read as local solar time unless `longitude` and `utc_offset` (hours)
+    are given.
+    """
+    index = pd.DatetimeIndex(index)
+    mid = index + pd.Timedelta(hours=INTERVAL_HOURS / 2)
+    day = mid.dayofyear.to_numpy(dtype=np.float64)
+    hours = (mid.hour + mid.minute / 60).to_numpy(dtype=np.float64)
+
+    declination = np.radians(23.45) * np.sin(2 * np.pi * (284 + day) / 365)
+    b = 2 * np.pi * (day - 81) / 364
+    # Equation of time, minutes
+    solar_time = hours + (9.87 * np.sin(2 * b) - 7.53 * np.cos(b) - 1.5 * np.sin(b)) / 60
+    if longitude is not None and utc_offset is not None:
+        solar_time += 4 * (longitude - 15 * utc_offset) / 60
+    hour_angle = np.radians(15 * (solar_time - 12))
+
+    lat = np.radians(latitude)
+    cos_zenith = (np.sin(lat) * np.sin(declination)
+                  + np.cos(lat) * np.cos(declination) * np.cos(hour_angle))
+    up = cos_zenith > 0.01
+    ghi = np.zeros_like(cos_zenith)
+    ghi[up] = 1098 * cos_zenith[up] * np.exp(-0.057 / cos_zenith[up])
+    return ghi / 1000 * PERFORMANCE_RATIO
+
+
+def binned_kwh(timestamps, kwh, index):
+    """Sum per-reading `kwh` into the intervals of `index`; intervals with no readings get 0."""
+    positions = np.searchsorted(index.to_numpy(), np.asarray(timestamps, dtype="datetime64[ns]"), side="right") - 1
+    inside = (positions >= 0) & (positions < len(index))
+    return np.bincount(positions[inside], weights=np.asarray(kwh)[inside], minlength=len(index))
+
+
+def load_inverter_csv(path_or_buffer, index):
+    """kWh generated per interval of `index` from an inverter CSV (timestamp, power_w)."""
+    df = read_csv(path_or_buffer, INVERTER_SCHEMA).sort_values("timestamp")
+    return binned_kwh(df["timestamp"], interval_kwh(df["timestamp"], df["power_w"]), index)
+
+
+def shaped_load(daily_kwh, index, shape=LOAD_SHAPE):
+    """Spread daily kWh totals (a Series by date) over the intervals of `index` by hour-of-day `shape`."""
+    per_day = pd.Series(daily_kwh).reindex(index.normalize()).fillna(0.0).to_numpy()
+    slots_per_hour = round(1 / INTERVAL_HOURS)
+    return per_day * shape[index.hour] / slots_per_hour
+
+
+def net_flows(load, generation):
+    """(imported, exported) kWh per interval: load beyond generation and generation beyond load."""
+    net = np.subtract(load, generation)
+    return np.clip(net, 0, None), np.clip(-net, 0, None)
+
+
+def _charge(kwh, rate):
+    # A flat rate scales the total; a per-interval rate is a dot product along the intervals
+    rate = np.asarray(rate, dtype=kwh.dtype)
+    return kwh.sum(axis=-1) * rate if rate.ndim == 0 else kwh @ rate
+
+
+def net_metering(load, generation, import_rate, export_rate, capacity_kw=None, chunk_homes=CHUNK_HOMES):
+    """Totals per home for homes × intervals `load` kWh against `generation` kWh.
+
+    `generation` is homes × intervals, or one row of intervals shared by
+    every home; with `capacity_kw` (kWp per home) it is per kWp and each
+    home's row is scaled by its capacity. Each interval's import is billed
+    at `import_rate` and its export credited at `export_rate`; either may
+    be flat or one ₹/kWh per interval. Homes are processed in blocks of
+    `chunk_homes`, so the temporaries stay small for a year of intervals.
+    """
+    load = np.atleast_2d(load)
+    generation = np.asarray(generation, dtype=load.dtype)
+    homes = len(load)
+    totals = {field: np.zeros(homes) for field in NetMetering._fields}
+    for start in range(0, homes, chunk_homes):
+        rows = slice(start, min(start + chunk_homes, homes))
+        block = load[rows]
+        gen = generation[rows] if generation.ndim == 2 else generation[None, :]
+        if capacity_kw is not None:
+            gen = gen * np.asarray(capacity_kw, dtype=load.dtype)[rows, None]
+        imported, exported = net_flows(block, gen)
+        totals["load"][rows] = block.sum(axis=-1)
+        totals["generation"][rows] = np.broadcast_to(gen, block.shape).sum(axis=-1)
+        totals["imported"][rows] = imported.sum(axis=-1)
+        totals["exported"][rows] = exported.sum(axis=-1)
+        totals["bill"][rows] = _charge(imported, import_rate) - _charge(exported, export_rate)
+        totals["bill_without_solar"][rows] = _charge(block, import_rate)
+    return NetMetering(**totals)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time net metering for a fleet of rooftop-solar homes")
+    parser.add_argument("--homes", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--latitude", type=float, default=19.1)
+    parser.add_argument("--import-rate", type=float, default=8.0)
+    parser.add_argument("--export-rate", type=float, default=3.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    index = interval_index("2026-01-01", pd.Timestamp("2026-01-01") + pd.Timedelta(days=args.days - 1))
+    # Synthetic fleet: shaped daily totals with per-interval noise, 0-6 kWp each
+    daily = rng.uniform(8, 30, (args.homes, 1)).astype(np.float32)
+    shape = (LOAD_SHAPE[index.hour] * INTERVAL_HOURS).astype(np.float32)
+    load = daily * shape[None, :] * rng.uniform(0.5, 1.5, (args.homes, len(index))).astype(np.float32)
+    capacity = rng.choice([0.0, 2.0, 3.0, 4.0, 6.0], args.homes)
+
+    start = time.perf_counter()
+    profile = clear_sky_kw(index, args.latitude) * INTERVAL_HOURS
+    modelled = time.perf_counter() - start
+    start = time.perf_counter()
+    result = net_metering(load, profile, args.import_rate, args.export_rate, capacity_kw=capacity)
+    elapsed = time.perf_counter() - start
+
+    print(f"Clear-sky profile for {len(index):,} intervals in {modelled * 1000:.1f} ms "
+          f"({profile.sum():,.0f} kWh per kWp)")
+    print(f"{args.homes:,} homes × {len(index):,} intervals netted in {elapsed:.2f}s "
+          f"({args.homes * len(index) / elapsed / 1e6:,.0f}M intervals/s)")
+    print(f"Fleet import {result.imported.sum() / 1000:,.0f} MWh, export {result.exported.sum() / 1000:,.0f} MWh, "
+          f"savings ₹{(result.bill_without_solar - result.bill).sum():,.0f}")
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Rows sent to the browser per page
+PAGE_SIZE = 25
+
+HIGH = 'background-color: #ffcccc'
+LOW = 'background-color: #ccffcc'
+NORMAL = 'background-color: #ffffcc'
+
+
+def energy_highlight(energy, average):
+    """CSS for each value: red above `average`, green below 80% of it, yellow otherwise.
+
+    One np.select over the column, for Styler.apply(axis=0).
+    """
+    energy = np.asarray(energy, dtype=np.float64)
+    return np.select([energy > average, energy < average * 0.8], [HIGH, LOW], NORMAL)
+
+
+def filter_rows(df, text):
+    """Rows where any text or date column contains `text` (case-insensitive)."""
+    if not text:
+        return df
+    searchable = df.select_dtypes(exclude='number')
+    mask = np.zeros(len(df), dtype=bool)
+    for column in searchable:
+        mask |= searchable[column].astype(str).str.contains(text, case=False, regex=False).to_numpy()
+    return df[mask]
+
+
+def page_slice(df, page, page_size=PAGE_SIZE):
+    """Rows of 1-based `page`, clamped to the last page."""
+    pages = max(-(-len(df) // page_size), 1)
+    page = min(max(page, 1), pages)
+    return df.iloc[(page - 1) * page_size:page * page_size], pages
+
+
+def paged_table(df, key, page_size=PAGE_SIZE, style=None):
+    """Sortable, filterable table that only sends the visible page to the browser.
+
+    Sorting and filtering run on the server over the whole frame; `style`,
+    if given, takes the page's rows and returns a Styler, so only those
+    rows are styled.
+    """
+    col1, col2, col3 = st.columns([2, 1, 2])
+    with col1:
+        sort_by = st.selectbox("Sort by", list(df.columns), key=f"{key}_sort")
+    with col2:
+        descending = st.toggle("Descending", key=f"{key}_descending")
+    with col3:
+        text = st.text_input("Filter", key=f"{key}_filter", placeholder="Text to match, e.g. Monday")
+
+    rows = filter_rows(df, text).sort_values(sort_by, ascending=not descending, kind='stable')
+    pages = max(-(-len(rows) // page_size), 1)
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page") if pages > 1 else 1
+    visible, pages = page_slice(rows, page, page_size)
+
+    st.dataframe(style(visible) if style else visible, use_container_width=True, hide_index=True)
+    first = (min(page, pages) - 1) * page_size
+    st.caption(f"Rows {first + 1 if len(rows) else 0}–{first + len(visible)} of {len(rows):,}"
+               + (f" (filtered from {len(df):,})" if len(rows) != len(df) else ""))
+
+
+class SortedTable:
+    """A frame with a sorted index and prefix sums per column, for O(page) paging.
+
+    Each column's stable argsort, its values in that order and the prefix
+    sums of the `sum_columns` in that order are built the first time the
+    column is sorted on, then reused. After that, a value-range filter is a
+    searchsorted, a page is an index slice, and any run's totals are a
+    difference of two prefix sums. Build once per dataset (e.g. with
+    st.cache_resource) and share it read-only.
+    """
+
+    def __init__(self, df, sum_columns=None):
+        self.df = df
+        self.sum_columns = list(df.select_dtypes('number').columns if sum_columns is None else sum_columns)
+        self._sorted = {}  # column -> (order, sorted values, {sum column: prefix sums})
+        self._overall = {name: float(df[name].sum()) for name in self.sum_columns}
+
+    def __len__(self):
+        return len(self.df)
+
+    def _index(self, column):
+        if column not in self._sorted:
+            values = self.df[column].to_numpy()
+            order = np.argsort(values, kind='stable')
+            prefix = {
+                name: np.concatenate([[0.0], np.cumsum(self.df[name].to_numpy(dtype=np.float64)[order])])
+                for name in self.sum_columns
+            }
+            self._sorted[column] = (order, values[order], prefix)
+        return self._sorted[column]
+
+    def _totals(self, prefix, start, stop):
+        return {name: sums[stop] - sums[start] for name, sums in prefix.items()}
+
+    def totals(self):
+        """Sums over every row."""
+        return dict(self._overall)
+
+    def sorted_values(self, column):
+        """`column`'s values in ascending order."""
+        return self._index(column)[1]
+
+    def page(self, sort_by, descending=False, low=None, high=None, page=1, page_size=PAGE_SIZE):
+        """One page of rows sorted by `sort_by`, keeping values within [low, high].
+
+        Returns (rows, page totals, totals over the filtered rows, filtered
+        row count, page count); `page` is 1-based and clamped.
+        """
+        order, values, prefix = self._index(sort_by)
+        start = 0 if low is None else int(np.searchsorted(values, low, side='left'))
+        stop = len(values) if high is None else int(np.searchsorted(values, high, side='right'))
+        stop = max(stop, start)
+        count = stop - start
+        pages = max(-(-count // page_size), 1)
+        page = min(max(page, 1), pages)
+
+        # Descending pages count back from the top of the filtered run
+        if descending:
+            last = stop - (page - 1) * page_size
+            first = max(last - page_size, start)
+            positions = np.arange(last - 1, first - 1, -1)
+        else:
+            first = start + (page - 1) * page_size
+            last = min(first + page_size, stop)
+            positions = np.arange(first, last)
+        rows = self.df.iloc[order[positions]]
+        return rows, self._totals(prefix, first, last), self._totals(prefix, start, stop), count, pages
+
+
+def sorted_table(table, key, page_size=PAGE_SIZE, decimals=2):
+    """Sort, range-filter and page a SortedTable, sending only the visible page.
+
+    Only the page is rounded to `decimals`; the page and filtered totals
+    come from the table's prefix sums.
+    """
+    df = table.df
+    col1, col2, col3 = st.columns([2, 1, 3])
+    with col1:
+        sort_by = st.selectbox("Sort by", list(df.columns), key=f"{key}_sort")
+    with col2:
+        descending = st.toggle("Descending", key=f"{key}_descending")
+    low = high = None
+    values = table.sorted_values(sort_by)
+    if values.dtype.kind in 'if' and len(values) and values[0] < values[-1]:
+        with col3:
+            low, high = st.slider(f"{sort_by} range", float(values[0]), float(values[-1]),
+                                  (float(values[0]), float(values[-1])), format="%.2f",
+                                  key=f"{key}_range_{sort_by}")
+
+    page_count = max(-(-len(df) // page_size), 1)
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1,
+                           key=f"{key}_page") if page_count > 1 else 1
+    rows, page_totals, filtered_totals, count, pages = table.page(sort_by, descending, low, high, page, page_size)
+
+    st.dataframe(rows.round(dict.fromkeys(table.sum_columns + list(rows.select_dtypes('number').columns), decimals)),
+                 use_container_width=True, hide_index=True)
+    totals = (pd.DataFrame([page_totals, filtered_totals], index=["Page total", "Total"])
+              .rename_axis("").reset_index().round(decimals))
+    st.dataframe(totals, use_container_width=True, hide_index=True)
+    st.caption(f"Page {min(page, pages)} of {pages} · {count:,} of {len(df):,} rows")
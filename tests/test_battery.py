@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from battery import C_RATE, RESERVE, battery_savings, dispatch, dispatch_loop
+from scheduler import load_tou_prices
+from solar import LOAD_SHAPE, clear_sky_kw, interval_index
+
+INTERVAL_HOURS = 0.25
+
+
+@pytest.fixture(scope="module")
+def household():
+    rng = np.random.default_rng(0)
+    index = interval_index("2026-04-01", "2026-04-14")
+    load = rng.uniform(8, 30, 14).repeat(96) * LOAD_SHAPE[index.hour] * INTERVAL_HOURS
+    load *= rng.uniform(0.5, 1.5, len(index))
+    generation = clear_sky_kw(index, 19.1) * 4.0 * INTERVAL_HOURS
+    tou = load_tou_prices(8.0)[index.hour]
+    return load, generation, tou
+
+
+@pytest.mark.parametrize("grid_charge", [True, False])
+@pytest.mark.parametrize("tariff", ["flat", "tou"])
+def test_vectorized_dispatch_matches_the_loop(household, grid_charge, tariff):
+    load, generation, tou = household
+    prices = 8.0 if tariff == "flat" else tou
+    capacities = np.array([1.0, 5.0, 13.5, 30.0])
+    result = dispatch(load - generation, prices, capacities, capacities * C_RATE, INTERVAL_HOURS, grid_charge)
+    for i, capacity in enumerate(capacities):
+        single = dispatch_loop(load - generation, prices, capacity, capacity * C_RATE, INTERVAL_HOURS, grid_charge)
+        np.testing.assert_allclose(result.flow[:, i], single, atol=1e-9)
+
+
+def test_state_of_charge_stays_within_limits(household):
+    load, generation, tou = household
+    capacities = np.array([2.5, 10.0])
+    result = dispatch(load - generation, tou, capacities, capacities * C_RATE, INTERVAL_HOURS)
+    soc = capacities * RESERVE + np.cumsum(np.where(result.flow > 0, result.flow * 0.9 ** 0.5,
+                                                    result.flow / 0.9 ** 0.5), axis=0)
+    assert np.all(soc >= capacities * RESERVE - 1e-9)
+    assert np.all(soc <= capacities + 1e-9)
+    assert np.all(np.abs(result.flow) <= capacities * C_RATE * INTERVAL_HOURS + 1e-9)
+
+
+def test_first_row_is_no_battery(household):
+    load, generation, tou = household
+    table = battery_savings(load, generation, tou, 3.0, INTERVAL_HOURS)
+    assert table["Capacity (kWh)"].iloc[0] == 0
+    assert table["Savings (₹)"].iloc[0] == 0
+    assert table["Savings (₹)"].iloc[1:].max() > 0
@@ -0,0 +1,95 @@
+import base64
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import pytest
+
+import figure_pool as pooled
+from figures import (
+    appliance_frame, appliance_heatmap, appliance_stack, consumption_box, consumption_cost_bars,
+    consumption_histogram, consumption_trend, cost_breakdown_bar, cost_scatter, efficiency_gauge,
+    week_over_week_bars, weekday_bars, weekday_means, weekly_frame, weekly_radar, weekly_totals
+)
+
+THEMES = ["plotly", "plotly_dark"]
+
+
+def _normalized(fig):
+    # Figure JSON with typed arrays decoded and numbers rounded, so equal data compares equal
+    def walk(value):
+        if isinstance(value, dict):
+            if {"dtype", "bdata"} <= set(value):
+                array = np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"])
+                return [round(float(v), 9) for v in array.ravel()]
+            return {key: walk(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [walk(item) for item in value]
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return round(float(value), 9)
+        return value
+    return walk(json.loads(pio.to_json(fig)))
+
+
+def _week(seed, days):
+    rng = np.random.default_rng(seed)
+    consumption = pd.Series(rng.uniform(10, 30, days), index=pd.date_range("2026-01-05", periods=days))
+    return consumption, weekly_frame(consumption, 4.0 + seed, 20.0 + seed)
+
+
+def _charts(seed, days):
+    consumption, df_viz = _week(seed, days)
+    base = 20.0 + seed
+    usage = np.random.default_rng(seed).integers(0, 2, (days, 2)).tolist()
+    spikes = list(df_viz["Day"].iloc[[1, 3]]) if seed in (0, 2) else []
+    means = weekday_means(consumption).dropna()
+    weekly = weekly_totals(consumption)
+    return {
+        "cost_bars": (pooled.cost_bars, consumption_cost_bars, (df_viz, base, 4.0 + seed)),
+        "gauge": (pooled.gauge, efficiency_gauge, (1.1 + seed,)),
+        "radar": (pooled.radar, weekly_radar, (df_viz,)),
+        "heatmap": (pooled.heatmap, appliance_heatmap, (usage, ["AC", "Fridge"], list(df_viz["Day"]))),
+        "trend": (pooled.trend, consumption_trend, (df_viz, base, spikes)),
+        "histogram": (pooled.histogram, consumption_histogram, (df_viz,)),
+        "box": (pooled.box, consumption_box, (df_viz,)),
+        "cost_breakdown": (pooled.cost_breakdown, cost_breakdown_bar, (df_viz,)),
+        "weekdays": (pooled.weekdays, weekday_bars, (means,)),
+        "weeks": (pooled.weeks, week_over_week_bars, (weekly,)),
+        "scatter": (pooled.scatter, cost_scatter, (df_viz,)),
+    }
+
+
+@pytest.fixture(scope="module")
+def pool():
+    # Shared across cases, so later cases patch templates built for earlier data
+    return pooled.FigurePool()
+
+
+@pytest.mark.parametrize("theme", THEMES)
+@pytest.mark.parametrize("seed, days", [(0, 7), (1, 31), (2, 12), (3, 1)])
+def test_pooled_figures_match_fresh_ones(pool, theme, seed, days):
+    for name, (pooled_chart, fresh_chart, args) in _charts(seed, days).items():
+        assert _normalized(pooled_chart(pool, *args, theme)) == _normalized(fresh_chart(*args, theme)), name
+
+
+@pytest.mark.parametrize("theme", THEMES)
+@pytest.mark.parametrize("seed", range(4))
+def test_pooled_stack_matches_fresh(pool, theme, seed):
+    consumption, _ = _week(seed, 7 + seed)
+    rng = np.random.default_rng(seed)
+    usage = pd.DataFrame(rng.integers(0, 2, (len(consumption), 3)).astype(bool), index=consumption.index,
+                         columns=["AC", "Fridge", "Geyser"])
+    if seed == 3:
+        usage["AC"] = False
+    rows = appliance_frame(usage, {"AC": 1.5, "Fridge": 3.0, "Geyser": 2.0})
+    assert _normalized(pooled.stack(pool, rows, theme)) == _normalized(appliance_stack(rows, theme))
+
+
+def test_templates_are_built_once_per_chart_and_theme():
+    pool = pooled.FigurePool()
+    _, df_viz = _week(5, 7)
+    for scale in (1, 2, 3):
+        pooled.box(pool, df_viz.assign(Consumption=df_viz["Consumption"] * scale), "plotly")
+    pooled.box(pool, df_viz, "plotly_dark")
+    assert (pool.builds, pool.patches) == (2, 2)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from montecarlo import bill_bands, simulate_bills, simulate_bills_parallel, weekday_profile
+
+HISTORY = pd.date_range("2026-01-05", periods=28, freq="D")
+MONTH = pd.date_range("2026-03-01", periods=31, freq="D")
+
+
+def _band_width(kwh, samples=50_000):
+    means, residuals = weekday_profile(HISTORY.dayofweek, kwh)
+    bands = bill_bands(simulate_bills(means, MONTH, samples, 6.0, 8.0, residuals, seed=1))
+    return bands["P90"] - bands["P10"]
+
+
+def test_bands_widen_with_day_to_day_spread():
+    rng = np.random.default_rng(0)
+    widths = [_band_width(20 * rng.lognormal(-spread ** 2 / 2, spread, len(HISTORY)) if spread
+                          else np.full(len(HISTORY), 20.0))
+              for spread in (0.0, 0.1, 0.3)]
+    assert widths[0] < widths[1] < widths[2]
+
+
+def test_weekday_profile_residuals_are_ratios_to_weekday_means():
+    kwh = np.arange(1.0, 15.0)
+    means, residuals = weekday_profile(HISTORY[:14].dayofweek, kwh)
+    np.testing.assert_allclose(means, (kwh[:7] + kwh[7:]) / 2)
+    np.testing.assert_allclose(residuals * means[HISTORY[:14].dayofweek], kwh)
+
+
+def test_a_single_week_is_not_bootstrapped():
+    # Seven days leave one residual per weekday, all exactly 1, so only the noise remains
+    means, residuals = weekday_profile(HISTORY[:7].dayofweek, np.linspace(10, 20, 7))
+    with_residuals = simulate_bills(means, MONTH, 1000, 6.0, residuals=residuals, seed=3)
+    np.testing.assert_array_equal(with_residuals, simulate_bills(means, MONTH, 1000, 6.0, seed=3))
+
+
+def test_small_runs_match_the_serial_simulation():
+    means = np.full(7, 15.0)
+    np.testing.assert_array_equal(simulate_bills_parallel(means, MONTH, 5000, 6.0, seed=7),
+                                  simulate_bills(means, MONTH, 5000, 6.0, seed=7))
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+# Largest item count enumerated bit-for-bit (2^22 states)
+MAX_EXACT_ITEMS = 22
+
+# Cap on states enumerated after grouping identical items
+MAX_STATES = 1 << 24
+
+CHUNK_STATES = 1 << 16
+
+
+def pareto_front(cost, comfort):
+    """Indexes of states no other state beats on both lower cost and higher comfort."""
+    order = np.lexsort((-comfort, cost))
+    best_so_far = np.maximum.accumulate(comfort[order])
+    keep = np.concatenate(([True], comfort[order][1:] > best_so_far[:-1]))
+    return order[keep]
+
+
+def _enumerate_bits(cost, comfort, base_cost):
+    """Every subset of the items, scored in chunks of bitmasks."""
+    n = len(cost)
+    shifts = np.arange(n, dtype=np.uint32)
+    masks, costs, comforts = [], [], []
+
+    for start in range(0, 1 << n, CHUNK_STATES):
+        states = np.arange(start, min(start + CHUNK_STATES, 1 << n), dtype=np.uint32)
+        bits = ((states[:, None] >> shifts) & 1).astype(np.float32)
+        chunk_cost = bits @ cost + base_cost
+        chunk_comfort = bits @ comfort
+        front = pareto_front(chunk_cost, chunk_comfort)
+        masks.append(states[front])
+        costs.append(chunk_cost[front])
+        comforts.append(chunk_comfort[front])
+
+    masks, costs, comforts = np.concatenate(masks), np.concatenate(costs), np.concatenate(comforts)
+    front = pareto_front(costs, comforts)
+    keep = (masks[front][:, None] >> shifts) & 1
+    return costs[front], comforts[front], keep.astype(bool)
+
+
+def _groups(cost, comfort):
+    # Items with the same cost and comfort are interchangeable
+    pairs = np.stack([cost, comfort], axis=1)
+    unique, group = np.unique(pairs, axis=0, return_inverse=True)
+    group = group.ravel()
+    return unique, group, np.bincount(group, minlength=len(unique))
+
+
+def _keep_first(counts, group, sizes):
+    """Keep masks keeping the first `count` items of each group, in item order."""
+    rank = np.zeros(len(group), dtype=np.int64)
+    for g in range(len(sizes)):
+        rank[group == g] = np.arange(sizes[g])
+    return rank[None, :] < counts[:, group]
+
+
+def _enumerate_groups(cost, comfort, base_cost):
+    """Count-per-group enumeration: identical items only matter by how many are kept."""
+    unique, group, sizes = _groups(cost, comfort)
+    radix = sizes + 1
+    total = int(np.prod(radix.astype(np.float64)))
+    if total > MAX_STATES:
+        return _prune_groups(cost, comfort, base_cost)
+
+    # Decode each state index as a mixed-radix vector of kept counts per group
+    place = np.concatenate(([1], np.cumprod(radix[:-1])))
+    kept, costs, comforts = [], [], []
+    for start in range(0, total, CHUNK_STATES):
+        states = np.arange(start, min(start + CHUNK_STATES, total), dtype=np.int64)
+        counts = (states[:, None] // place) % radix
+        chunk_cost = counts @ unique[:, 0] + base_cost
+        chunk_comfort = counts @ unique[:, 1]
+        front = pareto_front(chunk_cost, chunk_comfort)
+        kept.append(counts[front])
+        costs.append(chunk_cost[front])
+        comforts.append(chunk_comfort[front])
+
+    counts, costs, comforts = np.concatenate(kept), np.concatenate(costs), np.concatenate(comforts)
+    front = pareto_front(costs, comforts)
+    return costs[front], comforts[front], _keep_first(counts[front], group, sizes)
+
+
+def _prune_groups(cost, comfort, base_cost):
+    """Frontier built one group at a time, keeping only Pareto-optimal partial plans.
+
+    Every later group adds the same amounts to every partial plan, so a plan
+    dominated after some groups stays dominated: pruning at each step is
+    exact. Only the frontier so far times each group's counts is scored.
+    """
+    unique, group, sizes = _groups(cost, comfort)
+    costs = np.array([base_cost], dtype=np.float64)
+    comforts = np.zeros(1)
+    counts = np.zeros((1, 0), dtype=np.int64)
+    for g in range(len(unique)):
+        options = np.arange(sizes[g] + 1)
+        if len(costs) * len(options) > MAX_STATES:
+            raise ValueError(f"{len(cost)} items in {len(unique)} distinct groups have too many "
+                             "cost/comfort trade-offs to enumerate")
+        step_cost = (costs[:, None] + options * float(unique[g, 0])).ravel()
+        step_comfort = (comforts[:, None] + options * float(unique[g, 1])).ravel()
+        front = pareto_front(step_cost, step_comfort)
+        parent, kept = np.divmod(front, len(options))
+        counts = np.column_stack([counts[parent], kept])
+        costs, comforts = step_cost[front], step_comfort[front]
+    return costs, comforts, _keep_first(counts, group, sizes)
+
+
+def what_if_frontier(items, base_cost=0.0):
+    """Pareto frontier of cost vs. comfort over keep/skip choices for each item.
+
+    `items` has one row per appliance-day with `Cost` and `Comfort` columns.
+    Returns one row per frontier point, cheapest first, with the total cost,
+    total comfort, and a boolean `Keep` array aligned with `items`.
+    """
+    cost = items["Cost"].to_numpy(dtype=np.float32)
+    comfort = items["Comfort"].to_numpy(dtype=np.float32)
+    if len(items) <= MAX_EXACT_ITEMS:
+        costs, comforts, keep = _enumerate_bits(cost, comfort, base_cost)
+    else:
+        costs, comforts, keep = _enumerate_groups(cost, comfort, base_cost)
+
+    order = np.argsort(costs)
+    return pd.DataFrame({
+        "Cost": costs[order],
+        "Comfort": comforts[order],
+        "Keep": list(keep[order])
+    })
+
+
+def best_within_budget(frontier, budget):
+    """Most comfortable frontier point costing at most `budget`, or None."""
+    affordable = frontier[frontier["Cost"] <= budget]
+    return None if affordable.empty else affordable.iloc[-1]